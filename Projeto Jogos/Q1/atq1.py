@@ -1,7 +1,27 @@
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pandas as pd
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_http import CacheHTTP
+from catalogo import construir_catalogo
+from incremental import atualizar_incremental
+
+try:
+    from extracao import VERSAO_EXTRACAO, extrair_tabelas_html
+except ImportError:  # lxml indisponível ou pandas não conferido: usa o caminho antigo, com BeautifulSoup + pd.read_html
+    VERSAO_EXTRACAO = 'legado'
+    extrair_tabelas_html = None
+
 # Funções de extração, limpeza e exportação com tratamento de exceções personalizado
 
 class WebScrapingError(Exception):
@@ -35,56 +55,264 @@ class ExportacaoError(WebScrapingError):
         super().__init__(self.mensagem)
 
 
-def extrair_tabelas(url):
+def criar_sessao(max_conexoes=10):
+    """Cria uma sessão HTTP com pool de conexões keep-alive reutilizáveis."""
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    return sessao
+
+def baixar_pagina(url, sessao=None, cache=None, offline=False):
+    """
+    Obtém o conteúdo de uma página, consultando o cache quando disponível.
+
+    Returns:
+        tuple: (conteudo, tabelas), onde `tabelas` é a lista já extraída e
+               armazenada no cache, ou None se a página precisar ser processada.
+    """
+    entrada = cache.obter(url) if cache is not None else None
+
+    if offline:
+        if entrada is None:
+            raise RequisicaoError(url, "Página ausente do cache no modo offline")
+        return entrada['corpo'], entrada['tabelas']
+
+    if entrada is not None and cache.esta_fresca(entrada):
+        return entrada['corpo'], entrada['tabelas']
+
+    cabecalhos = {}
+    if entrada is not None:
+        if entrada['etag']:
+            cabecalhos['If-None-Match'] = entrada['etag']
+        if entrada['last_modified']:
+            cabecalhos['If-Modified-Since'] = entrada['last_modified']
+
+    cliente = sessao if sessao is not None else requests
+    response = cliente.get(url, headers=cabecalhos)
+    if response.status_code == 304 and entrada is not None:
+        cache.renovar(url)
+        return entrada['corpo'], entrada['tabelas']
+    response.raise_for_status()
+
+    if cache is not None:
+        cache.salvar(url, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return response.content, None
+
+def extrair_tabelas_legado(conteudo):
+    """Extração original: BeautifulSoup para localizar as tabelas e pd.read_html para cada uma."""
+    soup = BeautifulSoup(conteudo, 'html.parser')
+    tabelas = soup.find_all('table', {'class': 'wikitable'})
+    
+    lista_dfs = []
+    for tabela in tabelas:
+        linhas = tabela.find_all('tr')
+        if len(linhas) > 9:
+            df = pd.read_html(StringIO(str(tabela)))[0]
+            lista_dfs.append(df)
+    return lista_dfs
+
+def extrair_tabelas(url, sessao=None, cache=None, offline=False):
     try:
-        response = requests.get(url)
-        response.raise_for_status()
+        conteudo, tabelas_em_cache = baixar_pagina(url, sessao, cache, offline)
+        if tabelas_em_cache is not None:
+            return tabelas_em_cache
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tabelas = soup.find_all('table', {'class': 'wikitable'})
-        
-        lista_dfs = []
-        for tabela in tabelas:
-            linhas = tabela.find_all('tr')
-            if len(linhas) > 9:
-                df = pd.read_html(str(tabela))[0]
-                lista_dfs.append(df)
+        if extrair_tabelas_html is not None:
+            lista_dfs = extrair_tabelas_html(conteudo)
+        else:
+            lista_dfs = extrair_tabelas_legado(conteudo)
         
+        if cache is not None:
+            cache.salvar_tabelas(url, lista_dfs)
         return lista_dfs
     except requests.exceptions.RequestException as e:
         raise RequisicaoError(url, str(e))
+    except WebScrapingError:
+        raise
     except Exception as e:
         raise ProcessamentoError(url, str(e))
 
+def extrair_tabelas_concorrente(urls, max_workers=5, sessao=None, cache=None, offline=False):
+    """
+    Baixa e processa as páginas em paralelo, entregando cada uma assim que fica pronta.
+
+    Cada página é baixada e processada por uma thread do pool, reutilizando as
+    conexões da sessão. Os erros continuam sendo individuais por URL: uma falha
+    em uma página não interrompe as demais.
+
+    Yields:
+        tuple: (url, tabelas, erro), onde `erro` é um WebScrapingError ou None.
+    """
+    sessao_propria = sessao is None
+    if sessao_propria:
+        sessao = criar_sessao(max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {executor.submit(extrair_tabelas, url, sessao, cache, offline): url for url in urls}
+            for futuro in as_completed(futuros):
+                url = futuros[futuro]
+                try:
+                    yield url, futuro.result(), None
+                except WebScrapingError as e:
+                    yield url, [], e
+    finally:
+        if sessao_propria:
+            sessao.close()
+
 def limpar_dados(dfs):
     try:
         dfs_limpos = []
         for df in dfs:
-            df = df.dropna(how='all')
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    df[col] = df[col].str.strip()
+            df = df.dropna(how='all').copy()
+            # object no pandas 2, str no pandas 3
+            for i, tipo in enumerate(df.dtypes):
+                if pd.api.types.is_string_dtype(tipo):
+                    df.isetitem(i, df.iloc[:, i].str.strip())
             df = df.fillna('')
             dfs_limpos.append(df)
         return dfs_limpos
     except Exception as e:
         raise LimpezaError(str(e))
 
-def exportar_dados(df, nome_arquivo):
+# Strings do Arrow só com o pyarrow instalado; basta saber se ele existe, sem importá-lo
+TIPO_TEXTO = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') is not None else None
+
+def compactar_dados(df, limite_cardinalidade=0.5):
+    """
+    Reduz a memória ocupada pelas colunas de texto de um DataFrame já limpo.
+
+    Colunas com poucos valores distintos (desenvolvedora, publicadora, gênero,
+    região...) viram `category`; as demais colunas só de texto passam a usar
+    strings do Arrow, quando o pyarrow está instalado.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpo.
+        limite_cardinalidade (float, optional): Proporção máxima de valores
+            distintos por linha para a coluna virar categórica.
+
+    Returns:
+        tuple: (DataFrame compactado, bytes antes, bytes depois).
+    """
     try:
-        arquivo_csv = f'Q1/{nome_arquivo}.csv'
-        arquivo_json = f'Q1/{nome_arquivo}.json'
-        arquivo_excel = f'Q1/{nome_arquivo}.xlsx'
+        bytes_antes = int(df.memory_usage(deep=True).sum())
+        conversoes = {}
+        for i, tipo in enumerate(df.dtypes):
+            if not pd.api.types.is_string_dtype(tipo):
+                continue
+            coluna = df.iloc[:, i]
+            if coluna.nunique() <= limite_cardinalidade * len(coluna):
+                conversoes[i] = 'category'
+            elif (TIPO_TEXTO is not None and tipo == object
+                  and pd.api.types.infer_dtype(coluna) == 'string'):
+                # As colunas str do pandas 3 já usam o Arrow quando ele está instalado
+                conversoes[i] = TIPO_TEXTO
+
+        if conversoes:
+            df = df.copy()
+            for i, tipo in conversoes.items():
+                df.isetitem(i, df.iloc[:, i].astype(tipo))
+        bytes_depois = int(df.memory_usage(deep=True).sum())
+        return df, bytes_antes, bytes_depois
+    except Exception as e:
+        raise LimpezaError(str(e))
+
+def _achatar_colunas(df):
+    df = df.copy(deep=False)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = [' '.join(col).strip() for col in df.columns.values]
+    return df
+
+def _preparar_colunar(df):
+    # Parquet e Feather exigem nomes de coluna em texto e um único tipo por coluna
+    df = _achatar_colunas(df)
+    df.columns = [str(col) for col in df.columns]
+    for i, tipo in enumerate(df.dtypes):
+        coluna = df.iloc[:, i]
+        if isinstance(tipo, pd.CategoricalDtype):
+            valores = coluna.cat.categories
+        elif tipo == object:
+            valores = coluna
+        else:
+            continue
+        if pd.api.types.infer_dtype(valores, skipna=True) not in ('string', 'empty'):
+            df.isetitem(i, coluna.astype(str))
+    return df
+
+def _escrever_csv(df, arquivo):
+    df.to_csv(arquivo, index=False)
+
+def _escrever_json(df, arquivo):
+    df.to_json(arquivo, orient='records', indent=4, force_ascii=False)
+
+def _escrever_excel(df, arquivo):
+    _achatar_colunas(df).to_excel(arquivo, index=False)
+
+def _escrever_parquet(df, arquivo):
+    _preparar_colunar(df).to_parquet(arquivo, index=False)
+
+def _escrever_feather(df, arquivo):
+    _preparar_colunar(df).to_feather(arquivo)
+
+# Formato -> (extensão, função de escrita)
+ESCRITORES = {
+    'csv': ('.csv', _escrever_csv),
+    'json': ('.json', _escrever_json),
+    'xlsx': ('.xlsx', _escrever_excel),
+    'parquet': ('.parquet', _escrever_parquet),
+    'feather': ('.feather', _escrever_feather),
+}
+FORMATOS_PADRAO = ('csv', 'json', 'xlsx')
+
+def _escrever_formato(formato, df, arquivo):
+    inicio = time.perf_counter()
+    ESCRITORES[formato][1](df, arquivo)
+    return time.perf_counter() - inicio, os.path.getsize(arquivo)
+
+def exportar_dados(df, nome_arquivo, formatos=FORMATOS_PADRAO):
+    """
+    Exporta o DataFrame nos formatos escolhidos, com um escritor por formato em paralelo.
+
+    Returns:
+        dict: formato -> (segundos de escrita, tamanho do arquivo em bytes).
+    """
+    try:
+        desconhecidos = [formato for formato in formatos if formato not in ESCRITORES]
+        if desconhecidos:
+            raise ValueError(f"Formatos não suportados: {', '.join(desconhecidos)}")
         
         df = df.reset_index(drop=True)
+        arquivos = {formato: f'Q1/{nome_arquivo}{ESCRITORES[formato][0]}' for formato in formatos}
         
-        df.to_csv(arquivo_csv, index=False)
-        df.to_json(arquivo_json, orient='records', indent=4, force_ascii=False)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [' '.join(col).strip() for col in df.columns.values]
-        df.to_excel(arquivo_excel, index=False)
+        with ThreadPoolExecutor(max_workers=max(len(arquivos), 1)) as executor:
+            futuros = {
+                formato: executor.submit(_escrever_formato, formato, df, arquivo)
+                for formato, arquivo in arquivos.items()
+            }
+            relatorio = {formato: futuro.result() for formato, futuro in futuros.items()}
         
-        print(f"Dados exportados para {arquivo_csv}, {arquivo_json} e {arquivo_excel}")
+        print(f"Dados exportados para {', '.join(arquivos.values())}")
+        for formato, (segundos, tamanho) in relatorio.items():
+            print(f"  {formato}: {segundos:.2f}s, {tamanho / 1024:.0f} KB")
+        return relatorio
+    except Exception as e:
+        raise ExportacaoError(str(e))
+
+def exportar_incremental(df, console):
+    """Registra no changelog só as linhas alteradas desde a última execução e atualiza o snapshot."""
+    try:
+        resumo = atualizar_incremental(df, console)
+        print(f"{console}: {resumo['inseridos']} inseridos, {resumo['atualizados']} atualizados, "
+              f"{resumo['removidos']} removidos")
+        return resumo
+    except Exception as e:
+        raise ExportacaoError(str(e))
+
+def exportar_catalogo(dfs_por_console):
+    """Gera o catálogo unificado de jogos de todos os consoles."""
+    try:
+        total = construir_catalogo(dfs_por_console)
+        print(f"Catálogo com {total} jogos distintos exportado para Q1/catalogo_jogos.db")
     except Exception as e:
         raise ExportacaoError(str(e))
 
@@ -97,17 +325,23 @@ urls = [
     'https://pt.wikipedia.org/wiki/Lista_de_jogos_para_Nintendo_Switch'
 ]
 
-def main():
+def nome_console(url):
+    nome_pagina = url.split('/')[-1]
+    return nome_pagina.replace('Lista_de_jogos_para_', '')
+
+def main(urls=urls, workers=1, cache=None, offline=False, formatos=FORMATOS_PADRAO, incremental=False,
+         catalogo=False):
     dfs_por_console = {}
     
-    for url in urls:
-        nome_pagina = url.split('/')[-1]
-        console = nome_pagina.replace('Lista_de_jogos_para_', '')
+    for url, tabelas, erro in extrair_tabelas_concorrente(urls, max_workers=workers, cache=cache, offline=offline):
+        if erro is not None:
+            print(erro)
+            continue
         
         try:
-            tabelas = extrair_tabelas(url)
             tabelas_limpas = limpar_dados(tabelas)
             
+            console = nome_console(url)
             if console not in dfs_por_console:
                 dfs_por_console[console] = []
             
@@ -115,10 +349,59 @@ def main():
         except WebScrapingError as e:
             print(e)
     
+    totais = {}
     for console, dfs in dfs_por_console.items():
         df_concatenado = pd.concat(dfs, ignore_index=True)
-        exportar_dados(df_concatenado, f'{console}_jogos')
+        try:
+            df_concatenado, bytes_antes, bytes_depois = compactar_dados(df_concatenado)
+            print(f"Memória de {console}: {bytes_antes / 1024:.0f} KB -> {bytes_depois / 1024:.0f} KB")
+        except LimpezaError as e:
+            print(e)
+        if incremental:
+            exportar_incremental(df_concatenado, console)
+            continue
+        relatorio = exportar_dados(df_concatenado, f'{console}_jogos', formatos)
+        for formato, (segundos, tamanho) in relatorio.items():
+            tempo_total, tamanho_total = totais.get(formato, (0.0, 0))
+            totais[formato] = (tempo_total + segundos, tamanho_total + tamanho)
+    
+    if totais:
+        print("Total por formato:")
+        for formato, (segundos, tamanho) in totais.items():
+            print(f"  {formato}: {segundos:.2f}s, {tamanho / 1024:.0f} KB")
+    
+    if catalogo and dfs_por_console:
+        exportar_catalogo(dfs_por_console)
 
 # Script principal
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Extrai as listas de jogos da Wikipédia.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Número de páginas baixadas em paralelo (1 = sequencial).")
+    parser.add_argument('--offline', action='store_true',
+                        help="Usa apenas as páginas já armazenadas no cache, sem acessar a rede.")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Desativa o cache HTTP em disco.")
+    parser.add_argument('--cache-max-idade', type=float, default=24,
+                        help="Horas em que uma página do cache é usada sem revalidação.")
+    parser.add_argument('--cache-tamanho-maximo', type=int, default=200,
+                        help="Tamanho máximo do cache em MB.")
+    parser.add_argument('--formatos', nargs='+', choices=sorted(ESCRITORES), default=list(FORMATOS_PADRAO),
+                        help="Formatos de saída gerados para cada console.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Grava apenas as linhas inseridas, alteradas e removidas em {console}_changelog.csv.")
+    parser.add_argument('--catalogo', action='store_true',
+                        help="Gera também o catálogo unificado de jogos em Q1/catalogo_jogos.db.")
+    args = parser.parse_args()
+    opcoes = dict(workers=args.workers, formatos=args.formatos, incremental=args.incremental,
+                  catalogo=args.catalogo)
+
+    if args.sem_cache:
+        if args.offline:
+            parser.error("--offline requer o cache HTTP.")
+        main(**opcoes)
+    else:
+        with CacheHTTP(max_idade=args.cache_max_idade * 3600,
+                       tamanho_maximo=args.cache_tamanho_maximo * 1024 * 1024,
+                       versao_tabelas=VERSAO_EXTRACAO) as cache:
+            main(cache=cache, offline=args.offline, **opcoes)
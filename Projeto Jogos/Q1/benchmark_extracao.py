@@ -0,0 +1,62 @@
+import argparse
+import time
+
+import pandas as pd
+import requests
+
+from atq1 import extrair_tabelas_legado, urls
+from extracao import extrair_tabelas_html
+
+# Compara a extração em uma única análise (lxml) com o caminho antigo
+# (BeautifulSoup + pd.read_html por tabela) nas mesmas páginas.
+
+def medir(funcao, conteudo, repeticoes):
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(conteudo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def conferir_resultados(dfs_legado, dfs_novos):
+    if len(dfs_legado) != len(dfs_novos):
+        return f"{len(dfs_legado)} tabelas no caminho antigo, {len(dfs_novos)} no novo"
+    for i, (antigo, novo) in enumerate(zip(dfs_legado, dfs_novos)):
+        try:
+            pd.testing.assert_frame_equal(antigo, novo)
+        except AssertionError as e:
+            return f"tabela {i}: {e}"
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração de tabelas da Wikipédia.")
+    parser.add_argument('paginas', nargs='*', help="Arquivos HTML locais. Sem argumentos, baixa as páginas de atq1.urls.")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.paginas:
+        conteudos = {}
+        for caminho in args.paginas:
+            with open(caminho, 'rb') as arquivo:
+                conteudos[caminho] = arquivo.read()
+    else:
+        with requests.Session() as sessao:
+            conteudos = {url: sessao.get(url).content for url in urls}
+
+    total_legado = total_novo = 0.0
+    for nome, conteudo in conteudos.items():
+        tempo_legado, dfs_legado = medir(extrair_tabelas_legado, conteudo, args.repeticoes)
+        tempo_novo, dfs_novos = medir(extrair_tabelas_html, conteudo, args.repeticoes)
+        total_legado += tempo_legado
+        total_novo += tempo_novo
+
+        diferenca = conferir_resultados(dfs_legado, dfs_novos)
+        situacao = "idêntico" if diferenca is None else f"DIVERGENTE ({diferenca})"
+        print(f"{nome}: antigo {tempo_legado:.3f}s, novo {tempo_novo:.3f}s "
+              f"({tempo_legado / tempo_novo:.1f}x), {len(dfs_novos)} tabelas, {situacao}")
+
+    print(f"Total: antigo {total_legado:.3f}s, novo {total_novo:.3f}s ({total_legado / total_novo:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import pickle
+import sqlite3
+import threading
+import time
+
+# Cache persistente de respostas HTTP para o web scraping da Wikipédia
+
+class CacheHTTP:
+    """
+    Cache em disco (SQLite) das páginas baixadas, indexado pela URL.
+
+    Cada entrada guarda o corpo da resposta, os cabeçalhos ETag e Last-Modified
+    e, opcionalmente, as tabelas já extraídas da página, para que uma resposta
+    304 evite tanto o download quanto o novo processamento do HTML. As tabelas
+    são guardadas junto com `versao_tabelas`; as gravadas por outra versão da
+    extração são ignoradas e extraídas de novo.
+
+    Políticas:
+        - Validade: entradas com menos de `max_idade` segundos são servidas sem
+          nenhuma requisição; depois disso são revalidadas com um GET condicional.
+        - Retenção: entradas não acessadas há mais de `retencao` segundos são
+          descartadas ao abrir o cache.
+        - Tamanho: quando o total armazenado passa de `tamanho_maximo` bytes, as
+          entradas usadas há mais tempo são removidas primeiro (LRU).
+    """
+
+    def __init__(self, caminho='Q1/cache_http.db', max_idade=24 * 3600,
+                 retencao=30 * 24 * 3600, tamanho_maximo=200 * 1024 * 1024, versao_tabelas=None):
+        self.caminho = caminho
+        self.versao_tabelas = versao_tabelas
+        self.max_idade = max_idade
+        self.retencao = retencao
+        self.tamanho_maximo = tamanho_maximo
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS respostas (
+                url TEXT PRIMARY KEY,
+                corpo BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                tabelas BLOB,
+                tamanho INTEGER NOT NULL,
+                armazenado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em)")
+        self._conn.commit()
+        self.remover_expirados()
+
+    def obter(self, url):
+        """
+        Busca a entrada de uma URL no cache.
+
+        Returns:
+            dict: Entrada com `corpo`, `etag`, `last_modified`, `tabelas` e
+                  `armazenado_em`, ou None se a URL não estiver no cache.
+        """
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT corpo, etag, last_modified, tabelas, armazenado_em FROM respostas WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if linha is None:
+                return None
+            self._conn.execute("UPDATE respostas SET acessado_em = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+        corpo, etag, last_modified, tabelas, armazenado_em = linha
+        if tabelas is not None:
+            tabelas = pickle.loads(tabelas)
+            # Entradas antigas guardam só a lista de tabelas, sem a versão
+            versao, tabelas = tabelas if isinstance(tabelas, tuple) else (None, None)
+            if versao != self.versao_tabelas:
+                tabelas = None
+        return {
+            'corpo': corpo,
+            'etag': etag,
+            'last_modified': last_modified,
+            'tabelas': tabelas,
+            'armazenado_em': armazenado_em,
+        }
+
+    def esta_fresca(self, entrada):
+        """Indica se a entrada ainda pode ser usada sem revalidação."""
+        return time.time() - entrada['armazenado_em'] < self.max_idade
+
+    def salvar(self, url, corpo, etag=None, last_modified=None):
+        """Armazena uma nova resposta, descartando as tabelas extraídas anteriormente."""
+        agora = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO respostas "
+                "(url, corpo, etag, last_modified, tabelas, tamanho, armazenado_em, acessado_em) "
+                "VALUES (?, ?, ?, ?, NULL, ?, ?, ?)",
+                (url, corpo, etag, last_modified, len(corpo), agora, agora)
+            )
+            self._aplicar_limite()
+            self._conn.commit()
+
+    def salvar_tabelas(self, url, tabelas):
+        """Associa as tabelas extraídas à resposta armazenada da URL."""
+        dados = pickle.dumps((self.versao_tabelas, tabelas), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE respostas SET tabelas = ?, tamanho = length(corpo) + ? WHERE url = ?",
+                (dados, len(dados), url)
+            )
+            self._aplicar_limite()
+            self._conn.commit()
+
+    def renovar(self, url):
+        """Marca a entrada como revalidada (resposta 304), reiniciando sua validade."""
+        agora = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE respostas SET armazenado_em = ?, acessado_em = ? WHERE url = ?",
+                (agora, agora, url)
+            )
+            self._conn.commit()
+
+    def remover_expirados(self):
+        """Remove as entradas que não são acessadas há mais de `retencao` segundos."""
+        with self._lock:
+            self._conn.execute("DELETE FROM respostas WHERE acessado_em < ?", (time.time() - self.retencao,))
+            self._conn.commit()
+
+    def _aplicar_limite(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+        for url, tamanho in self._conn.execute(
+            "SELECT url, tamanho FROM respostas ORDER BY acessado_em"
+        ).fetchall():
+            if total <= self.tamanho_maximo:
+                break
+            self._conn.execute("DELETE FROM respostas WHERE url = ?", (url,))
+            total -= tamanho
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
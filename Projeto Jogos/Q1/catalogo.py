@@ -0,0 +1,107 @@
+import sqlite3
+
+from comum.texto import normalizar_texto
+from incremental import encontrar_coluna_titulo
+
+# Catálogo único de jogos de todos os consoles, com índice pelo título normalizado
+
+# Um comando por item, para que o esquema seja criado com conn.execute na mesma
+# transação das inserções (executescript faria COMMIT antes de começar)
+ESQUEMA_CATALOGO = (
+    """
+    CREATE TABLE IF NOT EXISTS jogos (
+        chave TEXT PRIMARY KEY,
+        titulo TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jogos_titulo ON jogos (titulo)",
+    """
+    CREATE TABLE IF NOT EXISTS jogos_plataformas (
+        chave TEXT NOT NULL REFERENCES jogos (chave),
+        plataforma TEXT NOT NULL,
+        PRIMARY KEY (chave, plataforma)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jogos_plataformas_plataforma ON jogos_plataformas (plataforma)",
+    """
+    CREATE VIEW IF NOT EXISTS catalogo AS
+        SELECT jogos.titulo, jogos.chave, group_concat(jogos_plataformas.plataforma, '|') AS plataformas
+        FROM jogos JOIN jogos_plataformas USING (chave)
+        GROUP BY jogos.chave
+    """,
+)
+
+def construir_catalogo(dfs_por_console, caminho_db='Q1/catalogo_jogos.db'):
+    """
+    Junta as tabelas de todos os consoles em um catálogo SQLite.
+
+    Cada jogo recebe uma chave normalizada (minúsculas, sem acentos nem
+    pontuação) e a lista de plataformas em que aparece. O catálogo é
+    reconstruído a cada chamada, em uma única transação: se algo falhar, o
+    catálogo anterior é mantido.
+
+    Args:
+        dfs_por_console (dict): console -> lista de DataFrames limpos.
+        caminho_db (str, optional): Caminho do banco SQLite do catálogo.
+
+    Returns:
+        int: Quantidade de jogos distintos no catálogo.
+    """
+    jogos = {}
+    plataformas = set()
+    for console, dfs in dfs_por_console.items():
+        plataforma = console.replace('_', ' ')
+        for df in dfs:
+            if df.empty:
+                continue
+            for titulo in df.iloc[:, encontrar_coluna_titulo(df)]:
+                chave = normalizar_texto(titulo)
+                if not chave:
+                    continue
+                jogos.setdefault(chave, titulo.strip())
+                plataformas.add((chave, plataforma))
+
+    conn = sqlite3.connect(caminho_db)
+    try:
+        with conn:
+            # BEGIN explícito: o sqlite3 só abre a transação sozinho antes de INSERT/UPDATE/DELETE,
+            # e os DROP/CREATE seriam confirmados um a um
+            conn.execute("BEGIN")
+            conn.execute("DROP TABLE IF EXISTS jogos_plataformas")
+            conn.execute("DROP TABLE IF EXISTS jogos")
+            for comando in ESQUEMA_CATALOGO:
+                conn.execute(comando)
+            conn.executemany("INSERT INTO jogos (chave, titulo) VALUES (?, ?)", jogos.items())
+            conn.executemany("INSERT INTO jogos_plataformas (chave, plataforma) VALUES (?, ?)", sorted(plataformas))
+    finally:
+        conn.close()
+
+    return len(jogos)
+
+def buscar_no_catalogo(titulo, caminho_db='Q1/catalogo_jogos.db'):
+    """
+    Procura um título informado pelo usuário no catálogo.
+
+    A busca usa a chave normalizada, portanto "the witcher 3" encontra
+    "The Witcher 3" com uma consulta ao índice, sem varrer as tabelas.
+
+    Args:
+        titulo (str): Título livre, como os de `jogos_preferidos`.
+        caminho_db (str, optional): Caminho do banco SQLite do catálogo.
+
+    Returns:
+        tuple: (título do catálogo, lista de plataformas), ou None se não encontrado.
+    """
+    chave = normalizar_texto(titulo)
+    conn = sqlite3.connect(caminho_db)
+    try:
+        linha = conn.execute("SELECT titulo FROM jogos WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            return None
+        plataformas = [
+            plataforma for (plataforma,) in
+            conn.execute("SELECT plataforma FROM jogos_plataformas WHERE chave = ? ORDER BY plataforma", (chave,))
+        ]
+        return linha[0], plataformas
+    finally:
+        conn.close()
@@ -0,0 +1,189 @@
+import re
+
+import lxml.html
+from pandas import __version__ as _VERSAO_PANDAS
+from pandas.io.parsers import TextParser
+
+# Extração das tabelas "wikitable" em uma única análise do documento.
+#
+# O caminho antigo analisava a página com o html.parser do BeautifulSoup,
+# serializava cada tabela de volta para texto e a entregava ao pd.read_html,
+# que a analisava de novo. Aqui o documento é analisado uma única vez pelo lxml
+# e os DataFrames são montados diretamente a partir do texto das células,
+# seguindo as mesmas regras do pd.read_html (cabeçalhos de várias linhas,
+# rowspan/colspan, elementos ocultos, quebras de linha e conversão de tipos).
+
+# Versão das regras de extração; as tabelas guardadas no cache HTTP por outra
+# versão são extraídas de novo
+VERSAO_EXTRACAO = 'lxml-2'
+
+XPATH_WIKITABLE = "//table[contains(concat(' ', normalize-space(@class), ' '), ' wikitable ')]"
+
+# Mesma normalização de espaços aplicada pelo pd.read_html ao texto das células
+_RE_ESPACOS = re.compile(r"[\r\n]+|\s{2,}")
+
+# As regras acima e a conversão de tipos pelo TextParser (interno ao pandas)
+# reproduzem o pd.read_html e foram conferidas com o pandas 2.3 e 3.0, por
+# versão principal: a partir do pandas 3, rowspans do cabeçalho continuam no
+# corpo e os do corpo, no rodapé. Com outra versão principal a importação
+# falha, e o Q1 volta ao caminho antigo (pd.read_html) em vez de mudar a
+# extração sem aviso; testes/test_q1_extracao.py compara os dois caminhos.
+_SPANS_ENTRE_SECOES_POR_VERSAO = {2: False, 3: True}
+
+_VERSAO_PRINCIPAL_PANDAS = int(_VERSAO_PANDAS.split('.')[0])
+if _VERSAO_PRINCIPAL_PANDAS not in _SPANS_ENTRE_SECOES_POR_VERSAO:
+    raise ImportError(f"Extração com lxml não conferida com o pandas {_VERSAO_PANDAS}.")
+_SPANS_ENTRE_SECOES = _SPANS_ENTRE_SECOES_POR_VERSAO[_VERSAO_PRINCIPAL_PANDAS]
+
+
+def _oculto(elemento):
+    return "display:none" in elemento.attrib.get('style', '').replace(" ", "")
+
+
+def _preparar(tabela):
+    # <br> vira quebra de linha (depois, espaço), como no pd.read_html
+    for quebra in tabela.xpath('.//br'):
+        quebra.tail = "\n" + (quebra.tail or "")
+    for elemento in tabela.xpath('.//style'):
+        elemento.drop_tree()
+    for elemento in tabela.xpath('.//*[@style]'):
+        if _oculto(elemento):
+            elemento.drop_tree()
+
+
+def _celulas(linha):
+    return linha.xpath('./td|./th')
+
+
+def _separar_secoes(tabela):
+    cabecalho = []
+    for thead in tabela.xpath('.//thead'):
+        cabecalho.extend(thead.xpath('./tr'))
+        # <thead> com células soltas, sem <tr>: tratado como uma linha
+        if _celulas(thead):
+            cabecalho.append(thead)
+
+    corpo = tabela.xpath('.//tbody//tr') + tabela.xpath('./tr')
+    rodape = tabela.xpath('.//tfoot//tr')
+
+    # Sem <thead>, as primeiras linhas formadas apenas por <th> são o cabeçalho
+    if not cabecalho:
+        while corpo and all(celula.tag == 'th' for celula in _celulas(corpo[0])):
+            cabecalho.append(corpo.pop(0))
+
+    return cabecalho, corpo, rodape
+
+
+def _expandir_spans(linhas, pendentes=None, transbordar=False):
+    """
+    Converte as linhas em listas de textos, replicando células com rowspan/colspan.
+
+    Returns:
+        tuple: (textos das linhas, rowspans que continuam na próxima seção).
+    """
+    textos_linhas = []
+    pendentes = pendentes or []  # (indice, texto, linhas restantes) vindos de rowspans anteriores
+
+    for linha in linhas:
+        textos = []
+        proximos = []
+        indice = 0
+        for celula in _celulas(linha):
+            while pendentes and pendentes[0][0] <= indice:
+                indice_anterior, texto_anterior, restantes = pendentes.pop(0)
+                textos.append(texto_anterior)
+                if restantes > 1:
+                    proximos.append((indice_anterior, texto_anterior, restantes - 1))
+                indice += 1
+
+            texto = _RE_ESPACOS.sub(" ", celula.text_content().strip())
+            rowspan = int(celula.get('rowspan') or 1)
+            colspan = int(celula.get('colspan') or 1)
+            for _ in range(colspan):
+                textos.append(texto)
+                if rowspan > 1:
+                    proximos.append((indice, texto, rowspan - 1))
+                indice += 1
+
+        for indice_anterior, texto_anterior, restantes in pendentes:
+            textos.append(texto_anterior)
+            if restantes > 1:
+                proximos.append((indice_anterior, texto_anterior, restantes - 1))
+        textos_linhas.append(textos)
+        pendentes = proximos
+
+    if transbordar:
+        return textos_linhas, pendentes
+
+    # Linhas que só existem por causa de rowspans da última linha
+    while pendentes:
+        textos = []
+        proximos = []
+        for indice_anterior, texto_anterior, restantes in pendentes:
+            textos.append(texto_anterior)
+            if restantes > 1:
+                proximos.append((indice_anterior, texto_anterior, restantes - 1))
+        textos_linhas.append(textos)
+        pendentes = proximos
+
+    return textos_linhas, []
+
+
+def tabela_para_dataframe(tabela):
+    """
+    Monta um DataFrame a partir de um elemento <table> do lxml.
+
+    Args:
+        tabela (lxml.html.HtmlElement): Tabela já analisada.
+
+    Returns:
+        pd.DataFrame: Mesmo resultado que `pd.read_html(str(tabela))[0]`.
+    """
+    _preparar(tabela)
+    cabecalho, corpo, rodape = _separar_secoes(tabela)
+    if _SPANS_ENTRE_SECOES:
+        cabecalho, pendentes = _expandir_spans(cabecalho, transbordar=True)
+        corpo, pendentes = _expandir_spans(corpo, pendentes, transbordar=bool(rodape))
+        rodape, _ = _expandir_spans(rodape, pendentes)
+    else:
+        cabecalho, _ = _expandir_spans(cabecalho)
+        corpo, _ = _expandir_spans(corpo)
+        rodape, _ = _expandir_spans(rodape)
+
+    header = None
+    if cabecalho:
+        corpo = cabecalho + corpo
+        if len(cabecalho) == 1:
+            header = 0
+        else:
+            header = [i for i, linha in enumerate(cabecalho) if any(texto for texto in linha)]
+    corpo += rodape
+
+    largura = max((len(linha) for linha in corpo), default=0)
+    for linha in corpo:
+        if len(linha) < largura:
+            linha.extend([""] * (largura - len(linha)))
+
+    with TextParser(corpo, header=header, skiprows=0, parse_dates=False,
+                    thousands=",", decimal=".", keep_default_na=True) as parser:
+        return parser.read()
+
+
+def extrair_tabelas_html(conteudo, min_linhas=10):
+    """
+    Extrai as tabelas "wikitable" de uma página analisando o HTML uma única vez.
+
+    Args:
+        conteudo (bytes | str): HTML da página.
+        min_linhas (int, optional): Número mínimo de <tr> para a tabela ser aproveitada.
+
+    Returns:
+        list: Lista de DataFrames, na ordem em que as tabelas aparecem na página.
+    """
+    documento = lxml.html.fromstring(conteudo)
+    lista_dfs = []
+    for tabela in documento.xpath(XPATH_WIKITABLE):
+        if len(tabela.xpath('.//tr')) < min_linhas or _oculto(tabela):
+            continue
+        lista_dfs.append(tabela_para_dataframe(tabela))
+    return lista_dfs
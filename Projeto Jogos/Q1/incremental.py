@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from comum.texto import normalizar_texto
+
+# Modo incremental do web scraping: compara a extração atual com o último
+# snapshot de cada console e registra apenas as linhas inseridas, alteradas
+# e removidas.
+
+TERMOS_TITULO = ('titulo', 'jogo', 'nome')
+
+ESQUEMA_SNAPSHOT = """
+CREATE TABLE IF NOT EXISTS snapshot (
+    console TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    assinatura TEXT NOT NULL,
+    dados TEXT NOT NULL,
+    PRIMARY KEY (console, chave)
+) WITHOUT ROWID
+"""
+
+def nomes_colunas(df):
+    """Nomes das colunas em texto, juntando os níveis de colunas MultiIndex."""
+    return [
+        ' '.join(str(nivel) for nivel in col).strip() if isinstance(col, tuple) else str(col)
+        for col in df.columns
+    ]
+
+def encontrar_coluna_titulo(df):
+    """
+    Localiza a coluna com o título do jogo.
+
+    Returns:
+        int: Posição da primeira coluna cujo nome menciona título, jogo ou nome;
+             a primeira coluna, se nenhuma for encontrada.
+    """
+    for i, nome in enumerate(nomes_colunas(df)):
+        nome = normalizar_texto(nome)
+        if any(termo in nome for termo in TERMOS_TITULO):
+            return i
+    return 0
+
+def _hash(*partes):
+    return hashlib.sha1('\x1f'.join(partes).encode('utf-8')).hexdigest()
+
+def calcular_chaves(df, console):
+    """
+    Gera uma chave estável por linha a partir do título normalizado e da plataforma.
+
+    Títulos repetidos na mesma plataforma (por exemplo, um lançamento por região)
+    são diferenciados pela ordem em que aparecem.
+
+    Returns:
+        list: Chaves na mesma ordem das linhas do DataFrame.
+    """
+    plataforma = normalizar_texto(console.replace('_', ' '))
+    titulos = df.iloc[:, encontrar_coluna_titulo(df)].map(normalizar_texto)
+    ocorrencias = titulos.groupby(titulos, sort=False).cumcount()
+    return [_hash(plataforma, titulo, str(n)) for titulo, n in zip(titulos, ocorrencias)]
+
+def _registros(df):
+    nomes = nomes_colunas(df)
+    for valores in df.itertuples(index=False, name=None):
+        yield json.dumps(dict(zip(nomes, valores)), ensure_ascii=False, default=str)
+
+def _gravar_changelog(changelog, arquivo_changelog):
+    df_changelog = pd.DataFrame(changelog, columns=['operacao', 'chave', 'dados'])
+    df_changelog.insert(0, 'registrado_em', time.strftime('%Y-%m-%d %H:%M:%S'))
+    cabecalho = not os.path.exists(arquivo_changelog)
+    with open(arquivo_changelog, 'a', newline='', encoding='utf-8') as arquivo:
+        df_changelog.to_csv(arquivo, index=False, header=cabecalho)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+
+def atualizar_incremental(df, console, caminho_db='Q1/snapshot_jogos.db', pasta='Q1'):
+    """
+    Compara o DataFrame com o snapshot anterior do console e aplica as diferenças.
+
+    Apenas as chaves e assinaturas do snapshot são carregadas para a comparação;
+    o conteúdo das linhas removidas é lido do banco somente para o changelog.
+    As alterações são gravadas em `{pasta}/{console}_changelog.csv` e só depois
+    aplicadas ao snapshot, em uma única transação; uma falha entre as duas etapas
+    pode repetir alterações no changelog na próxima execução, mas nunca perdê-las.
+
+    Args:
+        df (pd.DataFrame): Dados atuais do console.
+        console (str): Nome do console.
+        caminho_db (str, optional): Banco SQLite com os snapshots.
+        pasta (str, optional): Pasta onde o changelog é gravado.
+
+    Returns:
+        dict: Quantidade de linhas inseridas, atualizadas e removidas.
+    """
+    chaves = calcular_chaves(df, console)
+    atuais = {}
+    for chave, dados in zip(chaves, _registros(df)):
+        atuais[chave] = (_hash(dados), dados)
+
+    conn = sqlite3.connect(caminho_db)
+    try:
+        conn.execute(ESQUEMA_SNAPSHOT)
+        anteriores = dict(conn.execute("SELECT chave, assinatura FROM snapshot WHERE console = ?", (console,)))
+
+        inseridos = [chave for chave in atuais if chave not in anteriores]
+        atualizados = [chave for chave in atuais if chave in anteriores and anteriores[chave] != atuais[chave][0]]
+        removidos = [chave for chave in anteriores if chave not in atuais]
+
+        changelog = [('inserido', chave, atuais[chave][1]) for chave in inseridos]
+        changelog += [('atualizado', chave, atuais[chave][1]) for chave in atualizados]
+        for inicio in range(0, len(removidos), 500):
+            lote = removidos[inicio:inicio + 500]
+            marcadores = ', '.join('?' * len(lote))
+            changelog += [
+                ('removido', chave, dados)
+                for chave, dados in conn.execute(
+                    f"SELECT chave, dados FROM snapshot WHERE console = ? AND chave IN ({marcadores})",
+                    (console, *lote)
+                )
+            ]
+
+        # O changelog é gravado antes de o snapshot mudar: se a gravação falhar, ou o
+        # processo parar no meio, a próxima execução encontra as mesmas diferenças
+        if changelog:
+            _gravar_changelog(changelog, os.path.join(pasta, f'{console}_changelog.csv'))
+
+        with conn:
+            conn.executemany(
+                "INSERT INTO snapshot (console, chave, assinatura, dados) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (console, chave) DO UPDATE SET assinatura = excluded.assinatura, dados = excluded.dados",
+                [(console, chave, *atuais[chave]) for chave in inseridos + atualizados]
+            )
+            conn.executemany(
+                "DELETE FROM snapshot WHERE console = ? AND chave = ?",
+                [(console, chave) for chave in removidos]
+            )
+    finally:
+        conn.close()
+
+    return {'inseridos': len(inseridos), 'atualizados': len(atualizados), 'removidos': len(removidos)}
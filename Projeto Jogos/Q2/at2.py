@@ -1,98 +1,176 @@
+import argparse
 import pandas as pd
 import json
-import re
-from datetime import datetime
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_limpeza import CacheLimpeza
+from deduplicacao import agrupar_duplicatas
+from comum.exportacao import LIMITE_LINHAS_XLSX, exportar_tabela
+from comum.intercambio import CAMINHO_EXCEL_CONSOLIDADO, CAMINHO_INTERCAMBIO, gravar_intercambio
+from comum.leitura import ler_csv_em_blocos, ler_excel_em_blocos, ler_json_em_blocos
+from comum.validacao import DATA_INVALIDA, EMAIL_INVALIDO, emails_validos, normalizar_datas
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 # Definindo classes de exceção personalizadas
+# (__reduce__ preserva a mensagem original quando a exceção volta de um processo de trabalho)
 class ErroLeituraArquivo(Exception):
     def __init__(self, mensagem):
+        self.mensagem = mensagem
         super().__init__(f"Erro ao ler o arquivo: {mensagem}")
 
+    def __reduce__(self):
+        return (self.__class__, (self.mensagem,))
+
 class ErroValidacaoDados(Exception):
     def __init__(self, mensagem):
+        self.mensagem = mensagem
         super().__init__(f"Erro na validação dos dados: {mensagem}")
 
+    def __reduce__(self):
+        return (self.__class__, (self.mensagem,))
+
 class ErroExportacaoDados(Exception):
     def __init__(self, mensagem):
+        self.mensagem = mensagem
         super().__init__(f"Erro ao exportar os dados: {mensagem}")
 
-# Função para ler arquivos CSV, Excel e JSON
-def ler_arquivos():
+    def __reduce__(self):
+        return (self.__class__, (self.mensagem,))
+
+CAMINHO_CSV = 'Q2/dadosAT.csv'
+CAMINHO_EXCEL = 'Q2/dadosATNovo.xlsx'
+CAMINHO_JSON = 'Q2/dadosATNovo.json'
+
+def ler_csv(caminho=CAMINHO_CSV):
     """
-    Função para ler arquivos CSV, Excel e JSON.
+    Função para ler o arquivo CSV, com nova tentativa em latin1.
 
     Returns:
-        list: Lista contendo DataFrames lidos de cada tipo de arquivo.
+        pd.DataFrame: Dados lidos, ou None se o arquivo não existir.
 
     Raises:
-        ErroLeituraArquivo: Se ocorrer um erro ao ler qualquer um dos arquivos.
+        ErroLeituraArquivo: Se ocorrer um erro ao ler o arquivo.
     """
-    dfs = []
-    
     try:
-        df_csv = pd.read_csv('Q2/dadosAT.csv', encoding='utf-8')
-        dfs.append(df_csv)
-    except UnicodeDecodeError:
-        df_csv = pd.read_csv('Q2/dadosAT.csv', encoding='latin1')
-        dfs.append(df_csv)
+        try:
+            return pd.read_csv(caminho, encoding='utf-8')
+        except UnicodeDecodeError:
+            return pd.read_csv(caminho, encoding='latin1')
     except FileNotFoundError:
         print("Arquivo CSV não encontrado, continuando sem o CSV.")
+        return None
     except Exception as e:
         raise ErroLeituraArquivo(f"CSV: {e}")
 
+def ler_excel(caminho=CAMINHO_EXCEL):
+    """
+    Função para ler o arquivo Excel.
+
+    Returns:
+        pd.DataFrame: Dados lidos.
+
+    Raises:
+        ErroLeituraArquivo: Se ocorrer um erro ao ler o arquivo, inclusive se ele não existir.
+    """
     try:
-        df_excel = pd.read_excel('Q2/dadosATNovo.xlsx', engine='openpyxl')
-        dfs.append(df_excel)
+        return pd.read_excel(caminho, engine='openpyxl')
     except Exception as e:
         raise ErroLeituraArquivo(f"Excel: {e}")
 
+def ler_json(caminho=CAMINHO_JSON):
+    """
+    Função para ler o arquivo JSON.
+
+    Returns:
+        pd.DataFrame: Dados lidos, ou None se o arquivo não existir.
+
+    Raises:
+        ErroLeituraArquivo: Se ocorrer um erro ao ler o arquivo.
+    """
     try:
-        with open('Q2/dadosATNovo.json', 'r', encoding='utf-8') as file:
+        with open(caminho, 'r', encoding='utf-8') as file:
             data_json = json.load(file)
-            df_json = pd.DataFrame(data_json)
-            dfs.append(df_json)
+            return pd.DataFrame(data_json)
     except FileNotFoundError:
         print("Arquivo JSON não encontrado, continuando sem o JSON.")
+        return None
     except Exception as e:
         raise ErroLeituraArquivo(f"JSON: {e}")
 
+# Leitores de cada fonte, na ordem usada na consolidação
+LEITORES = {'CSV': ler_csv, 'Excel': ler_excel, 'JSON': ler_json}
+CAMINHOS = {'CSV': CAMINHO_CSV, 'Excel': CAMINHO_EXCEL, 'JSON': CAMINHO_JSON}
+
+# Versão das regras de limpeza: altere sempre que limpar_e_consolidar_dados mudar,
+# para que os DataFrames limpos guardados no cache sejam descartados
+VERSAO_REGRAS_LIMPEZA = 2
+
+# Função para ler arquivos CSV, Excel e JSON
+def ler_arquivos():
+    """
+    Função para ler arquivos CSV, Excel e JSON.
+
+    Returns:
+        list: Lista contendo DataFrames lidos de cada tipo de arquivo.
+
+    Raises:
+        ErroLeituraArquivo: Se ocorrer um erro ao ler qualquer um dos arquivos.
+    """
+    dfs = [df for df in (leitor() for leitor in LEITORES.values()) if df is not None]
+
     if not dfs:
         raise ErroLeituraArquivo("Nenhum arquivo foi carregado com sucesso.")
     
     return dfs
 
-# Função para validar email
-def eh_email_valido(email):
-    """
-    Função para validar um endereço de email.
+# Fontes de dados: (nome, caminho, leitor em blocos, arquivo opcional)
+FONTES = [
+    ('CSV', CAMINHO_CSV, ler_csv_em_blocos, True),
+    ('Excel', CAMINHO_EXCEL, ler_excel_em_blocos, False),
+    ('JSON', CAMINHO_JSON, ler_json_em_blocos, True),
+]
 
-    Args:
-        email (str): Endereço de email a ser validado.
-
-    Returns:
-        bool: True se o email for válido, False caso contrário.
+def ler_arquivos_em_blocos(tamanho_bloco=50_000):
     """
-    regex = r'^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.match(regex, email) is not None
+    Função para ler os arquivos CSV, Excel e JSON em blocos de tamanho limitado.
 
-# Função para validar data
-def validar_data(data):
-    """
-    Função para validar e converter uma string de data em formato padrão.
+    O CSV é lido com `chunksize`, o JSON com decodificação incremental do array e o
+    Excel com o modo somente leitura do openpyxl, de modo que a memória usada na
+    leitura dependa do tamanho do bloco e não do tamanho dos arquivos.
 
     Args:
-        data (str): String contendo a data a ser validada e convertida.
+        tamanho_bloco (int, optional): Número máximo de linhas por bloco.
 
-    Returns:
-        str: Data no formato 'YYYY-MM-DD' se válida, 'Data inválida' caso contrário.
+    Yields:
+        pd.DataFrame: Blocos de dados, na ordem CSV, Excel e JSON.
+
+    Raises:
+        ErroLeituraArquivo: Se ocorrer um erro ao ler qualquer um dos arquivos.
     """
-    formatos = ["%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"]
-    for fmt in formatos:
+    algum_bloco = False
+    for nome, caminho, leitor, opcional in FONTES:
         try:
-            return datetime.strptime(data, fmt).strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return 'Data inválida'
+            for bloco in leitor(caminho, tamanho_bloco):
+                algum_bloco = True
+                yield bloco
+        except FileNotFoundError as e:
+            if not opcional:
+                raise ErroLeituraArquivo(f"{nome}: {e}")
+            print(f"Arquivo {nome} não encontrado, continuando sem o {nome}.")
+        except Exception as e:
+            raise ErroLeituraArquivo(f"{nome}: {e}")
+
+    if not algum_bloco:
+        raise ErroLeituraArquivo("Nenhum arquivo foi carregado com sucesso.")
 
 # Função para limpar e consolidar dados
 def limpar_e_consolidar_dados(df):
@@ -109,8 +187,10 @@ def limpar_e_consolidar_dados(df):
         ErroValidacaoDados: Se ocorrer um erro na limpeza e validação dos dados.
     """
     try:
-        df['data_nascimento'] = df['data_nascimento'].apply(validar_data)
-        df['email'] = df['email'].apply(lambda x: x if eh_email_valido(x) else 'email inválido')
+        df['data_nascimento'] = normalizar_datas(df['data_nascimento'])
+        # A validação do email é feita uma única vez e acompanha o DataFrame até a consolidação
+        df['email_valido'] = emails_validos(df['email'])
+        df['email'] = df['email'].where(df['email_valido'], EMAIL_INVALIDO)
 
         # Preencher valores ausentes
         df.fillna({'estado': 'Desconhecido', 'consoles': 'Nenhum', 'jogos_preferidos': 'Nenhum'}, inplace=True)
@@ -119,65 +199,323 @@ def limpar_e_consolidar_dados(df):
     
     return df
 
-def consolidar_dados(dfs):
+COLUNAS_PRIMEIRA_LINHA = ['cidade', 'estado', 'consoles', 'jogos_preferidos']
+COLUNAS_CONSOLIDADAS = ['nome_completo', 'data_nascimento', 'email'] + COLUNAS_PRIMEIRA_LINHA
+
+def consolidar_dados(dfs, coluna_grupo='nome_completo'):
     """
     Função para consolidar múltiplos DataFrames em um único DataFrame.
 
     Args:
         dfs (list): Lista de DataFrames a serem consolidados.
+        coluna_grupo (str, optional): Coluna que identifica o usuário. Defaults to 'nome_completo';
+            use 'id_usuario' para agrupar pelos grupos de `deduplicacao.agrupar_duplicatas`.
 
     Returns:
         pd.DataFrame: DataFrame consolidado.
 
     Notes:
-        A função agrupa os dados pelo campo 'nome_completo' e aplica regras para consolidar linhas.
+        A função agrupa os dados pelo campo `coluna_grupo`. Para cada usuário, mantém o primeiro
+        email válido, a primeira data válida e o primeiro valor das demais colunas.
 
     """
     df_combinado = pd.concat(dfs, ignore_index=True)
+    df_combinado = df_combinado.dropna(subset=[coluna_grupo])
+
+    # Valores inválidos viram NA para que first() escolha o primeiro válido de cada usuário
+    validos = pd.DataFrame({
+        coluna_grupo: df_combinado[coluna_grupo],
+        'data_nascimento': df_combinado['data_nascimento'].mask(df_combinado['data_nascimento'] == DATA_INVALIDA),
+        'email': df_combinado['email'].where(df_combinado['email_valido']),
+    })
+    primeiros_validos = validos.groupby(coluna_grupo).first()
+    primeiros_validos = primeiros_validos.fillna({'data_nascimento': DATA_INVALIDA, 'email': EMAIL_INVALIDO})
+
+    # Demais colunas: primeira linha de cada usuário, mesmo que contenha valores ausentes
+    colunas = [
+        coluna for coluna in COLUNAS_CONSOLIDADAS
+        if coluna != coluna_grupo and coluna not in primeiros_validos.columns
+    ]
+    primeiras_linhas = df_combinado.drop_duplicates(coluna_grupo).set_index(coluna_grupo)
+
+    df_consolidado = primeiros_validos.join(primeiras_linhas[colunas]).reset_index()
+    if coluna_grupo != 'nome_completo':
+        df_consolidado = df_consolidado.sort_values('nome_completo', kind='stable', ignore_index=True)
+
+    return df_consolidado[COLUNAS_CONSOLIDADAS]
+
+def deduplicar_e_consolidar(dfs, limiar=0.9, janela=5):
+    """
+    Função para consolidar os dados reunindo também usuários quase duplicados.
+
+    Linhas com nomes quase iguais ("João Silva" e "Joao  Silva") ou com o mesmo email
+    são agrupadas por `agrupar_duplicatas` antes da consolidação. Como em
+    `consolidar_dados`, linhas sem nome são descartadas.
+
+    Args:
+        dfs (list): Lista de DataFrames limpos.
+        limiar (float, optional): Similaridade mínima entre os nomes.
+        janela (int, optional): Janela da vizinhança ordenada.
+
+    Returns:
+        pd.DataFrame: DataFrame consolidado.
+    """
+    df_combinado = pd.concat(dfs, ignore_index=True).dropna(subset=['nome_completo'])
+    df_combinado['id_usuario'], relatorio = agrupar_duplicatas(df_combinado, limiar, janela)
 
-    # Remover duplicatas baseadas nas regras fornecidas
-    def consolidar_linhas(grupo_dados):
-        email_valido = next((email for email in grupo_dados['email'] if eh_email_valido(email)), 'email inválido')
-        data_valida = next((data for data in grupo_dados['data_nascimento'] if data != 'Data inválida'), 'Data inválida')
-        return pd.Series({
-            'nome_completo': grupo_dados['nome_completo'].iloc[0],
-            'data_nascimento': data_valida,
-            'email': email_valido,
-            'cidade': grupo_dados['cidade'].iloc[0],
-            'estado': grupo_dados['estado'].iloc[0],
-            'consoles': grupo_dados['consoles'].iloc[0],
-            'jogos_preferidos': grupo_dados['jogos_preferidos'].iloc[0]
-        })
+    proporcao = relatorio['pares_comparados'] / max(relatorio['pares_possiveis'], 1)
+    print(f"Deduplicação: {relatorio['pares_comparados']} pares comparados de "
+          f"{relatorio['pares_possiveis']} possíveis ({proporcao:.4%}); "
+          f"{relatorio['linhas']} linhas em {relatorio['grupos']} usuários")
 
-    df_combinado = df_combinado.groupby('nome_completo').apply(consolidar_linhas).reset_index(drop=True)
+    return consolidar_dados([df_combinado], coluna_grupo='id_usuario')
 
-    return df_combinado
+def _serializar(df):
+    # Buffer colunar do Arrow quando possível; pickle para colunas que o Arrow não aceita
+    if pa is not None:
+        try:
+            tabela = pa.Table.from_pandas(df)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, tabela.schema) as escritor:
+                escritor.write_table(tabela)
+            return 'arrow', sink.getvalue()
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    return 'pickle', pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _desserializar(formato, buffer):
+    if formato == 'arrow':
+        return pa.ipc.open_stream(buffer).read_all().to_pandas()
+    return pickle.loads(buffer)
+
+def carregar_fonte(nome, cache=None, tempos=None):
+    """
+    Função para obter o DataFrame limpo de uma fonte, usando o cache quando possível.
+
+    Args:
+        nome (str): Nome da fonte ('CSV', 'Excel' ou 'JSON').
+        cache (CacheLimpeza, optional): Cache dos DataFrames limpos.
+        tempos (dict, optional): Recebe o tempo gasto em cada etapa.
+
+    Returns:
+        pd.DataFrame: DataFrame limpo, ou None se a fonte opcional não existir.
+    """
+    tempos = {} if tempos is None else tempos
+
+    if cache is not None:
+        inicio = time.perf_counter()
+        df = cache.obter(CAMINHOS[nome], VERSAO_REGRAS_LIMPEZA)
+        tempos['cache'] = time.perf_counter() - inicio
+        if df is not None:
+            return df
+
+    inicio = time.perf_counter()
+    df = LEITORES[nome]()
+    tempos['leitura'] = time.perf_counter() - inicio
+    if df is None:
+        return None
+
+    inicio = time.perf_counter()
+    df = limpar_e_consolidar_dados(df)
+    tempos['limpeza'] = time.perf_counter() - inicio
+
+    if cache is not None:
+        cache.salvar(CAMINHOS[nome], VERSAO_REGRAS_LIMPEZA, df)
+    return df
+
+def carregar_fontes(cache=None):
+    """
+    Função para obter os DataFrames limpos de todas as fontes, em sequência.
+
+    Returns:
+        list: Lista de DataFrames limpos, na ordem CSV, Excel e JSON.
+
+    Raises:
+        ErroLeituraArquivo: Se nenhuma fonte puder ser carregada.
+    """
+    dfs = [df for df in (carregar_fonte(nome, cache) for nome in LEITORES) if df is not None]
+    if not dfs:
+        raise ErroLeituraArquivo("Nenhum arquivo foi carregado com sucesso.")
+    return dfs
+
+def _carregar_e_limpar(nome, cache=None):
+    """Lê e limpa uma fonte em um processo de trabalho, devolvendo o resultado serializado."""
+    tempos = {}
+    df = carregar_fonte(nome, cache, tempos)
+    if df is None:
+        return None, None, tempos
+
+    inicio = time.perf_counter()
+    formato, buffer = _serializar(df)
+    tempos['serialização'] = time.perf_counter() - inicio
+    return formato, buffer, tempos
+
+def carregar_em_paralelo(max_workers=None, cache=None):
+    """
+    Função para ler e limpar cada fonte em um processo separado.
+
+    As regras de leitura são as mesmas de `ler_arquivos` (nova tentativa em latin1,
+    CSV e JSON opcionais). Os DataFrames limpos voltam como buffers do Arrow (ou
+    pickle) e são devolvidos na ordem CSV, Excel e JSON.
+
+    Returns:
+        list: Lista de DataFrames limpos.
+
+    Raises:
+        ErroLeituraArquivo: Se ocorrer um erro ao ler qualquer um dos arquivos.
+        ErroValidacaoDados: Se ocorrer um erro na limpeza de alguma fonte.
+    """
+    inicio_total = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers or len(LEITORES)) as executor:
+        futuros = {nome: executor.submit(_carregar_e_limpar, nome, cache) for nome in LEITORES}
+
+        dfs = []
+        for nome, futuro in futuros.items():
+            formato, buffer, tempos = futuro.result()
+            if buffer is not None:
+                inicio = time.perf_counter()
+                dfs.append(_desserializar(formato, buffer))
+                tempos[f'desserialização ({formato})'] = time.perf_counter() - inicio
+            detalhes = ', '.join(f"{etapa} {segundos:.2f}s" for etapa, segundos in tempos.items())
+            print(f"{nome}: {detalhes}")
+
+    print(f"Carga paralela concluída em {time.perf_counter() - inicio_total:.2f}s")
+    if not dfs:
+        raise ErroLeituraArquivo("Nenhum arquivo foi carregado com sucesso.")
+    return dfs
+
+def consolidar_em_blocos(blocos):
+    """
+    Função para limpar e consolidar os dados bloco a bloco.
+
+    Cada bloco é limpo e consolidado sozinho, ficando com uma linha por usuário do
+    bloco, e os resultados parciais são consolidados uma única vez no final. Como
+    os parciais são mantidos na ordem dos blocos, as regras de "primeiro valor
+    válido" dão o mesmo resultado que a consolidação de tudo de uma vez.
 
-def exportar_para_excel(df, nome_arquivo='dados_consolidados.xlsx'):
+    Args:
+        blocos (iterable): Blocos de dados brutos, em ordem.
+
+    Returns:
+        pd.DataFrame: DataFrame consolidado, ou None se não houver blocos.
+    """
+    parciais = []
+    for bloco in blocos:
+        parcial = consolidar_dados([limpar_e_consolidar_dados(bloco)])
+        parciais.append(parcial.assign(email_valido=parcial['email'] != EMAIL_INVALIDO))
+    if not parciais:
+        return None
+    if len(parciais) == 1:
+        return parciais[0][COLUNAS_CONSOLIDADAS]
+    return consolidar_dados(parciais)
+
+def exportar_para_excel(df, nome_arquivo=CAMINHO_EXCEL_CONSOLIDADO, limite_linhas=LIMITE_LINHAS_XLSX,
+                        formato_alternativo='.csv'):
     """
     Função para exportar um DataFrame para um arquivo Excel.
 
+    As linhas são gravadas em blocos, com memória constante. Acima de `limite_linhas`
+    linhas, o arquivo é gravado em `formato_alternativo` (.csv ou .parquet).
+
     Args:
         df (pd.DataFrame): DataFrame a ser exportado.
-        nome_arquivo (str, optional): Nome do arquivo de saída. Defaults to 'dados_consolidados.xlsx'.
+        nome_arquivo (str, optional): Nome do arquivo de saída. Defaults to CAMINHO_EXCEL_CONSOLIDADO, lido pelo Q3.
+        limite_linhas (int, optional): Máximo de linhas exportadas em XLSX.
+        formato_alternativo (str, optional): Formato usado acima do limite. Defaults to '.csv'.
 
     Raises:
         ErroExportacaoDados: Se ocorrer um erro ao exportar os dados para o arquivo Excel.
     """
     try:
-        df.to_excel(nome_arquivo, index=False)
-        print(f"Dados exportados com sucesso para {nome_arquivo}")
+        resultado = exportar_tabela(df, nome_arquivo, limite_linhas_xlsx=limite_linhas,
+                                    formato_alternativo=formato_alternativo)
+        print(f"Dados exportados com sucesso para {resultado['arquivo']} "
+              f"({resultado['linhas']} linhas, {resultado['linhas_por_segundo']:.0f} linhas/s)")
     except Exception as e:
         raise ErroExportacaoDados(f"Excel: {e}")
 
-def main():
+def exportar_intercambio(df, caminho=CAMINHO_INTERCAMBIO):
+    """
+    Função para exportar o DataFrame consolidado como arquivo de intercâmbio para o Q3.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser exportado.
+        caminho (str, optional): Arquivo .arrow (mapeável em memória) ou .parquet.
+
+    Raises:
+        ErroExportacaoDados: Se ocorrer um erro ao gravar o arquivo.
+    """
+    try:
+        inicio = time.perf_counter()
+        tamanho = gravar_intercambio(df, caminho)
+        print(f"Dados exportados com sucesso para {caminho} "
+              f"({len(df)} linhas, {tamanho / 1024 ** 2:.1f} MB em {time.perf_counter() - inicio:.2f}s)")
+    except Exception as e:
+        raise ErroExportacaoDados(f"Intercâmbio: {e}")
+
+def obter_dados_consolidados(tamanho_bloco=None, paralelo=False, cache=None, deduplicar=False):
+    """
+    Função para ler, limpar e consolidar os dados de todas as fontes, sem gravar nenhum arquivo.
+
+    Returns:
+        pd.DataFrame: Dados consolidados, um usuário por linha.
+
+    Raises:
+        ErroLeituraArquivo, ErroValidacaoDados: Se a leitura ou a limpeza falharem.
+    """
+    if tamanho_bloco:
+        return consolidar_em_blocos(ler_arquivos_em_blocos(tamanho_bloco))
+    dfs = carregar_em_paralelo(cache=cache) if paralelo else carregar_fontes(cache)
+    if deduplicar:
+        return deduplicar_e_consolidar(dfs)
+    return consolidar_dados(dfs)
+
+def main(tamanho_bloco=None, paralelo=False, cache=None, deduplicar=False, excel=False,
+         intercambio=CAMINHO_INTERCAMBIO):
+    if intercambio and pa is None:
+        print("pyarrow não está instalado: exportando apenas para Excel.")
+        intercambio = None
+    if not intercambio:
+        excel = True  # sem arquivo de intercâmbio, o Q3 lê o Excel
     try:
-        dfs = ler_arquivos()
-        dfs_limpos = [limpar_e_consolidar_dados(df) for df in dfs]
-        df_consolidado = consolidar_dados(dfs_limpos)
-        exportar_para_excel(df_consolidado)
+        df_consolidado = obter_dados_consolidados(tamanho_bloco, paralelo, cache, deduplicar)
+        if intercambio:
+            exportar_intercambio(df_consolidado, intercambio)
+        if excel:
+            exportar_para_excel(df_consolidado)
     except (ErroLeituraArquivo, ErroValidacaoDados, ErroExportacaoDados) as e:
         print(e)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Lê, limpa e consolida os dados de usuários.")
+    parser.add_argument('--blocos', type=int, default=None, metavar='LINHAS',
+                        help="Lê e limpa os arquivos em blocos de LINHAS linhas, com memória limitada.")
+    parser.add_argument('--paralelo', action='store_true',
+                        help="Lê e limpa cada arquivo em um processo separado.")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Não usa o cache de DataFrames limpos.")
+    parser.add_argument('--limpar-cache', action='store_true',
+                        help="Descarta o cache de DataFrames limpos antes de executar.")
+    parser.add_argument('--cache-tamanho-maximo', type=int, default=500,
+                        help="Tamanho máximo do cache em MB.")
+    parser.add_argument('--deduplicar', action='store_true',
+                        help="Reúne usuários com nomes quase iguais ou o mesmo email antes de consolidar.")
+    parser.add_argument('--intercambio', default=CAMINHO_INTERCAMBIO, metavar='ARQUIVO',
+                        help="Arquivo .arrow ou .parquet lido pelo Q3.")
+    parser.add_argument('--sem-intercambio', action='store_true',
+                        help="Não grava o arquivo de intercâmbio.")
+    parser.add_argument('--excel', action='store_true',
+                        help=f"Grava também o relatório {CAMINHO_EXCEL_CONSOLIDADO}.")
+    args = parser.parse_args()
+    if args.deduplicar and args.blocos:
+        parser.error("--deduplicar não pode ser usado com --blocos.")
+    if args.limpar_cache and args.sem_cache:
+        parser.error("--limpar-cache não pode ser usado com --sem-cache.")
+
+    cache = None
+    if not args.sem_cache:
+        cache = CacheLimpeza(tamanho_maximo=args.cache_tamanho_maximo * 1024 * 1024)
+        if args.limpar_cache:
+            cache.limpar()
+    main(tamanho_bloco=args.blocos, paralelo=args.paralelo, cache=cache, deduplicar=args.deduplicar,
+         excel=args.excel, intercambio=None if args.sem_intercambio else args.intercambio)
@@ -0,0 +1,85 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from at2 import (
+    COLUNAS_CONSOLIDADAS, DATA_INVALIDA, EMAIL_INVALIDO, consolidar_dados, limpar_e_consolidar_dados
+)
+
+# Confere que a consolidação vetorizada produz o mesmo resultado que a versão
+# com groupby().apply() e compara o tempo das duas.
+
+def consolidar_dados_referencia(dfs):
+    """Implementação anterior, com uma chamada Python por usuário."""
+    df_combinado = pd.concat(dfs, ignore_index=True)
+
+    def consolidar_linhas(grupo_dados):
+        email_valido = next(
+            (email for email, valido in zip(grupo_dados['email'], grupo_dados['email_valido']) if valido),
+            EMAIL_INVALIDO
+        )
+        data_valida = next((data for data in grupo_dados['data_nascimento'] if data != DATA_INVALIDA), DATA_INVALIDA)
+        return pd.Series({
+            'nome_completo': grupo_dados['nome_completo'].iloc[0],
+            'data_nascimento': data_valida,
+            'email': email_valido,
+            'cidade': grupo_dados['cidade'].iloc[0],
+            'estado': grupo_dados['estado'].iloc[0],
+            'consoles': grupo_dados['consoles'].iloc[0],
+            'jogos_preferidos': grupo_dados['jogos_preferidos'].iloc[0]
+        })
+
+    # A coluna de agrupamento é selecionada explicitamente: o pandas 3 não a entrega mais ao apply
+    colunas = COLUNAS_CONSOLIDADAS + ['email_valido']
+    return df_combinado.groupby('nome_completo')[colunas].apply(consolidar_linhas).reset_index(drop=True)
+
+def gerar_fontes(usuarios, fontes=3, semente=42):
+    """Gera `fontes` DataFrames com usuários repetidos e emails/datas inválidos misturados."""
+    aleatorio = random.Random(semente)
+    estados = ['SP', 'RJ', 'MG', 'BA', 'PR', None]
+    jogos = [f"Jogo {i}" for i in range(200)]
+    dfs = []
+    for fonte in range(fontes):
+        linhas = []
+        for i in aleatorio.sample(range(usuarios), k=int(usuarios * 0.7)):
+            linhas.append({
+                'id': i,
+                'nome_completo': f"Usuário {i}",
+                'data_nascimento': aleatorio.choice(['1990-01-15', '15-01-1990', '15/01/1990', '1990-02-30']),
+                'email': aleatorio.choice([f"usuario{i}@example.com", f"usuario{i}@example", f"fonte{fonte}.{i}@example.org"]),
+                'cidade': aleatorio.choice(['São Paulo', 'Recife', None]),
+                'estado': aleatorio.choice(estados),
+                'consoles': 'PS5|Switch',
+                'jogos_preferidos': '|'.join(aleatorio.sample(jogos, k=5)),
+            })
+        dfs.append(limpar_e_consolidar_dados(pd.DataFrame(linhas)))
+    return dfs
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridade e tempo da consolidação de usuários.")
+    parser.add_argument('--usuarios', type=int, default=50_000)
+    args = parser.parse_args()
+
+    dfs = gerar_fontes(args.usuarios)
+
+    inicio = time.perf_counter()
+    referencia = consolidar_dados_referencia(dfs)
+    tempo_referencia = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    vetorizado = consolidar_dados(dfs)
+    tempo_vetorizado = time.perf_counter() - inicio
+
+    pd.testing.assert_frame_equal(
+        referencia[COLUNAS_CONSOLIDADAS].reset_index(drop=True),
+        vetorizado.reset_index(drop=True),
+        check_dtype=False,
+    )
+    print(f"{len(vetorizado)} usuários consolidados, resultados idênticos.")
+    print(f"groupby().apply(): {tempo_referencia:.2f}s; vetorizado: {tempo_vetorizado:.2f}s "
+          f"({tempo_referencia / tempo_vetorizado:.1f}x)")
+
+if __name__ == "__main__":
+    main()
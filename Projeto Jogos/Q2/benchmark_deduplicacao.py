@@ -0,0 +1,113 @@
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from at2 import limpar_e_consolidar_dados
+from comum.texto import remover_acentos
+from deduplicacao import agrupar_duplicatas
+
+# Gera usuários sintéticos com duplicatas conhecidas e mede a revocação da
+# deduplicação por blocos, além de quantos pares foram comparados em relação a n².
+# Os nomes se repetem muito entre usuários diferentes ("Maria Souza Lima 12" e
+# "Mario Souza Lima 12"), então o benchmark falha se linhas de usuários
+# diferentes forem agrupadas além de `--max-falsos` (proporção das linhas).
+
+NOMES = ['João', 'Maria', 'Pedro', 'Ana', 'Lucas', 'Júlia', 'Gabriel', 'Letícia', 'Mateus', 'Beatriz',
+         'Rafael', 'Larissa', 'Felipe', 'Camila', 'Gustavo', 'Fernanda', 'André', 'Patrícia']
+SOBRENOMES = ['Silva', 'Souza', 'Oliveira', 'Costa', 'Pereira', 'Lima', 'Gonçalves', 'Araújo',
+              'Ribeiro', 'Almeida', 'Conceição', 'Fernandes', 'Rocha', 'Magalhães', 'Assunção']
+
+def variar_nome(nome, aleatorio):
+    """Aplica uma perturbação típica de cadastro ao nome."""
+    variacao = aleatorio.choice(['acentos', 'espacos', 'caixa', 'digitacao'])
+    if variacao == 'acentos':
+        return remover_acentos(nome)
+    if variacao == 'espacos':
+        return nome.replace(' ', '  ', 1) + ' '
+    if variacao == 'caixa':
+        return nome.upper()
+    posicao = aleatorio.randrange(1, len(nome) - 1)
+    return nome[:posicao] + nome[posicao + 1:]
+
+def gerar_usuarios(quantidade, proporcao_duplicatas=0.2, semente=42):
+    aleatorio = random.Random(semente)
+    linhas = []
+    entidades = []
+    for i in range(quantidade):
+        nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)} {i}"
+        email = f"usuario{i}@example.com"
+        nascimento = (datetime.date(1960, 1, 1) + datetime.timedelta(days=aleatorio.randrange(18_000))).isoformat()
+        linhas.append({'nome_completo': nome, 'email': email, 'data_nascimento': nascimento})
+        entidades.append(i)
+        if aleatorio.random() < proporcao_duplicatas:
+            if aleatorio.random() < 0.5:
+                linhas.append({'nome_completo': variar_nome(nome, aleatorio), 'email': f"outro{i}@example.org",
+                               'data_nascimento': nascimento})
+            else:
+                linhas.append({'nome_completo': f"{aleatorio.choice(NOMES)} {i}", 'email': email,
+                               'data_nascimento': nascimento})
+            entidades.append(i)
+
+    ordem = list(range(len(linhas)))
+    aleatorio.shuffle(ordem)
+    df = pd.DataFrame([linhas[i] for i in ordem])
+    for coluna in ['cidade', 'estado', 'consoles', 'jogos_preferidos']:
+        df[coluna] = None
+    return limpar_e_consolidar_dados(df), [entidades[i] for i in ordem]
+
+def avaliar(grupos, entidades):
+    """
+    Compara os grupos encontrados com as entidades reais.
+
+    Returns:
+        tuple: (pares de duplicatas reais encontrados, total de pares reais,
+                linhas agrupadas com outra entidade).
+    """
+    linhas_por_entidade = {}
+    for posicao, entidade in enumerate(entidades):
+        linhas_por_entidade.setdefault(entidade, []).append(posicao)
+    pares_reais = [linhas for linhas in linhas_por_entidade.values() if len(linhas) == 2]
+    encontrados = sum(grupos.iloc[a] == grupos.iloc[b] for a, b in pares_reais)
+
+    entidade_por_grupo = {}
+    falsos = 0
+    for grupo, entidade in zip(grupos, entidades):
+        if entidade_por_grupo.setdefault(grupo, entidade) != entidade:
+            falsos += 1
+    return encontrados, len(pares_reais), falsos
+
+def main():
+    parser = argparse.ArgumentParser(description="Revocação e custo da deduplicação de usuários.")
+    parser.add_argument('--usuarios', type=int, default=100_000)
+    parser.add_argument('--limiar', type=float, default=0.9)
+    parser.add_argument('--janela', type=int, default=5)
+    parser.add_argument('--max-falsos', type=float, default=0.001,
+                        help="Proporção máxima de linhas agrupadas com outro usuário.")
+    args = parser.parse_args()
+
+    df, entidades = gerar_usuarios(args.usuarios)
+
+    inicio = time.perf_counter()
+    grupos, relatorio = agrupar_duplicatas(df, args.limiar, args.janela)
+    tempo = time.perf_counter() - inicio
+
+    encontrados, pares_reais, falsos = avaliar(grupos, entidades)
+
+    print(f"{relatorio['linhas']} linhas em {tempo:.2f}s")
+    print(f"Pares comparados: {relatorio['pares_comparados']} de {relatorio['pares_possiveis']} "
+          f"({relatorio['pares_comparados'] / relatorio['pares_possiveis']:.4%} de n²/2)")
+    print(f"Revocação: {encontrados}/{pares_reais} ({encontrados / max(pares_reais, 1):.1%}); "
+          f"linhas agrupadas por engano: {falsos}")
+
+    if falsos > args.max_falsos * relatorio['linhas']:
+        print(f"FALHOU: {falsos} linhas agrupadas com outro usuário (máximo {args.max_falsos:.2%} das linhas)")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
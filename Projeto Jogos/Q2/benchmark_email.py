@@ -0,0 +1,51 @@
+import argparse
+import random
+import re
+import string
+import time
+
+import pandas as pd
+
+from at2 import emails_validos
+
+# Compara a validação de emails linha a linha (re.match via apply, como era
+# feito em limpar_e_consolidar_dados) com a versão vetorizada de comum.validacao.
+
+REGEX_ANTIGA = r'^\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+def gerar_emails(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    letras = string.ascii_lowercase + string.digits
+    dominios = ['example.com', 'example', 'mail.com.br', 'exemplo.org', 'teste.c']
+    emails = []
+    for _ in range(quantidade):
+        usuario = ''.join(aleatorio.choices(letras, k=aleatorio.randint(4, 12)))
+        separador = '@' if aleatorio.random() > 0.05 else '#'
+        emails.append(f"{usuario}{separador}{aleatorio.choice(dominios)}")
+    return pd.Series(emails)
+
+def validar_linha_a_linha(emails):
+    return emails.apply(lambda email: re.match(REGEX_ANTIGA, email) is not None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da validação de emails.")
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    emails = gerar_emails(args.linhas)
+
+    inicio = time.perf_counter()
+    antigo = validar_linha_a_linha(emails)
+    tempo_antigo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    novo = emails_validos(emails)
+    tempo_novo = time.perf_counter() - inicio
+
+    divergencias = int((antigo != novo).sum())
+    print(f"{args.linhas} emails: apply/re.match {tempo_antigo:.2f}s, "
+          f"str.fullmatch {tempo_novo:.2f}s ({tempo_antigo / tempo_novo:.1f}x)")
+    print(f"Válidos: {int(novo.sum())}; divergências com a regex antiga: {divergencias}")
+
+if __name__ == "__main__":
+    main()
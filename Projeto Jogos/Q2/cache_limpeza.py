@@ -0,0 +1,127 @@
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+# Cache dos DataFrames já limpos de cada arquivo de origem, em Parquet.
+
+class CacheLimpeza:
+    """
+    Cache em disco dos DataFrames limpos, indexado pela impressão digital do arquivo.
+
+    A chave combina o caminho, o tamanho, a data de modificação e o hash do
+    conteúdo do arquivo de origem, além da versão das regras de limpeza. Assim,
+    só as fontes que mudaram (ou que foram limpas com regras antigas) são
+    processadas de novo.
+
+    O tamanho total é limitado a `tamanho_maximo` bytes; ao passar do limite, as
+    entradas usadas há mais tempo são removidas (LRU, pela data de acesso
+    registrada no próprio arquivo). Vários processos podem usar a mesma pasta ao
+    mesmo tempo (--paralelo), então entradas que somem no meio de uma operação
+    são ignoradas.
+    """
+
+    def __init__(self, pasta='Q2/cache_limpeza', tamanho_maximo=500 * 1024 * 1024):
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        # Chave já calculada para cada estado (caminho, tamanho, modificação) do arquivo,
+        # para que uma falha seguida de `salvar` não leia o conteúdo duas vezes
+        self._chaves = {}
+        os.makedirs(pasta, exist_ok=True)
+
+    @staticmethod
+    def _hash_conteudo(caminho):
+        resumo = hashlib.blake2b(digest_size=16)
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+                resumo.update(bloco)
+        return resumo.hexdigest()
+
+    @staticmethod
+    def _remover(arquivo):
+        try:
+            os.remove(arquivo)
+        except FileNotFoundError:
+            pass
+
+    def _prefixo(self, caminho):
+        return hashlib.blake2b(os.path.abspath(caminho).encode('utf-8'), digest_size=8).hexdigest()
+
+    def _arquivo_cache(self, caminho, versao):
+        """Caminho da entrada no cache, ou None se o arquivo de origem não existir."""
+        try:
+            info = os.stat(caminho)
+        except FileNotFoundError:
+            return None
+        estado = (os.path.abspath(caminho), info.st_size, info.st_mtime_ns, versao)
+        chave = self._chaves.get(estado)
+        if chave is None:
+            impressao = '|'.join([
+                os.path.abspath(caminho), str(info.st_size), str(info.st_mtime_ns),
+                self._hash_conteudo(caminho), str(versao),
+            ])
+            chave = hashlib.blake2b(impressao.encode('utf-8'), digest_size=16).hexdigest()
+            self._chaves[estado] = chave
+        return os.path.join(self.pasta, f'{self._prefixo(caminho)}-{chave}.parquet')
+
+    def obter(self, caminho, versao):
+        """
+        Busca o DataFrame limpo correspondente ao estado atual do arquivo.
+
+        Returns:
+            pd.DataFrame: DataFrame limpo, ou None se não houver entrada válida.
+        """
+        arquivo_cache = self._arquivo_cache(caminho, versao)
+        if arquivo_cache is None or not os.path.exists(arquivo_cache):
+            return None
+        try:
+            df = pd.read_parquet(arquivo_cache)
+            os.utime(arquivo_cache)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remover(arquivo_cache)
+            return None
+        return df
+
+    def salvar(self, caminho, versao, df):
+        """
+        Armazena o DataFrame limpo, substituindo as entradas antigas do mesmo arquivo.
+
+        Returns:
+            bool: True se o DataFrame foi armazenado.
+        """
+        arquivo_cache = self._arquivo_cache(caminho, versao)
+        if arquivo_cache is None:
+            return False
+        for antigo in glob.glob(os.path.join(self.pasta, f'{self._prefixo(caminho)}-*.parquet')):
+            self._remover(antigo)
+        try:
+            df.to_parquet(arquivo_cache, index=False)
+        except Exception as e:
+            self._remover(arquivo_cache)
+            print(f"Não foi possível armazenar {caminho} no cache: {e}")
+            return False
+        self._aplicar_limite()
+        return True
+
+    def _aplicar_limite(self):
+        entradas = []
+        for arquivo in glob.glob(os.path.join(self.pasta, '*.parquet')):
+            try:
+                info = os.stat(arquivo)
+            except FileNotFoundError:  # removida por outro processo
+                continue
+            entradas.append((info.st_mtime, info.st_size, arquivo))
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, arquivo in sorted(entradas):
+            if total <= self.tamanho_maximo:
+                break
+            self._remover(arquivo)
+            total -= tamanho
+
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        for arquivo in glob.glob(os.path.join(self.pasta, '*.parquet')):
+            self._remover(arquivo)
@@ -0,0 +1,177 @@
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+from comum.texto import normalizar_texto
+from comum.validacao import DATA_INVALIDA
+
+# Identificação de usuários quase duplicados antes da consolidação.
+#
+# Comparar todos os pares de linhas é O(n²). Em vez disso, os pares candidatos
+# vêm de "blocos" (linhas que compartilham alguma chave barata) e de uma janela
+# deslizante sobre os nomes ordenados; só esses pares são pontuados, e os pares
+# aceitos são reunidos em grupos com union-find.
+#
+# Nomes parecidos não bastam ("Maria Souza" e "Mario Souza" passam de 0,9): um
+# nome só aproximadamente igual precisa ser confirmado pela data de nascimento.
+# E, para que as semelhanças não se encadeiem (A ~ B ~ C sem A ~ C), dois grupos
+# só são unidos se todas as linhas de um forem compatíveis com todas as do outro.
+
+class UniaoBusca:
+    """Estrutura union-find (conjuntos disjuntos) com compressão de caminho."""
+
+    def __init__(self, quantidade):
+        self.pai = list(range(quantidade))
+        self.tamanho = [1] * quantidade
+
+    def encontrar(self, i):
+        while self.pai[i] != i:
+            self.pai[i] = self.pai[self.pai[i]]
+            i = self.pai[i]
+        return i
+
+    def unir(self, a, b):
+        raiz_a, raiz_b = self.encontrar(a), self.encontrar(b)
+        if raiz_a == raiz_b:
+            return False
+        if self.tamanho[raiz_a] < self.tamanho[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.pai[raiz_b] = raiz_a
+        self.tamanho[raiz_a] += self.tamanho[raiz_b]
+        return True
+
+def _pares_do_bloco(indices, tamanho_maximo_bloco, janela):
+    if len(indices) <= tamanho_maximo_bloco:
+        for posicao, i in enumerate(indices):
+            for j in indices[posicao + 1:]:
+                yield i, j
+    else:
+        # Blocos muito grandes (uma parte local comum, por exemplo) só geram pares vizinhos
+        for posicao, i in enumerate(indices):
+            for j in indices[posicao + 1:posicao + janela]:
+                yield i, j
+
+def gerar_pares_candidatos(nomes, nomes_ordenados, emails_locais, janela=5, tamanho_maximo_bloco=50):
+    """
+    Gera os pares de linhas que merecem ser comparados.
+
+    Fontes de candidatos:
+        - Mesmo nome normalizado com as palavras em ordem alfabética.
+        - Mesma parte local do email (antes do @).
+        - Vizinhança ordenada: cada nome é comparado aos `janela - 1` seguintes
+          na ordem alfabética dos nomes normalizados.
+
+    Returns:
+        set: Pares (i, j), com i < j, de posições das linhas.
+    """
+    blocos = defaultdict(list)
+    for i, chave in enumerate(nomes_ordenados):
+        if chave:
+            blocos[('nome', chave)].append(i)
+    for i, local in enumerate(emails_locais):
+        if local:
+            blocos[('email', local)].append(i)
+
+    pares = set()
+    for indices in blocos.values():
+        for i, j in _pares_do_bloco(indices, tamanho_maximo_bloco, janela):
+            pares.add((min(i, j), max(i, j)))
+
+    ordem = sorted(range(len(nomes)), key=nomes.__getitem__)
+    for posicao, i in enumerate(ordem):
+        for j in ordem[posicao + 1:posicao + janela]:
+            pares.add((min(i, j), max(i, j)))
+
+    return pares
+
+def pontuar_par(i, j, nomes, nomes_ordenados, emails, datas):
+    """
+    Similaridade entre duas linhas, de 0 a 1.
+
+    O mesmo email ou o mesmo nome normalizado valem 1. Nomes apenas parecidos só
+    pontuam se as duas linhas tiverem a mesma data de nascimento válida.
+    """
+    if emails[i] and emails[i] == emails[j]:
+        return 1.0
+    if not nomes[i] or not nomes[j]:
+        return 0.0
+    if nomes_ordenados[i] == nomes_ordenados[j]:
+        return 1.0
+    if not datas[i] or datas[i] != datas[j]:
+        return 0.0
+    return max(
+        SequenceMatcher(None, nomes[i], nomes[j]).ratio(),
+        SequenceMatcher(None, nomes_ordenados[i], nomes_ordenados[j]).ratio(),
+    )
+
+def agrupar_duplicatas(df, limiar=0.9, janela=5):
+    """
+    Atribui um identificador de grupo a cada linha, reunindo os prováveis duplicados.
+
+    Args:
+        df (pd.DataFrame): Dados limpos, com 'nome_completo', 'data_nascimento', 'email' e 'email_valido'.
+        limiar (float, optional): Similaridade mínima para considerar duas linhas o mesmo usuário.
+        janela (int, optional): Tamanho da janela da vizinhança ordenada.
+
+    Returns:
+        tuple: (pd.Series com o id do grupo de cada linha, dict com o relatório).
+               O id do grupo é a posição da primeira linha do grupo.
+    """
+    nomes = [normalizar_texto(nome) for nome in df['nome_completo']]
+    nomes_ordenados = [' '.join(sorted(nome.split())) for nome in nomes]
+    emails = [
+        email.casefold() if valido else ''
+        for email, valido in zip(df['email'], df['email_valido'])
+    ]
+    emails_locais = [email.split('@', 1)[0] for email in emails]
+    datas = [
+        data if isinstance(data, str) and data != DATA_INVALIDA else ''
+        for data in df['data_nascimento']
+    ]
+
+    pares = gerar_pares_candidatos(nomes, nomes_ordenados, emails_locais, janela)
+
+    def compativeis(i, j):
+        return pontuar_par(i, j, nomes, nomes_ordenados, emails, datas) >= limiar
+
+    # Pares aceitos, dos mais parecidos para os menos, para que a melhor ligação de
+    # cada linha seja tentada antes das mais fracas
+    aceitos = []
+    for i, j in pares:
+        pontuacao = pontuar_par(i, j, nomes, nomes_ordenados, emails, datas)
+        if pontuacao >= limiar:
+            aceitos.append((pontuacao, i, j))
+    aceitos.sort(key=lambda par: (-par[0], par[1], par[2]))
+
+    grupos = UniaoBusca(len(df))
+    membros = {}
+    unioes = 0
+    for _, i, j in aceitos:
+        raiz_i, raiz_j = grupos.encontrar(i), grupos.encontrar(j)
+        if raiz_i == raiz_j:
+            continue
+        membros_i, membros_j = membros.get(raiz_i, [i]), membros.get(raiz_j, [j])
+        if not all(compativeis(a, b) for a in membros_i for b in membros_j):
+            continue
+        grupos.unir(i, j)
+        membros.pop(raiz_i, None)
+        membros.pop(raiz_j, None)
+        membros[grupos.encontrar(i)] = membros_i + membros_j
+        unioes += 1
+
+    primeira_linha = {}
+    ids = []
+    for i in range(len(df)):
+        raiz = grupos.encontrar(i)
+        ids.append(primeira_linha.setdefault(raiz, i))
+
+    linhas = len(df)
+    relatorio = {
+        'linhas': linhas,
+        'pares_comparados': len(pares),
+        'pares_possiveis': linhas * (linhas - 1) // 2,
+        'unioes': unioes,
+        'grupos': len(primeira_linha),
+    }
+    return pd.Series(ids, index=df.index, name='id_usuario'), relatorio
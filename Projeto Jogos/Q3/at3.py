@@ -1,5 +1,23 @@
+import argparse
+import os
+import sys
 import pandas as pd
-from sqlalchemy import create_engine
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comum.intercambio import (
+    CAMINHO_EXCEL_CONSOLIDADO, CAMINHO_INTERCAMBIO, eh_intercambio, ler_intercambio, ler_intercambio_em_blocos
+)
+from comum.leitura import ler_excel_em_blocos
+from incidencia import (
+    aplicar_delta, calcular_delta, frequencias_gravadas, gravar_incidencia, incidencia_existe, separar_jogos
+)
+from sketches import analisar_aproximado
+
+try:
+    from coocorrencia import calcular_coocorrencia, gravar_coocorrencia
+except ImportError:  # numpy/scipy indisponíveis: a coocorrência de jogos não pode ser calculada
+    calcular_coocorrencia = None
 
 # Exceções personalizadas
 class ErroLeituraArquivo(Exception):
@@ -30,6 +48,106 @@ def ler_excel(caminho_arquivo):
     except Exception as e:
         raise ErroLeituraArquivo(f"Erro ao ler o arquivo Excel: {e}")
 
+def ler_dados(caminho_arquivo):
+    """
+    Função para ler os dados consolidados do Q2.
+
+    Arquivos .arrow/.feather e .parquet são lidos com `comum.intercambio` (o .arrow é mapeado
+    em memória); os demais são lidos como Excel.
+
+    Args:
+        caminho_arquivo (str): Caminho para o arquivo de intercâmbio ou Excel.
+
+    Returns:
+        pd.DataFrame: DataFrame contendo os dados lidos.
+
+    Raises:
+        ErroLeituraArquivo: Se houver um erro ao ler o arquivo.
+    """
+    if not eh_intercambio(caminho_arquivo):
+        return ler_excel(caminho_arquivo)
+    try:
+        return ler_intercambio(caminho_arquivo)
+    except Exception as e:
+        raise ErroLeituraArquivo(f"Erro ao ler o arquivo de intercâmbio: {e}")
+
+def escolher_entrada(caminho_arquivo=None):
+    """
+    Arquivo de entrada padrão: o mais recente entre o de intercâmbio e o Excel.
+
+    O Q2 pode gravar só o Excel (--sem-intercambio), então um arquivo de intercâmbio
+    antigo não deve ser preferido a um Excel gravado depois. Se nenhum existir,
+    devolve o Excel, cuja leitura informa o erro.
+    """
+    if caminho_arquivo:
+        return caminho_arquivo
+    existentes = [caminho for caminho in (CAMINHO_INTERCAMBIO, CAMINHO_EXCEL_CONSOLIDADO) if os.path.exists(caminho)]
+    if not existentes:
+        return CAMINHO_EXCEL_CONSOLIDADO
+    # Em caso de empate, vale a ordem da lista: o intercâmbio é preferido
+    return max(existentes, key=os.path.getmtime)
+
+def ler_jogos_em_blocos(caminho_arquivo, tamanho_bloco=50_000):
+    """
+    Função para ler a coluna 'jogos_preferidos' em blocos, sem carregar o arquivo inteiro.
+
+    Args:
+        caminho_arquivo (str): Caminho para o arquivo de intercâmbio ou Excel.
+        tamanho_bloco (int, optional): Quantidade de linhas lidas por vez.
+
+    Yields:
+        str: Jogos preferidos de cada usuário, separados por '|'.
+
+    Raises:
+        ErroLeituraArquivo: Se houver um erro ao ler o arquivo.
+    """
+    try:
+        if eh_intercambio(caminho_arquivo):
+            blocos = ler_intercambio_em_blocos(caminho_arquivo, tamanho_bloco, colunas=['jogos_preferidos'])
+        else:
+            blocos = ler_excel_em_blocos(caminho_arquivo, tamanho_bloco)
+        for bloco in blocos:
+            yield from bloco['jogos_preferidos']
+    except Exception as e:
+        raise ErroLeituraArquivo(f"Erro ao ler o arquivo {caminho_arquivo}: {e}")
+
+def contar_jogos(jogos_preferidos):
+    """
+    Função para contar, em uma única passagem, quantos usuários mencionam cada jogo.
+
+    Títulos que diferem apenas em espaços ou maiúsculas são contados como o mesmo jogo,
+    representado pela primeira grafia encontrada. Cada jogo conta no máximo uma vez por usuário.
+
+    Args:
+        jogos_preferidos (iterable): Jogos preferidos de cada usuário, separados por '|'.
+
+    Returns:
+        dict: Dicionário {jogo: número de usuários que o mencionam}.
+    """
+    contagem = Counter()
+    titulos = {}
+    for jogos in jogos_preferidos:
+        jogos_usuario = separar_jogos(jogos)
+        for chave, titulo in jogos_usuario.items():
+            titulos.setdefault(chave, titulo)
+        contagem.update(jogos_usuario.keys())
+    return {titulos[chave]: total for chave, total in contagem.items()}
+
+def resumir_frequencias(frequencias):
+    """
+    Função para derivar os três resultados da análise a partir da tabela de frequências.
+
+    Args:
+        frequencias (dict): Dicionário {jogo: número de usuários}.
+
+    Returns:
+        tuple: (todos_jogos, jogos_unicos, jogos_comuns), como em `analisar_jogos`.
+    """
+    todos_jogos = set(frequencias)
+    jogos_unicos = {jogo for jogo, contagem in frequencias.items() if contagem == 1}
+    jogos_comuns = {jogo: contagem for jogo, contagem in frequencias.items() if contagem > 1}
+    return todos_jogos, jogos_unicos, jogos_comuns
+
 def analisar_jogos(df):
     """
     Função para analisar os jogos preferidos dos usuários.
@@ -47,85 +165,245 @@ def analisar_jogos(df):
         ErroProcessamentoDados: Se houver um erro ao processar os dados.
     """
     try:
-        todos_jogos = set()
-        conjuntos_jogos_usuario = []
-
-        for jogos in df['jogos_preferidos']:
-            conjunto_jogos = set(jogos.split('|'))
-            conjuntos_jogos_usuario.append(conjunto_jogos)
-            todos_jogos.update(conjunto_jogos)
-
-        jogos_unicos = set()
-        for jogo in todos_jogos:
-            contagem = sum([jogo in conjunto for conjunto in conjuntos_jogos_usuario])
-            if contagem == 1:
-                jogos_unicos.add(jogo)
-
-        contagem_jogos = {}
-        for conjunto in conjuntos_jogos_usuario:
-            for jogo in conjunto:
-                if jogo in contagem_jogos:
-                    contagem_jogos[jogo] += 1
-                else:
-                    contagem_jogos[jogo] = 1
-
-        jogos_comuns = {jogo: contagem for jogo, contagem in contagem_jogos.items() if contagem > 1}
-
-        return todos_jogos, jogos_unicos, jogos_comuns
+        return resumir_frequencias(contar_jogos(df['jogos_preferidos']))
     except Exception as e:
         raise ErroProcessamentoDados(f"Erro ao processar os dados: {e}")
 
-def exportar_para_sqlite(todos_jogos, jogos_unicos, jogos_comuns, caminho_banco_dados):
+def analisar_jogos_em_fluxo(caminho_arquivo, tamanho_bloco=50_000, aproximado=False, **parametros_aproximados):
     """
-    Função para exportar dados para um banco de dados SQLite.
+    Função para analisar os jogos preferidos lendo os usuários em blocos, com memória limitada.
+
+    No modo exato, a memória depende apenas do número de jogos distintos, e o resultado é o mesmo
+    de `analisar_jogos`. No modo aproximado, a memória é fixa e o resultado vem de `sketches.analisar_aproximado`.
 
     Args:
-        todos_jogos (set): Conjunto de todos os jogos mencionados.
-        jogos_unicos (set): Conjunto de jogos mencionados por apenas um usuário.
-        jogos_comuns (dict): Dicionário com jogos mais comuns e suas contagens.
+        caminho_arquivo (str): Caminho para o arquivo de intercâmbio ou Excel.
+        tamanho_bloco (int, optional): Quantidade de linhas lidas por vez.
+        aproximado (bool, optional): Se True, usa as estruturas probabilísticas.
+        **parametros_aproximados: epsilon, delta, erro_distintos e top, repassados a `analisar_aproximado`.
+
+    Returns:
+        tuple | dict: (todos_jogos, jogos_unicos, jogos_comuns) no modo exato; o dicionário de
+                      `analisar_aproximado` no modo aproximado.
+
+    Raises:
+        ErroLeituraArquivo: Se houver um erro ao ler o arquivo.
+        ErroProcessamentoDados: Se houver um erro ao processar os dados.
+    """
+    jogos_preferidos = ler_jogos_em_blocos(caminho_arquivo, tamanho_bloco)
+    try:
+        if aproximado:
+            return analisar_aproximado(jogos_preferidos, **parametros_aproximados)
+        return resumir_frequencias(contar_jogos(jogos_preferidos))
+    except ErroLeituraArquivo:
+        raise
+    except Exception as e:
+        raise ErroProcessamentoDados(f"Erro ao processar os dados: {e}")
+
+def main_em_fluxo(caminho_entrada, tamanho_bloco, aproximado, parametros_aproximados):
+    try:
+        resultado = analisar_jogos_em_fluxo(caminho_entrada, tamanho_bloco, aproximado, **parametros_aproximados)
+    except (ErroLeituraArquivo, ErroProcessamentoDados) as e:
+        print(e)
+        return
+
+    if not aproximado:
+        todos_jogos, jogos_unicos, jogos_comuns = resultado
+        print(f"{len(todos_jogos)} jogos mencionados, {len(jogos_unicos)} por apenas um usuário, "
+              f"{len(jogos_comuns)} por mais de um.")
+        for jogo, contagem in sorted(jogos_comuns.items(), key=lambda x: (-x[1], x[0]))[:parametros_aproximados['top']]:
+            print(f"  {jogo}: {contagem}")
+        return
+
+    frequencias, distintos = resultado['frequencias'], resultado['distintos']
+    print(f"{resultado['usuarios']} usuários, {resultado['mencoes']} menções")
+    print(f"Cerca de {resultado['jogos_distintos']} jogos mencionados "
+          f"(erro padrão de {distintos.erro_padrao:.1%})")
+    print(f"Jogos mais comuns (frequências superestimadas em até {frequencias.erro_maximo:.0f} "
+          f"com probabilidade {1 - frequencias.delta:.0%}):")
+    for jogo, contagem in resultado['jogos_comuns']:
+        print(f"  {jogo}: ~{contagem}")
+
+def exportar_incidencia_sqlite(df, caminho_banco_dados):
+    """
+    Função para exportar os dados de usuários e jogos para um banco de dados SQLite normalizado.
+
+    Grava as tabelas `jogos`, `usuarios` e `usuario_jogo` (quais usuários gostam de quais jogos)
+    e as views `todos_jogos`, `jogos_unicos` e `jogos_comuns` calculadas sobre elas.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados consolidados dos usuários.
         caminho_banco_dados (str): Caminho para o banco de dados SQLite.
 
+    Returns:
+        dict: Dicionário {jogo: número de usuários que o mencionam}, lido do banco gravado.
+
     Raises:
         ErroExportacaoBancoDados: Se houver um erro ao exportar os dados para o banco de dados SQLite.
     """
     try:
-        engine = create_engine(f'sqlite:///{caminho_banco_dados}')
-        
-        df_todos_jogos = pd.DataFrame(sorted(todos_jogos), columns=['jogo'])
-        df_jogos_unicos = pd.DataFrame(sorted(jogos_unicos), columns=['jogo'])
-        df_jogos_comuns = pd.DataFrame(sorted(jogos_comuns.items(), key=lambda x: (-x[1], x[0])), columns=['jogo', 'contagem'])
-        
-        df_todos_jogos.to_sql('todos_jogos', con=engine, if_exists='replace', index=False)
-        df_jogos_unicos.to_sql('jogos_unicos', con=engine, if_exists='replace', index=False)
-        df_jogos_comuns.to_sql('jogos_comuns', con=engine, if_exists='replace', index=False)
-        
-        print(f"Dados exportados com sucesso para o banco de dados SQLite em {caminho_banco_dados}")
+        totais = gravar_incidencia(df, caminho_banco_dados)
+        print(f"Dados exportados com sucesso para o banco de dados SQLite em {caminho_banco_dados} "
+              f"({totais['usuarios']} usuários, {totais['jogos']} jogos, {totais['pares']} preferências; "
+              f"{totais['linhas_por_segundo']:.0f} linhas/s)")
+        return frequencias_gravadas(caminho_banco_dados)
     except Exception as e:
         raise ErroExportacaoBancoDados(f"Erro ao exportar os dados para o banco de dados SQLite: {e}")
 
-def main():
-    caminho_excel = 'Q3/dados_consolidados.xlsx'
-    caminho_banco_dados = 'Q4/analise_jogos.db'
-    
+def atualizar_incidencia_sqlite(df, caminho_banco_dados):
+    """
+    Função para atualizar o banco de dados SQLite apenas com os usuários adicionados, removidos ou alterados.
+
+    Se o banco ainda não tiver as tabelas normalizadas, faz a exportação completa.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados consolidados dos usuários.
+        caminho_banco_dados (str): Caminho para o banco de dados SQLite.
+
+    Returns:
+        dict: Dicionário {jogo: número de usuários que o mencionam}, lido do banco atualizado.
+
+    Raises:
+        ErroExportacaoBancoDados: Se houver um erro ao atualizar o banco de dados SQLite.
+    """
     try:
-        df = ler_excel(caminho_excel)
-    except ErroLeituraArquivo as e:
+        if not incidencia_existe(caminho_banco_dados):
+            print("Banco de dados sem as tabelas de incidência; realizando a exportação completa.")
+            return exportar_incidencia_sqlite(df, caminho_banco_dados)
+        adicionados, removidos, alterados = calcular_delta(df, caminho_banco_dados)
+        totais = aplicar_delta(caminho_banco_dados, adicionados, removidos, alterados)
+        print(f"Banco de dados SQLite atualizado em {caminho_banco_dados}: {totais['adicionados']} usuários "
+              f"adicionados, {totais['removidos']} removidos e {totais['alterados']} alterados "
+              f"em {totais['segundos'] * 1000:.1f} ms")
+        return frequencias_gravadas(caminho_banco_dados)
+    except ErroExportacaoBancoDados:
+        raise
+    except Exception as e:
+        raise ErroExportacaoBancoDados(f"Erro ao atualizar o banco de dados SQLite: {e}")
+
+def exportar_coocorrencia_sqlite(df, k, caminho_banco_dados):
+    """
+    Função para calcular os k jogos mais mencionados junto com cada jogo e gravá-los no banco de dados SQLite.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados consolidados dos usuários.
+        k (int): Quantidade de pares gravados por jogo.
+        caminho_banco_dados (str): Caminho para o banco de dados SQLite, com a tabela `jogos` já gravada.
+
+    Raises:
+        ErroProcessamentoDados: Se numpy/scipy não estiverem instalados ou o cálculo falhar.
+        ErroExportacaoBancoDados: Se houver um erro ao gravar os pares no banco de dados SQLite.
+    """
+    if calcular_coocorrencia is None:
+        raise ErroProcessamentoDados("A coocorrência de jogos requer os pacotes numpy e scipy.")
+    try:
+        pares, relatorio = calcular_coocorrencia(df['jogos_preferidos'], k)
+    except Exception as e:
+        raise ErroProcessamentoDados(f"Erro ao calcular a coocorrência de jogos: {e}")
+    print(f"Coocorrência de {relatorio['jogos']} jogos entre {relatorio['usuarios']} usuários calculada em "
+          f"{relatorio['segundos_total']:.2f}s (matrizes: usuário × jogo "
+          f"{relatorio['bytes_usuario_jogo'] / 1024 ** 2:.1f} MB, jogo × jogo "
+          f"{relatorio['bytes_coocorrencia'] / 1024 ** 2:.1f} MB)")
+
+    try:
+        gravados = gravar_coocorrencia(pares, caminho_banco_dados)
+        print(f"{gravados} pares de jogos exportados para a tabela coocorrencia em {caminho_banco_dados}")
+    except Exception as e:
+        raise ErroExportacaoBancoDados(f"Erro ao exportar a coocorrência para o banco de dados SQLite: {e}")
+
+def processar_dados(df, caminho_banco_dados='Q4/analise_jogos.db', incremental=False, coocorrencia=None):
+    """
+    Função para gravar os dados consolidados já em memória no banco de dados SQLite e resumir a análise.
+
+    As contagens vêm do próprio banco gravado (`contagem_jogos`), sem separar os jogos
+    de novo; `analisar_jogos` só é usada se a gravação falhar.
+
+    Args:
+        df (pd.DataFrame): DataFrame com os dados consolidados dos usuários.
+        caminho_banco_dados (str, optional): Caminho para o banco de dados SQLite.
+        incremental (bool, optional): Se True, grava apenas os usuários que mudaram.
+        coocorrencia (int, optional): Se informado, grava também os K jogos mais mencionados junto com cada jogo.
+
+    Returns:
+        tuple: (todos_jogos, jogos_unicos, jogos_comuns), como em `analisar_jogos`, ou None se a análise falhar.
+    """
+    try:
+        if incremental:
+            frequencias = atualizar_incidencia_sqlite(df, caminho_banco_dados)
+        else:
+            frequencias = exportar_incidencia_sqlite(df, caminho_banco_dados)
+    except ErroExportacaoBancoDados as e:
         print(e)
-        return
+        frequencias = None
 
-    if not df.empty:
+    if frequencias is not None:
+        resultado = resumir_frequencias(frequencias)
+    else:
         try:
-            todos_jogos, jogos_unicos, jogos_comuns = analisar_jogos(df)
+            resultado = analisar_jogos(df)
         except ErroProcessamentoDados as e:
             print(e)
-            return
-        
+            return None
+
+    todos_jogos, jogos_unicos, jogos_comuns = resultado
+    print(f"{len(todos_jogos)} jogos mencionados, {len(jogos_unicos)} por apenas um usuário, "
+          f"{len(jogos_comuns)} por mais de um.")
+
+    if frequencias is not None and coocorrencia:
         try:
-            exportar_para_sqlite(todos_jogos, jogos_unicos, jogos_comuns, caminho_banco_dados)
-        except ErroExportacaoBancoDados as e:
+            exportar_coocorrencia_sqlite(df, coocorrencia, caminho_banco_dados)
+        except (ErroProcessamentoDados, ErroExportacaoBancoDados) as e:
             print(e)
+    return resultado
+
+def main(incremental=False, coocorrencia=None, streaming=False, aproximado=False, tamanho_bloco=50_000,
+         parametros_aproximados=None, entrada=None):
+    caminho_entrada = escolher_entrada(entrada)
+    caminho_banco_dados = 'Q4/analise_jogos.db'
+
+    if streaming or aproximado:
+        parametros = {'epsilon': 0.001, 'delta': 0.01, 'erro_distintos': 0.01, 'top': 20}
+        parametros.update(parametros_aproximados or {})
+        main_em_fluxo(caminho_entrada, tamanho_bloco, aproximado, parametros)
+        return
+
+    try:
+        df = ler_dados(caminho_entrada)
+    except ErroLeituraArquivo as e:
+        print(e)
+        return
+
+    if not df.empty:
+        processar_dados(df, caminho_banco_dados, incremental, coocorrencia)
     else:
-        print("Não foi possível realizar a análise devido a problemas na leitura do arquivo Excel.")
+        print(f"Não foi possível realizar a análise: o arquivo {caminho_entrada} não tem dados.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Analisa os jogos preferidos dos usuários e grava o resultado em SQLite.")
+    parser.add_argument('--entrada', default=None, metavar='ARQUIVO',
+                        help=f"Dados consolidados (.arrow, .parquet ou .xlsx). Padrão: o mais recente entre "
+                             f"{CAMINHO_INTERCAMBIO} e {CAMINHO_EXCEL_CONSOLIDADO}.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Atualiza o banco apenas com os usuários adicionados, removidos ou alterados.")
+    parser.add_argument('--coocorrencia', type=int, default=None, metavar='K',
+                        help="Grava também os K jogos mais mencionados junto com cada jogo.")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Lê os usuários em blocos e só mostra o resumo, sem carregar o arquivo inteiro.")
+    parser.add_argument('--aproximado', action='store_true',
+                        help="No modo --streaming, usa estruturas probabilísticas de memória fixa.")
+    parser.add_argument('--blocos', type=int, default=50_000, metavar='LINHAS',
+                        help="Linhas lidas por vez no modo --streaming.")
+    parser.add_argument('--epsilon', type=float, default=0.001,
+                        help="Erro das frequências aproximadas, como fração do total de menções.")
+    parser.add_argument('--delta', type=float, default=0.01,
+                        help="Probabilidade de uma frequência aproximada exceder o erro --epsilon.")
+    parser.add_argument('--erro-distintos', type=float, default=0.01,
+                        help="Erro padrão relativo da contagem aproximada de jogos distintos.")
+    parser.add_argument('--top', type=int, default=20,
+                        help="Quantidade de jogos mais comuns mostrados no modo --streaming.")
+    args = parser.parse_args()
+    main(incremental=args.incremental, coocorrencia=args.coocorrencia, streaming=args.streaming,
+         aproximado=args.aproximado, tamanho_bloco=args.blocos,
+         parametros_aproximados={'epsilon': args.epsilon, 'delta': args.delta,
+                                 'erro_distintos': args.erro_distintos, 'top': args.top},
+         entrada=args.entrada)
@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from at3 import analisar_jogos
+
+# Compara a análise de jogos em uma única contagem com a versão anterior,
+# que verificava cada jogo contra o conjunto de cada usuário (O(jogos × usuários)).
+
+def analisar_jogos_referencia(df):
+    """Implementação anterior de analisar_jogos."""
+    todos_jogos = set()
+    conjuntos_jogos_usuario = []
+
+    for jogos in df['jogos_preferidos']:
+        conjunto_jogos = set(jogos.split('|'))
+        conjuntos_jogos_usuario.append(conjunto_jogos)
+        todos_jogos.update(conjunto_jogos)
+
+    jogos_unicos = set()
+    for jogo in todos_jogos:
+        contagem = sum([jogo in conjunto for conjunto in conjuntos_jogos_usuario])
+        if contagem == 1:
+            jogos_unicos.add(jogo)
+
+    contagem_jogos = {}
+    for conjunto in conjuntos_jogos_usuario:
+        for jogo in conjunto:
+            if jogo in contagem_jogos:
+                contagem_jogos[jogo] += 1
+            else:
+                contagem_jogos[jogo] = 1
+
+    jogos_comuns = {jogo: contagem for jogo, contagem in contagem_jogos.items() if contagem > 1}
+    return todos_jogos, jogos_unicos, jogos_comuns
+
+def gerar_usuarios(usuarios, jogos, jogos_por_usuario=5, semente=42):
+    aleatorio = random.Random(semente)
+    titulos = [f"Jogo {i}" for i in range(jogos)]
+    pesos = [1 / (i + 1) for i in range(jogos)]  # popularidade em lei de Zipf
+    return pd.DataFrame({
+        'jogos_preferidos': [
+            '|'.join(aleatorio.choices(titulos, weights=pesos, k=jogos_por_usuario))
+            for _ in range(usuarios)
+        ]
+    })
+
+def medir(funcao, df):
+    inicio = time.perf_counter()
+    resultado = funcao(df)
+    return time.perf_counter() - inicio, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de analisar_jogos.")
+    parser.add_argument('--usuarios', type=int, default=100_000)
+    parser.add_argument('--jogos', type=int, default=10_000)
+    parser.add_argument('--usuarios-referencia', type=int, default=5_000,
+                        help="Usuários na comparação com a versão anterior, que é quadrática.")
+    args = parser.parse_args()
+
+    df = gerar_usuarios(args.usuarios, args.jogos)
+    tempo, (todos, unicos, comuns) = medir(analisar_jogos, df)
+    print(f"{args.usuarios} usuários x {args.jogos} jogos: {tempo:.2f}s "
+          f"({len(todos)} jogos, {len(unicos)} únicos, {len(comuns)} comuns)")
+
+    amostra = df.head(args.usuarios_referencia)
+    tempo_referencia, resultado_referencia = medir(analisar_jogos_referencia, amostra)
+    tempo_novo, resultado_novo = medir(analisar_jogos, amostra)
+    situacao = "idênticos" if resultado_referencia == resultado_novo else "DIVERGENTES"
+    print(f"{len(amostra)} usuários: versão anterior {tempo_referencia:.2f}s, contagem única {tempo_novo:.3f}s "
+          f"({tempo_referencia / tempo_novo:.0f}x); resultados {situacao}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coocorrencia import calcular_coocorrencia
+
+# Mede o tempo e a memória da coocorrência de jogos com dados sintéticos, por
+# padrão 1 milhão de usuários e 50 mil títulos com popularidade em lei de Zipf.
+
+def gerar_jogos_preferidos(usuarios, jogos, maximo_por_usuario=8, semente=42):
+    gerador = np.random.default_rng(semente)
+    quantidades = gerador.integers(1, maximo_por_usuario + 1, size=usuarios)
+    pesos = 1 / np.arange(1, jogos + 1)
+    escolhidos = gerador.choice(jogos, size=int(quantidades.sum()), p=pesos / pesos.sum())
+    titulos = np.array([f"Jogo {i}" for i in range(jogos)], dtype=object)[escolhidos]
+    limites = np.cumsum(quantidades)[:-1]
+    return ['|'.join(grupo) for grupo in np.split(titulos, limites)]
+
+def pico_memoria_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da coocorrência de jogos.")
+    parser.add_argument('--usuarios', type=int, default=1_000_000)
+    parser.add_argument('--jogos', type=int, default=50_000)
+    parser.add_argument('-k', type=int, default=10, help="Pares mantidos por jogo.")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    jogos_preferidos = gerar_jogos_preferidos(args.usuarios, args.jogos)
+    print(f"Dados gerados em {time.perf_counter() - inicio:.1f}s")
+
+    _, relatorio = calcular_coocorrencia(jogos_preferidos, args.k)
+    print(f"{relatorio['usuarios']} usuários, {relatorio['jogos']} jogos, {relatorio['preferencias']} preferências")
+    print(f"Codificação: {relatorio['segundos_codificacao']:.2f}s, matrizes: {relatorio['segundos_matrizes']:.2f}s, "
+          f"total com top-{args.k}: {relatorio['segundos_total']:.2f}s")
+    print(f"Matriz usuário × jogo: {relatorio['bytes_usuario_jogo'] / 1024 ** 2:.1f} MB; "
+          f"jogo × jogo: {relatorio['bytes_coocorrencia'] / 1024 ** 2:.1f} MB "
+          f"({relatorio['pares_nao_nulos']} pares não nulos, {relatorio['pares_gravados']} mantidos)")
+    pico = pico_memoria_mb()
+    if pico is not None:
+        print(f"Pico de memória do processo: {pico:.0f} MB")
+
+if __name__ == "__main__":
+    main()
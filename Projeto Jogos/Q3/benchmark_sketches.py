@@ -0,0 +1,93 @@
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from at3 import contar_jogos
+from incidencia import normalizar_jogo
+from sketches import analisar_aproximado
+
+# Confere a análise aproximada contra a contagem exata, com dados sintéticos, e
+# verifica se os erros ficam dentro dos limites configurados:
+#   - nenhuma frequência é subestimada e no máximo uma fração delta excede epsilon × menções;
+#   - a contagem de jogos distintos fica a até 3 erros padrão da real;
+#   - todo jogo com frequência acima de menções / (capacidade + 1) está entre os candidatos.
+# Os mesmos limites são testados em testes/test_q3_sketches.py, com menos usuários.
+
+def gerar_jogos_preferidos(usuarios, jogos, maximo_por_usuario=6, semente=42):
+    aleatorio = random.Random(semente)
+    titulos = [f"Jogo {i}" for i in range(jogos)]
+    # Pesos acumulados calculados uma vez, e não a cada chamada de choices
+    pesos_acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(jogos)))
+    return [
+        '|'.join(aleatorio.choices(titulos, cum_weights=pesos_acumulados, k=aleatorio.randint(1, maximo_por_usuario)))
+        for _ in range(usuarios)
+    ]
+
+def conferir(jogos_preferidos, epsilon=0.001, delta=0.01, erro_distintos=0.01, top=20):
+    """
+    Compara a análise aproximada com a contagem exata e mostra os tempos e os erros.
+
+    Returns:
+        list: Descrição de cada limite violado; vazia se todos forem respeitados.
+    """
+    inicio = time.perf_counter()
+    exato = {normalizar_jogo(jogo)[1]: contagem for jogo, contagem in contar_jogos(jogos_preferidos).items()}
+    tempo_exato = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultado = analisar_aproximado(jogos_preferidos, epsilon, delta, erro_distintos, top)
+    tempo_aproximado = time.perf_counter() - inicio
+    frequencias, distintos, frequentes = resultado['frequencias'], resultado['distintos'], resultado['frequentes']
+    print(f"Exato: {tempo_exato:.2f}s; aproximado: {tempo_aproximado:.2f}s")
+
+    falhas = []
+
+    erros = [frequencias.estimar(chave) - contagem for chave, contagem in exato.items()]
+    subestimadas = sum(erro < 0 for erro in erros)
+    acima_do_limite = sum(erro > frequencias.erro_maximo for erro in erros) / len(erros)
+    print(f"Frequências: erro máximo {max(erros)}, limite {frequencias.erro_maximo:.0f}, "
+          f"{acima_do_limite:.2%} acima do limite (delta = {delta:.2%})")
+    if subestimadas:
+        falhas.append(f"{subestimadas} frequências subestimadas")
+    if acima_do_limite > delta:
+        falhas.append("fração de frequências acima do limite maior que delta")
+
+    erro_relativo = abs(resultado['jogos_distintos'] - len(exato)) / len(exato)
+    print(f"Jogos distintos: {resultado['jogos_distintos']} estimados, {len(exato)} reais "
+          f"(erro de {erro_relativo:.2%}, erro padrão {distintos.erro_padrao:.2%})")
+    if erro_relativo > 3 * distintos.erro_padrao:
+        falhas.append("contagem de jogos distintos fora de 3 erros padrão")
+
+    limiar = resultado['mencoes'] / (frequentes.capacidade + 1)
+    candidatos = set(frequentes.candidatos())
+    perdidos = [chave for chave, contagem in exato.items() if contagem > limiar and chave not in candidatos]
+    top_exato = {chave for chave, _ in sorted(exato.items(), key=lambda x: (-x[1], x[0]))[:top]}
+    top_aproximado = {normalizar_jogo(jogo)[1] for jogo, _ in resultado['jogos_comuns']}
+    print(f"Jogos mais comuns: {len(top_exato & top_aproximado)} de {top} iguais ao resultado exato")
+    if perdidos:
+        falhas.append(f"{len(perdidos)} jogos frequentes ausentes dos candidatos")
+
+    return falhas
+
+def main():
+    parser = argparse.ArgumentParser(description="Precisão da análise aproximada de jogos.")
+    parser.add_argument('--usuarios', type=int, default=200_000)
+    parser.add_argument('--jogos', type=int, default=20_000)
+    parser.add_argument('--epsilon', type=float, default=0.001)
+    parser.add_argument('--delta', type=float, default=0.01)
+    parser.add_argument('--erro-distintos', type=float, default=0.01)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    jogos_preferidos = gerar_jogos_preferidos(args.usuarios, args.jogos)
+    falhas = conferir(jogos_preferidos, args.epsilon, args.delta, args.erro_distintos, args.top)
+
+    if falhas:
+        print("FALHOU: " + "; ".join(falhas))
+        sys.exit(1)
+    print("OK: erros dentro dos limites configurados")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from comum.sqlite_bulk import inserir_em_lotes, obter_engine
+
+# Coocorrência de jogos: quantos usuários gostam de cada par de jogos.
+#
+# Os títulos são codificados como inteiros (pd.factorize) e as preferências viram
+# uma matriz esparsa usuário × jogo (CSR) com 1 onde o usuário menciona o jogo.
+# O produto Xᵀ·X dá, para cada par de jogos, o número de usuários em comum; só os
+# k pares mais frequentes de cada jogo são gravados no banco.
+
+ESQUEMA_COOCORRENCIA = (
+    """
+    CREATE TABLE IF NOT EXISTS coocorrencia (
+        jogo_id INTEGER NOT NULL REFERENCES jogos (id),
+        outro_jogo_id INTEGER NOT NULL REFERENCES jogos (id),
+        contagem INTEGER NOT NULL,
+        PRIMARY KEY (jogo_id, outro_jogo_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS jogos_relacionados AS
+        SELECT jogo.titulo AS jogo, outro.titulo AS relacionado, coocorrencia.contagem
+        FROM coocorrencia
+        JOIN jogos AS jogo ON jogo.id = coocorrencia.jogo_id
+        JOIN jogos AS outro ON outro.id = coocorrencia.outro_jogo_id
+        ORDER BY jogo.titulo, coocorrencia.contagem DESC, outro.titulo
+    """,
+)
+
+def codificar_jogos(jogos_preferidos):
+    """
+    Converte a coluna `jogos_preferidos` em pares (usuário, jogo) de inteiros.
+
+    Os títulos são normalizados como em `incidencia.normalizar_jogo` (espaços
+    extras removidos, comparação sem maiúsculas); valores ausentes e títulos
+    vazios são ignorados.
+
+    Args:
+        jogos_preferidos (iterable): Jogos de cada usuário, separados por '|'.
+
+    Returns:
+        tuple: (posições dos usuários, códigos dos jogos, chaves dos jogos, quantidade de usuários).
+    """
+    serie = pd.Series(jogos_preferidos, dtype=object).reset_index(drop=True)
+    texto = serie[serie.map(lambda valor: isinstance(valor, str))]
+    titulos = texto.str.split('|').explode()
+    titulos = titulos.str.replace(r'\s+', ' ', regex=True).str.strip()
+    titulos = titulos[titulos.notna() & (titulos != '')]
+
+    codigos, chaves = pd.factorize(titulos.str.casefold())
+    return titulos.index.to_numpy(dtype=np.int64), codigos.astype(np.int32, copy=False), list(chaves), len(serie)
+
+def tamanho_matriz(matriz):
+    """Bytes ocupados pelos vetores de uma matriz esparsa CSR/CSC."""
+    return matriz.data.nbytes + matriz.indices.nbytes + matriz.indptr.nbytes
+
+def matriz_usuario_jogo(usuarios, codigos, quantidade_usuarios, quantidade_jogos):
+    """Matriz CSR usuário × jogo, com 1 em cada jogo mencionado (repetições contam uma vez)."""
+    matriz = sparse.csr_matrix(
+        (np.ones(len(codigos), dtype=np.int32), (usuarios, codigos)),
+        shape=(quantidade_usuarios, quantidade_jogos),
+    )
+    matriz.data[:] = 1
+    return matriz
+
+def matriz_coocorrencia(matriz):
+    """Matriz CSR jogo × jogo com o número de usuários em comum, sem a diagonal."""
+    coocorrencia = (matriz.T @ matriz).tocsr()
+    # Zerar a diagonal no lugar mantém as contagens inteiras (subtrair sparse.diags
+    # converteria a matriz para float64); todo jogo tem entrada na diagonal, então
+    # nenhum elemento novo é inserido
+    coocorrencia.setdiag(0)
+    coocorrencia.eliminate_zeros()
+    return coocorrencia
+
+def maiores_pares(coocorrencia, k):
+    """
+    Percorre os k pares mais frequentes de cada jogo.
+
+    Yields:
+        tuple: (jogo, outro jogo, contagem), em ordem decrescente de contagem para cada jogo.
+    """
+    for jogo in range(coocorrencia.shape[0]):
+        inicio, fim = coocorrencia.indptr[jogo], coocorrencia.indptr[jogo + 1]
+        if inicio == fim:
+            continue
+        contagens = coocorrencia.data[inicio:fim]
+        vizinhos = coocorrencia.indices[inicio:fim]
+        if fim - inicio > k:
+            selecionados = np.argpartition(-contagens, k - 1)[:k]
+        else:
+            selecionados = np.arange(fim - inicio)
+        ordem = selecionados[np.lexsort((vizinhos[selecionados], -contagens[selecionados]))]
+        for posicao in ordem:
+            yield jogo, int(vizinhos[posicao]), int(contagens[posicao])
+
+def calcular_coocorrencia(jogos_preferidos, k=10):
+    """
+    Calcula os k jogos mais mencionados junto com cada jogo.
+
+    Args:
+        jogos_preferidos (iterable): Jogos de cada usuário, separados por '|'.
+        k (int, optional): Quantidade de pares mantidos por jogo.
+
+    Returns:
+        tuple: (lista de (chave, chave do outro jogo, contagem), dict com o relatório de
+               tempo e memória).
+    """
+    inicio = time.perf_counter()
+    usuarios, codigos, chaves, quantidade_usuarios = codificar_jogos(jogos_preferidos)
+    segundos_codificacao = time.perf_counter() - inicio
+
+    matriz = matriz_usuario_jogo(usuarios, codigos, quantidade_usuarios, len(chaves))
+    coocorrencia = matriz_coocorrencia(matriz)
+    segundos_matrizes = time.perf_counter() - inicio - segundos_codificacao
+
+    pares = [
+        (chaves[jogo], chaves[outro], contagem)
+        for jogo, outro, contagem in maiores_pares(coocorrencia, k)
+    ]
+
+    relatorio = {
+        'usuarios': quantidade_usuarios,
+        'jogos': len(chaves),
+        'preferencias': matriz.nnz,
+        'pares_nao_nulos': coocorrencia.nnz,
+        'pares_gravados': len(pares),
+        'bytes_usuario_jogo': tamanho_matriz(matriz),
+        'bytes_coocorrencia': tamanho_matriz(coocorrencia),
+        'segundos_codificacao': segundos_codificacao,
+        'segundos_matrizes': segundos_matrizes,
+        'segundos_total': time.perf_counter() - inicio,
+    }
+    return pares, relatorio
+
+def gravar_coocorrencia(pares, caminho_db):
+    """
+    Grava os pares de jogos na tabela `coocorrencia`, usando os ids da tabela `jogos`.
+
+    A tabela é recriada a cada chamada, em uma única transação; pares com jogos
+    ausentes de `jogos` são ignorados.
+
+    Args:
+        pares (list): Tuplas (chave, chave do outro jogo, contagem).
+        caminho_db (str): Caminho do banco SQLite criado por `incidencia.gravar_incidencia`.
+
+    Returns:
+        int: Quantidade de pares gravados.
+    """
+    with obter_engine(caminho_db).begin() as conexao:
+        ids = dict(conexao.exec_driver_sql("SELECT chave, id FROM jogos").fetchall())
+        conexao.exec_driver_sql("DROP VIEW IF EXISTS jogos_relacionados")
+        conexao.exec_driver_sql("DROP TABLE IF EXISTS coocorrencia")
+        for comando in ESQUEMA_COOCORRENCIA:
+            conexao.exec_driver_sql(comando)
+        return inserir_em_lotes(
+            conexao, "INSERT INTO coocorrencia (jogo_id, outro_jogo_id, contagem) VALUES (?, ?, ?)",
+            (
+                (ids[chave], ids[outra], contagem)
+                for chave, outra, contagem in pares
+                if chave in ids and outra in ids
+            ),
+        )
@@ -0,0 +1,432 @@
+import hashlib
+import sqlite3
+import time
+
+import pandas as pd
+
+from comum.sqlite_bulk import inserir_em_lotes, obter_engine, relatorio_gravacao
+
+# Banco de análise normalizado: quais usuários gostam de quais jogos.
+#
+# `jogos` é o dicionário de títulos, `usuarios` guarda cada usuário e seu
+# estado e `usuario_jogo` é a tabela de incidência, indexada nos dois sentidos.
+# Os resumos `todos_jogos`, `jogos_unicos` e `jogos_comuns` são views sobre
+# essas tabelas, com as mesmas colunas das antigas tabelas de mesmo nome.
+#
+# `contagem_jogos` guarda quantos usuários mencionam cada jogo. Ela é mantida
+# junto com `usuario_jogo`, de modo que uma atualização incremental só precisa
+# somar +1/−1 aos jogos dos usuários alterados, sem recalcular os resumos.
+#
+# Na exportação completa, os índices secundários só são criados depois da carga.
+# Os esquemas são sequências de comandos, executados um a um dentro da transação.
+
+ESQUEMA_TABELAS = (
+    """
+    CREATE TABLE IF NOT EXISTS jogos (
+        id INTEGER PRIMARY KEY,
+        titulo TEXT NOT NULL,
+        chave TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY,
+        nome_completo TEXT NOT NULL UNIQUE,
+        estado TEXT,
+        assinatura TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usuario_jogo (
+        usuario_id INTEGER NOT NULL REFERENCES usuarios (id),
+        jogo_id INTEGER NOT NULL REFERENCES jogos (id),
+        PRIMARY KEY (usuario_id, jogo_id)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS contagem_jogos (
+        jogo_id INTEGER PRIMARY KEY REFERENCES jogos (id),
+        contagem INTEGER NOT NULL
+    )
+    """,
+)
+
+ESQUEMA_INDICES = (
+    "CREATE INDEX IF NOT EXISTS idx_usuarios_estado ON usuarios (estado)",
+    "CREATE INDEX IF NOT EXISTS idx_usuario_jogo_jogo ON usuario_jogo (jogo_id, usuario_id)",
+    "CREATE INDEX IF NOT EXISTS idx_contagem_jogos_contagem ON contagem_jogos (contagem)",
+)
+
+ESQUEMA_VIEWS = (
+    """
+    CREATE VIEW IF NOT EXISTS todos_jogos AS
+        SELECT jogos.titulo AS jogo
+        FROM contagem_jogos JOIN jogos ON jogos.id = contagem_jogos.jogo_id
+        WHERE contagem_jogos.contagem > 0
+        ORDER BY jogos.titulo
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS jogos_unicos AS
+        SELECT jogos.titulo AS jogo
+        FROM contagem_jogos JOIN jogos ON jogos.id = contagem_jogos.jogo_id
+        WHERE contagem_jogos.contagem = 1
+        ORDER BY jogos.titulo
+    """,
+    """
+    CREATE VIEW IF NOT EXISTS jogos_comuns AS
+        SELECT jogos.titulo AS jogo, contagem_jogos.contagem
+        FROM contagem_jogos JOIN jogos ON jogos.id = contagem_jogos.jogo_id
+        WHERE contagem_jogos.contagem > 1
+        ORDER BY contagem_jogos.contagem DESC, jogos.titulo
+    """,
+)
+
+# Objetos recriados a cada exportação completa, na ordem em que são removidos
+OBJETOS_INCIDENCIA = [
+    'jogos_relacionados', 'coocorrencia',
+    'todos_jogos', 'jogos_unicos', 'jogos_comuns', 'contagem_jogos', 'usuario_jogo', 'usuarios', 'jogos',
+]
+
+def normalizar_jogo(jogo):
+    """Remove espaços extras do título; a chave de comparação é o título em minúsculas (casefold)."""
+    titulo = ' '.join(jogo.split())
+    return titulo, titulo.casefold()
+
+def separar_jogos(jogos):
+    """
+    Separa o texto de `jogos_preferidos` de um usuário em jogos distintos.
+
+    Args:
+        jogos (str): Jogos separados por '|'. Valores que não são texto resultam em nenhum jogo.
+
+    Returns:
+        dict: Dicionário {chave: título}, sem títulos vazios.
+    """
+    if not isinstance(jogos, str):
+        return {}
+    separados = {}
+    for jogo in jogos.split('|'):
+        titulo, chave = normalizar_jogo(jogo)
+        if chave:
+            separados.setdefault(chave, titulo)
+    return separados
+
+def _estado(estado):
+    return None if pd.isna(estado) else str(estado)
+
+def assinatura_usuario(estado, chaves):
+    """Resumo do estado e dos jogos de um usuário, usado para detectar usuários alterados."""
+    conteudo = '\x1f'.join([estado or ''] + sorted(chaves))
+    return hashlib.blake2b(conteudo.encode('utf-8'), digest_size=8).hexdigest()
+
+def _linhas_usuarios(df):
+    """Percorre (nome, estado, {chave: título}) de cada usuário, juntando nomes repetidos."""
+    usuarios = {}
+    estados = df['estado'] if 'estado' in df.columns else [None] * len(df)
+    for nome, estado, jogos_preferidos in zip(df['nome_completo'], estados, df['jogos_preferidos']):
+        if not isinstance(nome, str) or not nome.strip():
+            continue
+        if nome in usuarios:
+            for chave, titulo in separar_jogos(jogos_preferidos).items():
+                usuarios[nome][1].setdefault(chave, titulo)
+        else:
+            usuarios[nome] = (_estado(estado), separar_jogos(jogos_preferidos))
+    for nome, (estado, jogos) in usuarios.items():
+        yield nome, estado, jogos
+
+def construir_incidencia(df):
+    """
+    Monta as linhas das tabelas `jogos`, `usuarios` e `usuario_jogo` a partir dos dados consolidados.
+
+    Args:
+        df (pd.DataFrame): Dados com as colunas 'nome_completo', 'estado' e 'jogos_preferidos'.
+
+    Returns:
+        tuple: (linhas de jogos, linhas de usuarios, pares (usuario_id, jogo_id)).
+    """
+    ids_jogos = {}
+    jogos = []
+    usuarios = []
+    pares = []
+
+    for nome, estado, jogos_usuario in _linhas_usuarios(df):
+        usuario_id = len(usuarios) + 1
+        usuarios.append((usuario_id, nome, estado, assinatura_usuario(estado, jogos_usuario)))
+        for chave, titulo in jogos_usuario.items():
+            jogo_id = ids_jogos.get(chave)
+            if jogo_id is None:
+                jogo_id = ids_jogos[chave] = len(jogos) + 1
+                jogos.append((jogo_id, titulo, chave))
+            pares.append((usuario_id, jogo_id))
+
+    return jogos, usuarios, sorted(pares)
+
+def _remover_objeto(conexao, nome):
+    linha = conexao.exec_driver_sql("SELECT type FROM sqlite_master WHERE name = ?", (nome,)).fetchone()
+    if linha is not None and linha[0] in ('table', 'view'):
+        conexao.exec_driver_sql(f"DROP {linha[0].upper()} {nome}")
+
+def gravar_incidencia(df, caminho_db):
+    """
+    Reconstrói as tabelas normalizadas e as views de resumo no banco SQLite.
+
+    Tabelas antigas com os nomes das views (`todos_jogos`, `jogos_unicos`,
+    `jogos_comuns`) são removidas antes. A remoção, a criação das tabelas e a
+    carga em lotes com `comum.sqlite_bulk` formam uma única transação: se algo
+    falhar, o banco anterior fica intacto.
+
+    Args:
+        df (pd.DataFrame): Dados consolidados dos usuários.
+        caminho_db (str): Caminho do banco SQLite.
+
+    Returns:
+        dict: Quantidade de jogos, usuários e pares usuário–jogo gravados, além do
+              relatório de `comum.sqlite_bulk` (linhas, segundos e linhas por segundo).
+    """
+    inicio = time.perf_counter()
+    jogos, usuarios, pares = construir_incidencia(df)
+
+    with obter_engine(caminho_db).begin() as conexao:
+        for nome in OBJETOS_INCIDENCIA:
+            _remover_objeto(conexao, nome)
+        for comando in ESQUEMA_TABELAS:
+            conexao.exec_driver_sql(comando)
+        linhas = inserir_em_lotes(conexao, "INSERT INTO jogos (id, titulo, chave) VALUES (?, ?, ?)", jogos)
+        linhas += inserir_em_lotes(
+            conexao, "INSERT INTO usuarios (id, nome_completo, estado, assinatura) VALUES (?, ?, ?, ?)", usuarios
+        )
+        linhas += inserir_em_lotes(conexao, "INSERT INTO usuario_jogo (usuario_id, jogo_id) VALUES (?, ?)", pares)
+        linhas += conexao.exec_driver_sql(
+            "INSERT INTO contagem_jogos (jogo_id, contagem) "
+            "SELECT jogo_id, COUNT(*) FROM usuario_jogo GROUP BY jogo_id"
+        ).rowcount
+        for comando in ESQUEMA_INDICES + ESQUEMA_VIEWS:
+            conexao.exec_driver_sql(comando)
+
+    relatorio = relatorio_gravacao('usuario_jogo', linhas, time.perf_counter() - inicio)
+    relatorio.update({'jogos': len(jogos), 'usuarios': len(usuarios), 'pares': len(pares)})
+    return relatorio
+
+def incidencia_existe(caminho_db):
+    """Indica se o banco já tem as tabelas usadas pela atualização incremental."""
+    conn = sqlite3.connect(caminho_db)
+    try:
+        linha = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('usuarios', 'contagem_jogos')"
+        ).fetchone()
+        return linha[0] == 2
+    finally:
+        conn.close()
+
+def frequencias_gravadas(caminho_db):
+    """
+    Quantos usuários mencionam cada jogo, lido de `contagem_jogos`.
+
+    Returns:
+        dict: Dicionário {título: número de usuários}, no formato de `at3.contar_jogos`.
+    """
+    conn = sqlite3.connect(caminho_db)
+    try:
+        return dict(conn.execute(
+            "SELECT jogos.titulo, contagem_jogos.contagem "
+            "FROM contagem_jogos JOIN jogos ON jogos.id = contagem_jogos.jogo_id "
+            "WHERE contagem_jogos.contagem > 0"
+        ))
+    finally:
+        conn.close()
+
+def calcular_delta(df, caminho_db):
+    """
+    Compara os dados consolidados com os usuários gravados no banco.
+
+    A comparação usa a assinatura (estado e jogos) de cada usuário, sem ler `usuario_jogo`.
+
+    Args:
+        df (pd.DataFrame): Dados consolidados atuais.
+        caminho_db (str): Caminho do banco SQLite.
+
+    Returns:
+        tuple: (adicionados, removidos, alterados): DataFrames com os usuários novos e
+               alterados e a lista de nomes dos usuários que não existem mais.
+    """
+    conn = sqlite3.connect(caminho_db)
+    try:
+        gravados = dict(conn.execute("SELECT nome_completo, assinatura FROM usuarios"))
+    finally:
+        conn.close()
+
+    adicionados = []
+    alterados = []
+    presentes = set()
+    for nome, estado, jogos in _linhas_usuarios(df):
+        presentes.add(nome)
+        linha = {'nome_completo': nome, 'estado': estado, 'jogos_preferidos': '|'.join(jogos.values())}
+        if nome not in gravados:
+            adicionados.append(linha)
+        elif gravados[nome] != assinatura_usuario(estado, jogos):
+            alterados.append(linha)
+    removidos = [nome for nome in gravados if nome not in presentes]
+
+    colunas = ['nome_completo', 'estado', 'jogos_preferidos']
+    return pd.DataFrame(adicionados, columns=colunas), removidos, pd.DataFrame(alterados, columns=colunas)
+
+def _somar_contagens(conn, variacoes):
+    conn.executemany(
+        "INSERT INTO contagem_jogos (jogo_id, contagem) VALUES (?, ?) "
+        "ON CONFLICT (jogo_id) DO UPDATE SET contagem = contagem + excluded.contagem",
+        [(jogo_id, variacao) for jogo_id, variacao in variacoes.items() if variacao],
+    )
+    conn.execute("DELETE FROM contagem_jogos WHERE contagem <= 0")
+
+def _id_jogo(conn, chave, titulo):
+    linha = conn.execute("SELECT id FROM jogos WHERE chave = ?", (chave,)).fetchone()
+    if linha is not None:
+        return linha[0]
+    return conn.execute("INSERT INTO jogos (titulo, chave) VALUES (?, ?)", (titulo, chave)).lastrowid
+
+def aplicar_delta(caminho_db, adicionados=None, removidos=(), alterados=None):
+    """
+    Atualiza o banco apenas com os usuários que mudaram, em uma única transação.
+
+    Para cada usuário, só os jogos que entraram ou saíram da sua lista são
+    gravados em `usuario_jogo`, e a contagem desses jogos recebe +1 ou −1. Todas
+    as buscas usam índices, então o custo depende do número de alterações e não
+    do total de usuários.
+
+    Args:
+        caminho_db (str): Caminho do banco SQLite, já criado por `gravar_incidencia`.
+        adicionados (pd.DataFrame, optional): Usuários novos.
+        removidos (iterable, optional): Nomes dos usuários removidos.
+        alterados (pd.DataFrame, optional): Usuários com estado ou jogos alterados.
+
+    Returns:
+        dict: Quantidade de usuários adicionados, removidos e alterados, pares
+              inseridos e removidos e segundos gastos.
+    """
+    inicio = time.perf_counter()
+    variacoes = {}
+    totais = {'adicionados': 0, 'removidos': 0, 'alterados': 0, 'pares_inseridos': 0, 'pares_removidos': 0}
+
+    conn = sqlite3.connect(caminho_db)
+    try:
+        with conn:
+            for nome in removidos:
+                linha = conn.execute("SELECT id FROM usuarios WHERE nome_completo = ?", (nome,)).fetchone()
+                if linha is None:
+                    continue
+                usuario_id = linha[0]
+                jogos_antigos = [
+                    jogo_id for (jogo_id,) in
+                    conn.execute("SELECT jogo_id FROM usuario_jogo WHERE usuario_id = ?", (usuario_id,))
+                ]
+                for jogo_id in jogos_antigos:
+                    variacoes[jogo_id] = variacoes.get(jogo_id, 0) - 1
+                conn.execute("DELETE FROM usuario_jogo WHERE usuario_id = ?", (usuario_id,))
+                conn.execute("DELETE FROM usuarios WHERE id = ?", (usuario_id,))
+                totais['removidos'] += 1
+                totais['pares_removidos'] += len(jogos_antigos)
+
+            for chave_total, df in (('adicionados', adicionados), ('alterados', alterados)):
+                if df is None:
+                    continue
+                for nome, estado, jogos in _linhas_usuarios(df):
+                    assinatura = assinatura_usuario(estado, jogos)
+                    linha = conn.execute("SELECT id FROM usuarios WHERE nome_completo = ?", (nome,)).fetchone()
+                    if linha is None:
+                        usuario_id = conn.execute(
+                            "INSERT INTO usuarios (nome_completo, estado, assinatura) VALUES (?, ?, ?)",
+                            (nome, estado, assinatura),
+                        ).lastrowid
+                        antigos = set()
+                    else:
+                        usuario_id = linha[0]
+                        conn.execute(
+                            "UPDATE usuarios SET estado = ?, assinatura = ? WHERE id = ?",
+                            (estado, assinatura, usuario_id),
+                        )
+                        antigos = {
+                            jogo_id for (jogo_id,) in
+                            conn.execute("SELECT jogo_id FROM usuario_jogo WHERE usuario_id = ?", (usuario_id,))
+                        }
+
+                    novos = {_id_jogo(conn, chave, titulo) for chave, titulo in jogos.items()}
+                    conn.executemany(
+                        "INSERT INTO usuario_jogo (usuario_id, jogo_id) VALUES (?, ?)",
+                        [(usuario_id, jogo_id) for jogo_id in novos - antigos],
+                    )
+                    conn.executemany(
+                        "DELETE FROM usuario_jogo WHERE usuario_id = ? AND jogo_id = ?",
+                        [(usuario_id, jogo_id) for jogo_id in antigos - novos],
+                    )
+                    for jogo_id in novos - antigos:
+                        variacoes[jogo_id] = variacoes.get(jogo_id, 0) + 1
+                    for jogo_id in antigos - novos:
+                        variacoes[jogo_id] = variacoes.get(jogo_id, 0) - 1
+                    totais[chave_total] += 1
+                    totais['pares_inseridos'] += len(novos - antigos)
+                    totais['pares_removidos'] += len(antigos - novos)
+
+            _somar_contagens(conn, variacoes)
+    finally:
+        conn.close()
+
+    totais['segundos'] = time.perf_counter() - inicio
+    return totais
+
+def usuarios_que_gostam(titulo, caminho_db='Q4/analise_jogos.db'):
+    """
+    Lista os usuários que mencionam um jogo, com uma busca pelo índice de `usuario_jogo`.
+
+    Args:
+        titulo (str): Título do jogo; espaços extras e maiúsculas são ignorados.
+        caminho_db (str, optional): Caminho do banco SQLite.
+
+    Returns:
+        list: Tuplas (nome_completo, estado), em ordem alfabética.
+    """
+    _, chave = normalizar_jogo(titulo)
+    conn = sqlite3.connect(caminho_db)
+    try:
+        return conn.execute(
+            """
+            SELECT usuarios.nome_completo, usuarios.estado
+            FROM jogos
+            JOIN usuario_jogo ON usuario_jogo.jogo_id = jogos.id
+            JOIN usuarios ON usuarios.id = usuario_jogo.usuario_id
+            WHERE jogos.chave = ?
+            ORDER BY usuarios.nome_completo
+            """,
+            (chave,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+def top_jogos_por_estado(estado, limite=10, caminho_db='Q4/analise_jogos.db'):
+    """
+    Jogos mais mencionados pelos usuários de um estado.
+
+    Args:
+        estado (str): Estado dos usuários, como gravado na coluna 'estado' (por exemplo, 'SP').
+        limite (int, optional): Quantidade máxima de jogos retornados.
+        caminho_db (str, optional): Caminho do banco SQLite.
+
+    Returns:
+        list: Tuplas (jogo, contagem), da maior para a menor contagem.
+    """
+    conn = sqlite3.connect(caminho_db)
+    try:
+        return conn.execute(
+            """
+            SELECT jogos.titulo, COUNT(*) AS contagem
+            FROM usuarios
+            JOIN usuario_jogo ON usuario_jogo.usuario_id = usuarios.id
+            JOIN jogos ON jogos.id = usuario_jogo.jogo_id
+            WHERE usuarios.estado = ?
+            GROUP BY jogos.id
+            ORDER BY contagem DESC, jogos.titulo
+            LIMIT ?
+            """,
+            (estado, limite),
+        ).fetchall()
+    finally:
+        conn.close()
@@ -0,0 +1,218 @@
+import hashlib
+import math
+from collections import Counter, defaultdict
+
+from incidencia import separar_jogos
+
+# Estruturas probabilísticas para analisar muitos usuários com memória fixa.
+#
+# - CountMinSketch: estima a frequência de qualquer jogo; nunca subestima e, com
+#   probabilidade 1 - delta, superestima no máximo epsilon × total de ocorrências.
+# - HyperLogLog: estima o número de jogos distintos com erro relativo ~ `erro`.
+# - ContadorFrequentes (Misra–Gries): mantém os candidatos a jogos mais comuns
+#   com no máximo `capacidade` contadores.
+#
+# As menções são acumuladas em um contador de até PENDENTES_MAXIMO chaves e
+# repassadas às estruturas de uma vez, com a quantidade de cada chave: os títulos
+# populares são somados uma vez por bloco, e não uma vez por menção.
+
+PENDENTES_MAXIMO = 50_000
+
+def _hash(chave):
+    """Dois inteiros de 64 bits independentes para a chave."""
+    resumo = hashlib.blake2b(chave.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(resumo[:8], 'little'), int.from_bytes(resumo[8:], 'little')
+
+class CountMinSketch:
+    """
+    Count-min sketch com largura ceil(e / epsilon) e profundidade ceil(ln(1 / delta)).
+
+    As posições de cada linha vêm de dois hashes combinados (h1 + i·h2), como em
+    Kirsch e Mitzenmacher.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon e delta devem estar entre 0 e 1.")
+        self.epsilon = epsilon
+        self.delta = delta
+        self.largura = math.ceil(math.e / epsilon)
+        self.profundidade = math.ceil(math.log(1 / delta))
+        self.tabela = [[0] * self.largura for _ in range(self.profundidade)]
+        self.total = 0
+
+    def _posicoes(self, chave):
+        h1, h2 = _hash(chave)
+        return [(h1 + linha * h2) % self.largura for linha in range(self.profundidade)]
+
+    def adicionar(self, chave, quantidade=1):
+        for linha, posicao in zip(self.tabela, self._posicoes(chave)):
+            linha[posicao] += quantidade
+        self.total += quantidade
+
+    def estimar(self, chave):
+        """Frequência estimada; excede a real em até epsilon × total com probabilidade 1 - delta."""
+        return min(linha[posicao] for linha, posicao in zip(self.tabela, self._posicoes(chave)))
+
+    @property
+    def erro_maximo(self):
+        """Superestimação máxima esperada, em ocorrências."""
+        return self.epsilon * self.total
+
+class HyperLogLog:
+    """
+    Contador de elementos distintos com 2^p registradores.
+
+    A precisão p é a menor que garante erro padrão 1.04 / sqrt(2^p) <= `erro`.
+    """
+
+    def __init__(self, erro=0.01):
+        if not 0 < erro < 1:
+            raise ValueError("erro deve estar entre 0 e 1.")
+        self.precisao = min(max(math.ceil(math.log2((1.04 / erro) ** 2)), 4), 18)
+        self.registradores = bytearray(1 << self.precisao)
+
+    def adicionar(self, chave):
+        valor, _ = _hash(chave)
+        bits_restantes = 64 - self.precisao
+        indice = valor >> bits_restantes
+        resto = valor & ((1 << bits_restantes) - 1)
+        posto = bits_restantes - resto.bit_length() + 1
+        if posto > self.registradores[indice]:
+            self.registradores[indice] = posto
+
+    @property
+    def erro_padrao(self):
+        return 1.04 / math.sqrt(len(self.registradores))
+
+    def estimar(self):
+        m = len(self.registradores)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimativa = alfa * m * m / sum(2.0 ** -registrador for registrador in self.registradores)
+        vazios = self.registradores.count(0)
+        if estimativa <= 2.5 * m and vazios:
+            # Correção para cardinalidades pequenas (contagem linear)
+            estimativa = m * math.log(m / vazios)
+        return round(estimativa)
+
+class ContadorFrequentes:
+    """
+    Algoritmo de Misra–Gries para itens frequentes.
+
+    Com `capacidade` contadores, todo item com frequência acima de
+    total / (capacidade + 1) continua entre os candidatos, e cada contagem
+    guardada subestima a real em no máximo esse valor.
+
+    O decremento de todos os contadores é feito de uma vez: cada item guarda a
+    contagem somada a um desconto comum, e os itens são agrupados por esse valor
+    bruto. Decrementar é aumentar o desconto e descartar o grupo que chegou a
+    zero, em tempo constante amortizado, sem percorrer a tabela.
+    """
+
+    def __init__(self, capacidade=1000):
+        self.capacidade = capacidade
+        self.total = 0
+        self.desconto = 0
+        self._brutos = {}
+        self._por_bruto = defaultdict(set)
+
+    def __contains__(self, chave):
+        return chave in self._brutos
+
+    def __len__(self):
+        return len(self._brutos)
+
+    @property
+    def contagens(self):
+        """Dicionário {item: contagem guardada}."""
+        return {item: bruto - self.desconto for item, bruto in self._brutos.items()}
+
+    def adicionar(self, chave, quantidade=1):
+        """Equivale a `quantidade` chamadas seguidas com a mesma chave."""
+        self.total += quantidade
+        bruto = self._brutos.get(chave)
+        if bruto is None:
+            while len(self._brutos) >= self.capacidade and quantidade:
+                # Decrementa todos os contadores; os que chegam a zero liberam espaço
+                self.desconto += 1
+                for item in self._por_bruto.pop(self.desconto, ()):
+                    del self._brutos[item]
+                quantidade -= 1
+            if not quantidade:
+                return
+            bruto = self.desconto
+        else:
+            grupo = self._por_bruto[bruto]
+            grupo.discard(chave)
+            if not grupo:
+                del self._por_bruto[bruto]
+        self._brutos[chave] = bruto + quantidade
+        self._por_bruto[bruto + quantidade].add(chave)
+
+    def candidatos(self):
+        return list(self._brutos)
+
+def analisar_aproximado(jogos_preferidos, epsilon=0.001, delta=0.01, erro_distintos=0.01, top=20):
+    """
+    Resume os jogos preferidos em uma única passagem, com memória que não depende do número de usuários.
+
+    Args:
+        jogos_preferidos (iterable): Jogos de cada usuário, separados por '|'; pode ser um gerador.
+        epsilon (float, optional): Erro relativo ao total de menções aceito nas frequências.
+        delta (float, optional): Probabilidade de a frequência estimada exceder esse erro.
+        erro_distintos (float, optional): Erro padrão relativo da contagem de jogos distintos.
+        top (int, optional): Quantidade de jogos mais comuns retornados.
+
+    Returns:
+        dict: 'usuarios', 'mencoes', 'jogos_distintos' (estimativa), 'jogos_comuns'
+              (lista de (jogo, frequência estimada) com frequência > 1) e as estruturas usadas,
+              em 'frequencias', 'distintos' e 'frequentes'.
+    """
+    frequencias = CountMinSketch(epsilon, delta)
+    distintos = HyperLogLog(erro_distintos)
+    frequentes = ContadorFrequentes(max(math.ceil(1 / epsilon), top))
+    titulos = {}
+    usuarios = 0
+    pendentes = Counter()
+    titulos_pendentes = {}
+
+    def descarregar():
+        nonlocal titulos
+        for chave, quantidade in pendentes.items():
+            frequencias.adicionar(chave, quantidade)
+            distintos.adicionar(chave)
+            frequentes.adicionar(chave, quantidade)
+            if chave in frequentes:
+                titulos.setdefault(chave, titulos_pendentes[chave])
+        pendentes.clear()
+        titulos_pendentes.clear()
+        if len(titulos) > 2 * frequentes.capacidade:
+            titulos = {chave: titulo for chave, titulo in titulos.items() if chave in frequentes}
+
+    for jogos in jogos_preferidos:
+        usuarios += 1
+        jogos_usuario = separar_jogos(jogos)
+        pendentes.update(jogos_usuario.keys())
+        for chave, titulo in jogos_usuario.items():
+            titulos_pendentes.setdefault(chave, titulo)
+        if len(pendentes) >= PENDENTES_MAXIMO:
+            descarregar()
+    descarregar()
+
+    estimativas = sorted(
+        ((frequencias.estimar(chave), chave) for chave in frequentes.candidatos()),
+        key=lambda item: (-item[0], titulos.get(item[1], item[1])),
+    )
+    jogos_comuns = [
+        (titulos.get(chave, chave), contagem) for contagem, chave in estimativas[:top] if contagem > 1
+    ]
+
+    return {
+        'usuarios': usuarios,
+        'mencoes': frequencias.total,
+        'jogos_distintos': distintos.estimar(),
+        'jogos_comuns': jogos_comuns,
+        'frequencias': frequencias,
+        'distintos': distintos,
+        'frequentes': frequentes,
+    }
@@ -1,11 +1,23 @@
+import argparse
+import os
+import sys
 import pandas as pd
 import requests
 import sqlite3
 import time
-from sqlalchemy import create_engine
 import logging
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comum.cache_mercado_livre import CATEGORIA_JOGOS, URL_BUSCA, CacheMercadoLivre, buscar_anuncios
+from comum.filtro_titulos import FiltroTitulos
+from comum.sqlite_bulk import gravar_tabela
+
+try:
+    from cliente_async import buscar_todos_sincrono
+except ImportError:  # aiohttp indisponível: as consultas são feitas uma a uma
+    buscar_todos_sincrono = None
+
 # Configuração do logger
 logging.basicConfig(filename='Q4/links_invalidos.log', level=logging.INFO,
                     format='%(asctime)s - %(message)s')
@@ -26,20 +38,20 @@ class ErroExportacaoBanco(Exception):
 # Função para listar tabelas no banco de dados SQLite
 def listar_tabelas(caminho_db):
     """
-    Função para listar as tabelas presentes em um banco de dados SQLite.
+    Função para listar as tabelas e views presentes em um banco de dados SQLite.
 
     Args:
         caminho_db (str): Caminho para o arquivo do banco de dados SQLite.
 
     Returns:
-        pandas.DataFrame: DataFrame contendo os nomes das tabelas.
+        pandas.DataFrame: DataFrame contendo os nomes das tabelas e views.
 
     Raises:
         ErroLeituraArquivo: Se ocorrer um erro ao listar as tabelas.
     """
     try:
         conn = sqlite3.connect(caminho_db)
-        query = "SELECT name FROM sqlite_master WHERE type='table';"
+        query = "SELECT name FROM sqlite_master WHERE type IN ('table', 'view');"
         tabelas = pd.read_sql(query, conn)
         conn.close()
         return tabelas
@@ -71,13 +83,35 @@ def ler_tabela_sqlite(caminho_db, nome_tabela):
         raise ErroLeituraArquivo(f"Erro ao ler a tabela {nome_tabela} do banco de dados SQLite: {e}")
 
 
+def parametros_busca(nome_jogo):
+    """Parâmetros da busca de um jogo na categoria de games do Mercado Livre."""
+    return {'category': CATEGORIA_JOGOS, 'q': nome_jogo}
+
+def filtrar_resultados(resultados, nome_jogo):
+    """
+    Função para manter apenas os anúncios que parecem ser do jogo procurado.
+
+    Um anúncio é mantido se tiver permalink, se o título começar com "jogo" ou citar um console,
+    se não tiver termos da lista negra e se contiver todas as palavras do nome do jogo
+    como palavras inteiras ("fifa" não corresponde a "fifa23").
+
+    Args:
+        resultados (list): Itens de 'results' da resposta da API.
+        nome_jogo (str): Nome do jogo consultado.
+
+    Returns:
+        list: Lista de dicionários com 'nome', 'preco' e 'permalink'.
+    """
+    return FiltroTitulos(nome_jogo).filtrar(resultados)
+
 # Função para consultar a API do Mercado Livre com filtragem
-def consultar_informacoes_jogo(nome_jogo):
+def consultar_informacoes_jogo(nome_jogo, cache=None):
     """
     Função para consultar a API do Mercado Livre e filtrar informações sobre um jogo.
 
     Args:
         nome_jogo (str): Nome do jogo a ser consultado.
+        cache (CacheMercadoLivre, optional): Cache das buscas; sem ele, a API é sempre consultada.
 
     Returns:
         list: Lista de dicionários contendo informações válidas de jogos.
@@ -86,25 +120,8 @@ def consultar_informacoes_jogo(nome_jogo):
         ErroRequisicaoAPI: Se ocorrer um erro na requisição à API do Mercado Livre.
     """
     try:
-        consoles = ["Playstation 4", "Playstation 5", "PS4", "PS5", "Xbox 360", "Xbox Series S", "Xbox Series X", "Nintendo Switch"]
-        lista_negra = ["Amiibo"]
-        palavras_nome_jogo = nome_jogo.lower().split()
-        url = f"https://api.mercadolibre.com/sites/MLB/search?category=MLB186456&q={nome_jogo}"
-        resposta = requests.get(url)
-        resposta.raise_for_status()  # Levanta um HTTPError para respostas ruins
-        dados = resposta.json()
-        resultados = dados.get('results', [])
-
-        resultados_validos = [
-            {'nome': item['title'], 'preco': item['price'], 'permalink': item['permalink']}
-            for item in resultados if 'permalink' in item and item['permalink']
-            and (
-                item['title'].lower().startswith('jogo')
-                or any(console.lower() in item['title'].lower() for console in consoles)
-            )
-            and not any(termo.lower() in item['title'].lower() for termo in lista_negra)
-            and all(palavra in item['title'].lower() for palavra in palavras_nome_jogo) 
-        ]
+        dados, _ = buscar_anuncios(nome_jogo, CATEGORIA_JOGOS, cache)  # Levanta um HTTPError para respostas ruins
+        resultados_validos = filtrar_resultados(dados.get('results', []), nome_jogo)
 
         if not resultados_validos:
             logging.info(f"Jogo sem permalink válido encontrado: {nome_jogo}")
@@ -113,10 +130,69 @@ def consultar_informacoes_jogo(nome_jogo):
     except requests.exceptions.RequestException as e:
         raise ErroRequisicaoAPI(f"Erro ao consultar a API do Mercado Livre para o jogo {nome_jogo}: {e}")
 
+def consultar_jogos_async(nomes_jogos, taxa=5.0, rajada=10, concorrencia=8, cache=None):
+    """
+    Função para consultar vários jogos ao mesmo tempo, com limite de taxa (token bucket) e de concorrência.
+
+    Um erro em um jogo não interrompe os demais: ele é convertido em `ErroRequisicaoAPI`
+    e devolvido no lugar do resultado daquele jogo. Com `cache`, as respostas ainda válidas
+    não são consultadas; as obsoletas são consultadas junto com as ausentes, sob o mesmo
+    limite de taxa e de concorrência, e continuam valendo se a nova consulta falhar.
+
+    Args:
+        nomes_jogos (list): Nomes dos jogos a consultar.
+        taxa (float, optional): Requisições por segundo.
+        rajada (int, optional): Requisições permitidas de uma vez.
+        concorrencia (int, optional): Máximo de requisições simultâneas.
+        cache (CacheMercadoLivre, optional): Cache das buscas.
+
+    Returns:
+        list: Pares (nome do jogo, lista de informações válidas ou ErroRequisicaoAPI).
+    """
+    respostas = {}
+    obsoletas = {}
+    pendentes = []
+    for nome_jogo in nomes_jogos:
+        dados, situacao = cache.obter(nome_jogo, CATEGORIA_JOGOS) if cache else (None, None)
+        if situacao == 'fresca':
+            respostas[nome_jogo] = dados
+            continue
+        if situacao == 'obsoleta':
+            obsoletas[nome_jogo] = dados
+        pendentes.append(nome_jogo)
+
+    if pendentes:
+        obtidas = buscar_todos_sincrono(
+            [(URL_BUSCA, parametros_busca(nome_jogo)) for nome_jogo in pendentes],
+            taxa=taxa, rajada=rajada, concorrencia=concorrencia,
+        )
+        for nome_jogo, dados in zip(pendentes, obtidas):
+            if isinstance(dados, Exception):
+                dados = obsoletas.get(nome_jogo, dados)
+            elif cache:
+                cache.salvar(nome_jogo, CATEGORIA_JOGOS, dados)
+            respostas[nome_jogo] = dados
+
+    resultados = []
+    for nome_jogo in nomes_jogos:
+        dados = respostas[nome_jogo]
+        if isinstance(dados, Exception):
+            resultados.append((nome_jogo, ErroRequisicaoAPI(
+                f"Erro ao consultar a API do Mercado Livre para o jogo {nome_jogo}: {dados!r}"
+            )))
+            continue
+        resultados_validos = filtrar_resultados(dados.get('results', []), nome_jogo)
+        if not resultados_validos:
+            logging.info(f"Jogo sem permalink válido encontrado: {nome_jogo}")
+        resultados.append((nome_jogo, resultados_validos))
+    return resultados
+
 def exportar_para_sqlite(dados, caminho_db):
     """
     Função para exportar os preços para um banco de dados SQLite.
 
+    As linhas são gravadas em lotes, em uma única transação, com `comum.sqlite_bulk`.
+
     Args:
         dados (list): Lista de dicionários contendo os dados a serem exportados.
         caminho_db (str): Caminho para o arquivo do banco de dados SQLite.
@@ -125,21 +201,27 @@ def exportar_para_sqlite(dados, caminho_db):
         ErroExportacaoBanco: Se ocorrer um erro ao exportar os dados para o banco de dados SQLite.
     """
     try:
-        engine = create_engine(f'sqlite:///{caminho_db}')
         df = pd.DataFrame(dados)
-        df.to_sql('precos_jogos', con=engine, if_exists='replace', index=False)
-        print(f"Dados exportados com sucesso para o banco de dados SQLite em {caminho_db}")
+        relatorio = gravar_tabela(df, caminho_db, 'precos_jogos')
+        print(f"Dados exportados com sucesso para o banco de dados SQLite em {caminho_db} "
+              f"({relatorio['linhas']} linhas, {relatorio['linhas_por_segundo']:.0f} linhas/s)")
     except Exception as e:
         raise ErroExportacaoBanco(f"Erro ao exportar os dados para o banco de dados SQLite: {e}")
 
 # Função principal para ler, consultar a API e exportar os dados
-def principal(caminho_db_consolidado, caminho_db_saida):
+def principal(caminho_db_consolidado, caminho_db_saida, usar_async=False, taxa=5.0, rajada=10, concorrencia=8,
+              cache=None):
     """
     Função principal que coordena a leitura de dados, consulta à API e exportação para um banco de dados.
 
     Args:
         caminho_db_consolidado (str): Caminho para o arquivo do banco de dados SQLite de entrada.
         caminho_db_saida (str): Caminho para o arquivo do banco de dados SQLite de saída.
+        usar_async (bool, optional): Consulta os jogos ao mesmo tempo, com `cliente_async`.
+        taxa (float, optional): Requisições por segundo no modo assíncrono.
+        rajada (int, optional): Requisições permitidas de uma vez no modo assíncrono.
+        concorrencia (int, optional): Máximo de requisições simultâneas no modo assíncrono.
+        cache (CacheMercadoLivre, optional): Cache das buscas; jogos encontrados nele não esperam o intervalo entre requisições.
     """
     try:
         tabelas = listar_tabelas(caminho_db_consolidado)
@@ -167,15 +249,34 @@ def principal(caminho_db_consolidado, caminho_db_saida):
             print(f"A tabela {nome_tabela} não foi encontrada no banco de dados.")
 
     informacoes_jogos = []
-    for jogo in todos_jogos:
-        try:
-            info_jogo = consultar_informacoes_jogo(jogo)
-        except ErroRequisicaoAPI as e:
-            print(e)
-            continue
-        
-        informacoes_jogos.extend(info_jogo)
-        time.sleep(1)  # Adiciona um atraso para respeitar os limites de taxa da API
+    if usar_async and buscar_todos_sincrono is None:
+        print("aiohttp não está instalado: consultando os jogos um a um.")
+        usar_async = False
+
+    if usar_async:
+        for jogo, info_jogo in consultar_jogos_async(sorted(todos_jogos), taxa, rajada, concorrencia, cache):
+            if isinstance(info_jogo, ErroRequisicaoAPI):
+                print(info_jogo)
+                continue
+            informacoes_jogos.extend(info_jogo)
+    else:
+        for jogo in todos_jogos:
+            # Consultas feitas na hora ou agendadas em segundo plano pelo cache
+            requisicoes_cache = cache.falhas + cache.revalidacoes if cache else None
+            try:
+                info_jogo = consultar_informacoes_jogo(jogo, cache)
+            except ErroRequisicaoAPI as e:
+                print(e)
+                continue
+
+            informacoes_jogos.extend(info_jogo)
+            if cache is None or cache.falhas + cache.revalidacoes > requisicoes_cache:
+                time.sleep(1)  # Adiciona um atraso para respeitar os limites de taxa da API
+
+    if cache:
+        estatisticas = cache.estatisticas()
+        print(f"Cache de buscas: {estatisticas['acertos']} acertos, {estatisticas['acertos_obsoletos']} "
+              f"obsoletos revalidados e {estatisticas['falhas']} consultas à API")
 
     if informacoes_jogos:
         try:
@@ -191,4 +292,25 @@ caminho_db_saida = 'Q4/mercado_livre_jogos.db'
 
 # Executa o script principal
 if __name__ == "__main__":
-    principal(caminho_db_consolidado, caminho_db_saida)
+    parser = argparse.ArgumentParser(description="Consulta os preços dos jogos no Mercado Livre.")
+    parser.add_argument('--async', dest='usar_async', action='store_true',
+                        help="Consulta vários jogos ao mesmo tempo, com limite de taxa.")
+    parser.add_argument('--taxa', type=float, default=5.0,
+                        help="Requisições por segundo no modo --async.")
+    parser.add_argument('--rajada', type=int, default=10,
+                        help="Requisições permitidas de uma vez no modo --async.")
+    parser.add_argument('--concorrencia', type=int, default=8,
+                        help="Máximo de requisições simultâneas no modo --async.")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Consulta a API para todos os jogos, sem usar o cache de buscas.")
+    parser.add_argument('--cache-ttl', type=float, default=6,
+                        help="Validade das buscas armazenadas, em horas.")
+    args = parser.parse_args()
+
+    cache = None if args.sem_cache else CacheMercadoLivre(ttl=args.cache_ttl * 3600)
+    try:
+        principal(caminho_db_consolidado, caminho_db_saida, usar_async=args.usar_async, taxa=args.taxa,
+                  rajada=args.rajada, concorrencia=args.concorrencia, cache=cache)
+    finally:
+        if cache:
+            cache.fechar()
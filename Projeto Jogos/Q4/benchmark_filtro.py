@@ -0,0 +1,113 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comum.filtro_titulos import CONSOLES, LISTA_NEGRA, FiltroTitulos
+
+try:
+    import pandas as pd
+except ImportError:  # a versão vetorizada só é medida com o pandas instalado
+    pd = None
+
+# Compara o filtro compilado de títulos com a compreensão de lista usada antes
+# no Q4 e na integração, com anúncios sintéticos. Execute a partir da pasta
+# "Projeto Jogos":
+#     python Q4/benchmark_filtro.py
+#
+# O filtro novo exige as palavras do jogo como palavras inteiras, então pode
+# descartar anúncios que o antigo mantinha ("fifa" dentro de "fifa23"). Que essa
+# é a única diferença, e que a máscara vetorizada concorda com o filtro por item,
+# é verificado em testes/test_comum_filtro_titulos.py com anúncios gerados da mesma forma.
+
+JOGOS = ["The Witcher 3", "God of War", "Fifa", "Mario Kart 8", "Red Dead Redemption 2", "Spider-Man"]
+EXTRAS = ["Mídia Física", "Original", "Lacrado", "Usado", "Edição Completa", "Goty", "Novo", "Envio Imediato"]
+
+def filtrar_original(resultados, nome_jogo):
+    consoles = list(CONSOLES)
+    lista_negra = list(LISTA_NEGRA)
+    palavras_nome_jogo = nome_jogo.lower().split()
+    return [
+        {'nome': item['title'], 'preco': item['price'], 'permalink': item['permalink']}
+        for item in resultados if 'permalink' in item and item['permalink']
+        and (
+            item['title'].lower().startswith('jogo')
+            or any(console.lower() in item['title'].lower() for console in consoles)
+        )
+        and not any(termo.lower() in item['title'].lower() for termo in lista_negra)
+        and all(palavra in item['title'].lower() for palavra in palavras_nome_jogo)
+    ]
+
+def gerar_anuncios(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    anuncios = []
+    for i in range(quantidade):
+        partes = [aleatorio.choice(JOGOS)]
+        if aleatorio.random() < 0.3:
+            partes.insert(0, "Jogo")
+        if aleatorio.random() < 0.7:
+            partes.append(aleatorio.choice(CONSOLES))
+        if aleatorio.random() < 0.05:
+            partes.append(aleatorio.choice(LISTA_NEGRA))
+        if aleatorio.random() < 0.1:
+            partes[-1] += str(aleatorio.randint(19, 24))  # palavra colada, como "PS5" + "23"
+        partes.extend(aleatorio.sample(EXTRAS, aleatorio.randint(0, 3)))
+        anuncios.append({
+            'title': ' '.join(partes),
+            'price': round(aleatorio.uniform(50, 400), 2),
+            'permalink': f"https://produto.mercadolivre.com.br/MLB-{i}" if aleatorio.random() > 0.02 else None,
+        })
+    return anuncios
+
+def medir(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) / repeticoes
+
+def so_parte_de_palavra(titulo, nome_jogo):
+    titulo = titulo.lower()
+    return any(
+        re.search(rf'(?<!\w){re.escape(palavra)}(?!\w)', titulo) is None
+        for palavra in nome_jogo.lower().split()
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo do filtro de títulos de anúncios.")
+    parser.add_argument('--anuncios', type=int, default=50_000)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    anuncios = gerar_anuncios(args.anuncios)
+    tabela = pd.DataFrame(anuncios) if pd is not None else None
+    totais = {'original': 0.0, 'compilado': 0.0, 'vetorizado': 0.0}
+
+    for nome_jogo in JOGOS:
+        antigo, tempo = medir(lambda: filtrar_original(anuncios, nome_jogo), args.repeticoes)
+        totais['original'] += tempo
+        filtro = FiltroTitulos(nome_jogo)
+        novo, tempo = medir(lambda: filtro.filtrar(anuncios), args.repeticoes)
+        totais['compilado'] += tempo
+
+        links_novos = {item['permalink'] for item in novo}
+        descartados = [item for item in antigo if item['permalink'] not in links_novos]
+
+        if tabela is not None:
+            _, tempo = medir(lambda: filtro.filtrar_dataframe(tabela), args.repeticoes)
+            totais['vetorizado'] += tempo
+
+        print(f"{nome_jogo:>22}: {len(antigo):>6} antes, {len(novo):>6} agora ({len(descartados)} só com parte de palavra)")
+
+    print(f"\n{args.anuncios} anúncios × {len(JOGOS)} consultas")
+    print(f"  compreensão original: {totais['original']:.3f}s")
+    print(f"  filtro compilado:     {totais['compilado']:.3f}s ({totais['original'] / totais['compilado']:.1f}x)")
+    if tabela is not None:
+        print(f"  máscara vetorizada:   {totais['vetorizado']:.3f}s ({totais['original'] / totais['vetorizado']:.1f}x)")
+    else:
+        print("  máscara vetorizada:   pandas não instalado")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+# Cliente HTTP assíncrono para consultar muitas URLs respeitando o limite da API.
+#
+# Um token bucket controla a taxa (requisições por segundo, com rajadas de até
+# `rajada` requisições) e um semáforo limita as requisições simultâneas. Respostas
+# 429 e 5xx são repetidas com espera exponencial ou pelo tempo indicado em
+# Retry-After; um 429 também pausa o bucket para todas as requisições.
+
+STATUS_REPETIVEIS = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Limitador de taxa: `taxa` tokens por segundo, acumulando no máximo `rajada`."""
+
+    def __init__(self, taxa=5.0, rajada=10):
+        if taxa <= 0 or rajada < 1:
+            raise ValueError("A taxa deve ser positiva e a rajada, de pelo menos 1 requisição.")
+        self.taxa = taxa
+        self.rajada = rajada
+        self.tokens = float(rajada)
+        self.ultima_atualizacao = time.monotonic()
+        self.pausado_ate = 0.0
+        self._trava = asyncio.Lock()
+
+    def pausar(self, segundos):
+        """Impede novas requisições pelos próximos `segundos` (por exemplo, após um 429)."""
+        self.pausado_ate = max(self.pausado_ate, time.monotonic() + segundos)
+
+    async def adquirir(self):
+        """Espera até haver um token disponível e o consome."""
+        async with self._trava:
+            while True:
+                agora = time.monotonic()
+                if agora < self.pausado_ate:
+                    await asyncio.sleep(self.pausado_ate - agora)
+                    continue
+                self.tokens = min(self.rajada, self.tokens + (agora - self.ultima_atualizacao) * self.taxa)
+                self.ultima_atualizacao = agora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.taxa)
+
+def tempo_retry_after(valor):
+    """Segundos indicados no cabeçalho Retry-After (número ou data HTTP), ou None."""
+    if not valor:
+        return None
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return max((data - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+def _espera_exponencial(tentativa, espera_base, espera_maxima):
+    return min(espera_maxima, espera_base * 2 ** tentativa) * random.uniform(0.5, 1.0)
+
+async def buscar_json(sessao, url, limitador, params=None, tentativas=4, espera_base=1.0, espera_maxima=30.0):
+    """
+    Faz um GET e devolve o JSON da resposta, repetindo em 429, 5xx e falhas de conexão.
+
+    Raises:
+        aiohttp.ClientResponseError: Se a resposta for um erro não repetível ou as tentativas acabarem.
+        aiohttp.ClientError, asyncio.TimeoutError: Se a conexão falhar em todas as tentativas.
+    """
+    for tentativa in range(tentativas):
+        ultima = tentativa == tentativas - 1
+        await limitador.adquirir()
+        try:
+            async with sessao.get(url, params=params) as resposta:
+                if resposta.status in STATUS_REPETIVEIS and not ultima:
+                    espera = tempo_retry_after(resposta.headers.get('Retry-After'))
+                    if espera is None:
+                        espera = _espera_exponencial(tentativa, espera_base, espera_maxima)
+                    espera = min(espera, espera_maxima)
+                    if resposta.status == 429:
+                        limitador.pausar(espera)
+                    await asyncio.sleep(espera)
+                    continue
+                resposta.raise_for_status()
+                return await resposta.json(content_type=None)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if ultima:
+                raise
+            await asyncio.sleep(_espera_exponencial(tentativa, espera_base, espera_maxima))
+
+async def buscar_todos(requisicoes, taxa=5.0, rajada=10, concorrencia=8, tentativas=4, timeout=30.0):
+    """
+    Busca o JSON de várias URLs ao mesmo tempo, com limite de taxa e de concorrência.
+
+    Args:
+        requisicoes (iterable): Pares (url, params).
+        taxa (float, optional): Requisições por segundo.
+        rajada (int, optional): Requisições que podem ser feitas de uma vez antes de o limite valer.
+        concorrencia (int, optional): Máximo de requisições em andamento.
+        tentativas (int, optional): Tentativas por requisição.
+        timeout (float, optional): Tempo máximo de cada requisição, em segundos.
+
+    Returns:
+        list: Para cada requisição, na mesma ordem, o JSON da resposta ou a exceção que a fez falhar.
+    """
+    limitador = TokenBucket(taxa, rajada)
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as sessao:
+        async def buscar(url, params):
+            async with semaforo:
+                return await buscar_json(sessao, url, limitador, params, tentativas)
+
+        return await asyncio.gather(
+            *(buscar(url, params) for url, params in requisicoes), return_exceptions=True
+        )
+
+def buscar_todos_sincrono(requisicoes, **opcoes):
+    """Executa `buscar_todos` em um novo loop de eventos, para uso em código síncrono."""
+    return asyncio.run(buscar_todos(list(requisicoes), **opcoes))
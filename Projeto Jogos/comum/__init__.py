@@ -0,0 +1 @@
+# Módulos compartilhados entre os mini-projetos (Q1 a Q4 e integração)
@@ -0,0 +1,282 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+import requests
+
+from comum.texto import normalizar_texto
+
+# Cache persistente das buscas na API do Mercado Livre, compartilhado pelo Q4 e
+# pela integração.
+
+URL_BUSCA = "https://api.mercadolibre.com/sites/MLB/search"
+CATEGORIA_JOGOS = "MLB186456"
+CAMINHO_CACHE = 'Q4/cache_mercado_livre.db'
+# Segundos que fechar() espera pelas revalidações pendentes antes de descartá-las
+ESPERA_FECHAMENTO = 10
+
+
+class CacheMercadoLivre:
+    """
+    Cache em disco (SQLite) das respostas de busca, indexado pela consulta normalizada e pela categoria.
+
+    A consulta é normalizada com `normalizar_texto`, então "The Witcher 3" e
+    "the  witcher 3" compartilham a mesma entrada.
+
+    Políticas:
+        - Validade: entradas com menos de `ttl` segundos são servidas sem requisição.
+        - Stale-while-revalidate: até `janela_obsoleta` segundos depois de expirar, a
+          entrada ainda é servida, e uma nova consulta é feita em segundo plano.
+          Depois disso, a busca espera a resposta da API.
+        - Revalidações: um único trabalhador faz as consultas em segundo plano, uma
+          de cada vez e com pelo menos `intervalo_revalidacao` segundos entre elas,
+          com no máximo `revalidacoes_pendentes` aguardando.
+        - Tamanho: quando o total armazenado passa de `tamanho_maximo` bytes, as
+          entradas usadas há mais tempo são removidas primeiro (LRU).
+
+    Os contadores `acertos`, `acertos_obsoletos` e `falhas` registram quantas
+    buscas foram atendidas pelo cache e quantas precisaram da API;
+    `revalidacoes` conta as consultas agendadas em segundo plano.
+    """
+
+    def __init__(self, caminho=CAMINHO_CACHE, ttl=6 * 3600, janela_obsoleta=24 * 3600,
+                 tamanho_maximo=50 * 1024 * 1024, intervalo_revalidacao=1.0, revalidacoes_pendentes=32):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.janela_obsoleta = janela_obsoleta
+        self.tamanho_maximo = tamanho_maximo
+        self.intervalo_revalidacao = intervalo_revalidacao
+        self.revalidacoes_pendentes = revalidacoes_pendentes
+        self.acertos = 0
+        self.acertos_obsoletos = 0
+        self.falhas = 0
+        self.revalidacoes = 0
+        self._lock = threading.Lock()
+        self._ocioso = threading.Condition(self._lock)
+        self._revalidando = set()
+        self._fila = queue.Queue()
+        self._trabalhador = None
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS buscas (
+                consulta TEXT NOT NULL,
+                categoria TEXT NOT NULL,
+                resposta TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                expira_em REAL NOT NULL,
+                acessado_em REAL NOT NULL,
+                PRIMARY KEY (consulta, categoria)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_buscas_acesso ON buscas (acessado_em)")
+        self._conn.commit()
+        self.remover_expirados()
+
+    @staticmethod
+    def _chave(consulta, categoria):
+        return normalizar_texto(consulta), categoria or ''
+
+    def obter(self, consulta, categoria=None):
+        """
+        Busca a resposta armazenada de uma consulta.
+
+        Returns:
+            tuple: (resposta, situação), com situação 'fresca' ou 'obsoleta';
+                   (None, None) se não houver entrada utilizável.
+        """
+        chave = self._chave(consulta, categoria)
+        agora = time.time()
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT resposta, expira_em FROM buscas WHERE consulta = ? AND categoria = ?", chave
+            ).fetchone()
+            if linha is None or agora >= linha[1] + self.janela_obsoleta:
+                self.falhas += 1
+                return None, None
+            self._conn.execute(
+                "UPDATE buscas SET acessado_em = ? WHERE consulta = ? AND categoria = ?", (agora,) + chave
+            )
+            self._conn.commit()
+            if agora < linha[1]:
+                self.acertos += 1
+                situacao = 'fresca'
+            else:
+                self.acertos_obsoletos += 1
+                situacao = 'obsoleta'
+        return json.loads(linha[0]), situacao
+
+    def salvar(self, consulta, categoria, resposta, ttl=None):
+        """Armazena a resposta de uma consulta, válida por `ttl` segundos (padrão: o do cache)."""
+        chave = self._chave(consulta, categoria)
+        corpo = json.dumps(resposta, ensure_ascii=False)
+        agora = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO buscas (consulta, categoria, resposta, tamanho, expira_em, acessado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                chave + (corpo, len(corpo), agora + (self.ttl if ttl is None else ttl), agora)
+            )
+            self._aplicar_limite()
+            self._conn.commit()
+
+    def revalidar_em_segundo_plano(self, consulta, categoria, obter_resposta):
+        """
+        Agenda a atualização da entrada no trabalhador em segundo plano; erros mantêm a resposta antiga.
+
+        Só uma revalidação por consulta fica pendente. Com `revalidacoes_pendentes`
+        já aguardando, nada é agendado e a entrada continua obsoleta até a próxima busca.
+
+        Returns:
+            bool: True se a revalidação foi agendada (e, portanto, fará uma requisição).
+        """
+        chave = self._chave(consulta, categoria)
+        with self._lock:
+            if chave in self._revalidando or len(self._revalidando) >= self.revalidacoes_pendentes:
+                return False
+            self._revalidando.add(chave)
+            self.revalidacoes += 1
+            if self._trabalhador is None:
+                self._trabalhador = threading.Thread(target=self._revalidar_pendentes, daemon=True)
+                self._trabalhador.start()
+        self._fila.put((chave, consulta, categoria, obter_resposta))
+        return True
+
+    def _revalidar_pendentes(self):
+        ultima = None
+        while True:
+            item = self._fila.get()
+            if item is None:
+                return
+            chave, consulta, categoria, obter_resposta = item
+            if ultima is not None:
+                espera = self.intervalo_revalidacao - (time.monotonic() - ultima)
+                if espera > 0:
+                    time.sleep(espera)
+            ultima = time.monotonic()
+            try:
+                self.salvar(consulta, categoria, obter_resposta())
+            except Exception:
+                pass
+            finally:
+                with self._ocioso:
+                    self._revalidando.discard(chave)
+                    self._ocioso.notify_all()
+
+    def aguardar_revalidacoes(self, timeout=None):
+        """
+        Espera as revalidações em segundo plano terminarem (por exemplo, antes de encerrar o programa).
+
+        Returns:
+            bool: False se o tempo `timeout` acabou antes.
+        """
+        with self._ocioso:
+            return self._ocioso.wait_for(lambda: not self._revalidando, timeout)
+
+    def buscar(self, consulta, categoria, obter_resposta):
+        """
+        Resposta da consulta pelo cache, chamando `obter_resposta()` apenas quando necessário.
+
+        Uma resposta obsoleta é servida na hora e revalidada pelo trabalhador em
+        segundo plano; compare `revalidacoes` antes e depois para saber se uma
+        requisição foi agendada.
+
+        Returns:
+            tuple: (resposta, True se veio do cache).
+        """
+        resposta, situacao = self.obter(consulta, categoria)
+        if situacao == 'obsoleta':
+            self.revalidar_em_segundo_plano(consulta, categoria, obter_resposta)
+        if situacao is not None:
+            return resposta, True
+        resposta = obter_resposta()
+        self.salvar(consulta, categoria, resposta)
+        return resposta, False
+
+    def estatisticas(self):
+        """Contadores de acertos e falhas e a taxa de acerto."""
+        total = self.acertos + self.acertos_obsoletos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'acertos_obsoletos': self.acertos_obsoletos,
+            'falhas': self.falhas,
+            'revalidacoes': self.revalidacoes,
+            'taxa_acerto': (self.acertos + self.acertos_obsoletos) / total if total else 0.0,
+        }
+
+    def remover_expirados(self):
+        """Remove as entradas que já passaram da janela de stale-while-revalidate."""
+        with self._lock:
+            self._conn.execute("DELETE FROM buscas WHERE expira_em < ?", (time.time() - self.janela_obsoleta,))
+            self._conn.commit()
+
+    def _aplicar_limite(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM buscas").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+        for consulta, categoria, tamanho in self._conn.execute(
+            "SELECT consulta, categoria, tamanho FROM buscas ORDER BY acessado_em"
+        ).fetchall():
+            if total <= self.tamanho_maximo:
+                break
+            self._conn.execute("DELETE FROM buscas WHERE consulta = ? AND categoria = ?", (consulta, categoria))
+            total -= tamanho
+
+    def fechar(self, timeout=ESPERA_FECHAMENTO):
+        """
+        Fecha o cache, esperando as revalidações pendentes por até `timeout` segundos.
+
+        As que não começaram nesse prazo são descartadas; uma requisição em andamento
+        não é interrompida, mas sua resposta já não é salva.
+        """
+        prazo = None if timeout is None else time.monotonic() + timeout
+        self.aguardar_revalidacoes(timeout)
+        if self._trabalhador is not None:
+            while True:
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                with self._lock:
+                    self._revalidando.discard(item[0])
+            self._fila.put(None)
+            self._trabalhador.join(None if prazo is None else max(0.0, prazo - time.monotonic()))
+            self._trabalhador = None
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def buscar_anuncios(consulta, categoria=None, cache=None, timeout=30):
+    """
+    Busca anúncios na API do Mercado Livre, passando pelo cache quando informado.
+
+    Args:
+        consulta (str): Texto da busca.
+        categoria (str, optional): Categoria da busca (por exemplo, `CATEGORIA_JOGOS`).
+        cache (CacheMercadoLivre, optional): Cache das respostas.
+        timeout (float, optional): Tempo máximo da requisição, em segundos.
+
+    Returns:
+        tuple: (resposta JSON da API, True se veio do cache).
+
+    Raises:
+        requests.exceptions.RequestException: Se a requisição falhar.
+    """
+    def requisitar():
+        parametros = {'q': consulta}
+        if categoria:
+            parametros['category'] = categoria
+        resposta = requests.get(URL_BUSCA, params=parametros, timeout=timeout)
+        resposta.raise_for_status()
+        return resposta.json()
+
+    if cache is None:
+        return requisitar(), False
+    return cache.buscar(consulta, categoria, requisitar)
@@ -0,0 +1,184 @@
+import itertools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Exportação de tabelas em blocos, com memória constante.
+#
+# As linhas são gravadas à medida que os blocos chegam: o XLSX usa o modo
+# "write_only" do openpyxl, o CSV é acrescentado bloco a bloco e o Parquet usa
+# o ParquetWriter do pyarrow. Acima de `limite_linhas_xlsx` linhas, o arquivo
+# é gravado automaticamente no formato alternativo.
+#
+# O esquema do Parquet é fixado ao abrir o arquivo. Uma coluna só com valores
+# ausentes no primeiro bloco teria o tipo nulo, e os blocos seguintes não
+# caberiam nele; por isso os blocos são guardados até todas as colunas terem
+# um tipo (no máximo `LINHAS_INFERENCIA_PARQUET` linhas), e as que continuarem
+# só com ausentes são gravadas como texto.
+
+LIMITE_LINHAS_XLSX = 200_000
+LINHAS_INFERENCIA_PARQUET = 100_000
+
+
+def _em_blocos(dados, tamanho_bloco):
+    if isinstance(dados, pd.DataFrame):
+        # Um DataFrame vazio ainda gera um bloco, para que o cabeçalho seja gravado
+        for inicio in range(0, max(len(dados), 1), tamanho_bloco):
+            yield dados.iloc[inicio:inicio + tamanho_bloco]
+    else:
+        yield from dados
+
+
+def _valor_celula(valor):
+    if valor is None or valor is pd.NA or valor is pd.NaT:
+        return None
+    if isinstance(valor, float) and valor != valor:
+        return None
+    # .item() de um datetime64/timedelta64 em nanossegundos devolveria um inteiro
+    if isinstance(valor, np.datetime64):
+        valor = pd.Timestamp(valor)
+    elif isinstance(valor, np.timedelta64):
+        valor = pd.Timedelta(valor)
+    if valor is pd.NaT:
+        return None
+    if isinstance(valor, pd.Timestamp):
+        return valor.to_pydatetime()
+    if isinstance(valor, pd.Timedelta):
+        return valor.to_pytimedelta()
+    if hasattr(valor, 'item'):  # escalares do numpy
+        return valor.item()
+    return valor
+
+
+def _escrever_xlsx(blocos, caminho):
+    from openpyxl import Workbook
+
+    pasta = Workbook(write_only=True)
+    aba = pasta.create_sheet()
+    linhas = 0
+    cabecalho = False
+    for bloco in blocos:
+        if not cabecalho:
+            aba.append([str(coluna) for coluna in bloco.columns])
+            cabecalho = True
+        for linha in bloco.itertuples(index=False, name=None):
+            aba.append([_valor_celula(valor) for valor in linha])
+        linhas += len(bloco)
+    pasta.save(caminho)
+    return linhas
+
+
+def _escrever_csv(blocos, caminho):
+    linhas = 0
+    cabecalho = True
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        for bloco in blocos:
+            bloco.to_csv(arquivo, index=False, header=cabecalho)
+            cabecalho = False
+            linhas += len(bloco)
+    return linhas
+
+
+def _escrever_parquet(blocos, caminho):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def abrir(tabelas, forcar):
+        esquema = pa.unify_schemas([tabela.schema for tabela in tabelas])
+        if any(pa.types.is_null(campo.type) for campo in esquema):
+            if not forcar:
+                return None
+            esquema = pa.schema([campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo
+                                 for campo in esquema], metadata=esquema.metadata)
+        escritor = pq.ParquetWriter(caminho, esquema)
+        for tabela in tabelas:
+            escritor.write_table(tabela.cast(esquema))
+        return escritor
+
+    escritor = None
+    pendentes = []
+    linhas = 0
+    try:
+        for bloco in blocos:
+            tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+            linhas += len(bloco)
+            if escritor is not None:
+                escritor.write_table(tabela.cast(escritor.schema))
+                continue
+            pendentes.append(tabela)
+            escritor = abrir(pendentes, forcar=sum(map(len, pendentes)) >= LINHAS_INFERENCIA_PARQUET)
+            if escritor is not None:
+                pendentes = []
+        if escritor is None and pendentes:
+            escritor = abrir(pendentes, forcar=True)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return linhas
+
+
+ESCRITORES = {'.xlsx': _escrever_xlsx, '.csv': _escrever_csv, '.parquet': _escrever_parquet}
+
+
+def exportar_tabela(dados, caminho, total_linhas=None, limite_linhas_xlsx=LIMITE_LINHAS_XLSX,
+                    formato_alternativo='.csv', tamanho_bloco=10_000):
+    """
+    Exporta um DataFrame ou uma sequência de blocos de DataFrames, linha a linha.
+
+    Para arquivos .xlsx com mais de `limite_linhas_xlsx` linhas, o arquivo é
+    gravado com a extensão `formato_alternativo` (.csv ou .parquet). Se o total
+    de linhas não for conhecido de antemão, até `limite_linhas_xlsx` linhas são
+    mantidas em memória para decidir o formato.
+
+    Args:
+        dados (pd.DataFrame | iterable): DataFrame ou blocos de DataFrames com as mesmas colunas.
+        caminho (str): Arquivo de saída (.xlsx, .csv ou .parquet).
+        total_linhas (int, optional): Total de linhas, se conhecido.
+        limite_linhas_xlsx (int, optional): Máximo de linhas gravadas em XLSX.
+        formato_alternativo (str, optional): Extensão usada acima do limite.
+        tamanho_bloco (int, optional): Linhas por bloco quando `dados` é um DataFrame.
+
+    Returns:
+        dict: Arquivo gravado, formato, linhas, segundos e linhas por segundo.
+    """
+    inicio = time.perf_counter()
+    base, extensao = os.path.splitext(caminho)
+    extensao = extensao.lower()
+    if extensao not in ESCRITORES or formato_alternativo not in ESCRITORES:
+        raise ValueError(f"Formato não suportado: {extensao or caminho}")
+
+    if isinstance(dados, pd.DataFrame):
+        total_linhas = len(dados)
+    blocos = _em_blocos(dados, tamanho_bloco)
+
+    if extensao == '.xlsx':
+        if total_linhas is None:
+            # Guarda blocos até saber se o total cabe no limite do XLSX
+            iniciais = []
+            contagem = 0
+            for bloco in blocos:
+                iniciais.append(bloco)
+                contagem += len(bloco)
+                if contagem > limite_linhas_xlsx:
+                    break
+            excedeu = contagem > limite_linhas_xlsx
+            blocos = itertools.chain(iniciais, blocos)
+        else:
+            excedeu = total_linhas > limite_linhas_xlsx
+
+        if excedeu:
+            extensao = formato_alternativo
+            caminho = base + extensao
+            print(f"Mais de {limite_linhas_xlsx} linhas: exportando para {caminho} em vez de XLSX.")
+
+    linhas = ESCRITORES[extensao](blocos, caminho)
+    segundos = time.perf_counter() - inicio
+    return {
+        'arquivo': caminho,
+        'formato': extensao.lstrip('.'),
+        'linhas': linhas,
+        'segundos': segundos,
+        'linhas_por_segundo': linhas / segundos if segundos > 0 else float('inf'),
+    }
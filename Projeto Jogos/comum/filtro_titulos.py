@@ -0,0 +1,99 @@
+import re
+from functools import lru_cache
+
+# Filtro dos anúncios do Mercado Livre que parecem ser do jogo procurado,
+# compartilhado pelo Q4 e pela integração.
+#
+# Um anúncio é mantido se o título começar com "jogo" ou citar um console, não
+# tiver termos da lista negra e contiver todas as palavras do nome do jogo como
+# palavras inteiras. Consoles e lista negra viram uma única expressão regular
+# cada (alternativas), e as palavras do jogo, uma expressão com um lookahead por
+# palavra; o título é convertido para minúsculas uma única vez.
+
+CONSOLES = ("Playstation 4", "Playstation 5", "PS4", "PS5", "Xbox 360", "Xbox Series S", "Xbox Series X", "Nintendo Switch")
+LISTA_NEGRA = ("Amiibo",)
+
+
+@lru_cache(maxsize=None)
+def _alternativas(termos):
+    """Expressão que encontra qualquer um dos termos (em minúsculas), ou None se não houver termos."""
+    if not termos:
+        return None
+    # Termos mais longos primeiro, para que "xbox series x" seja tentado antes de prefixos menores
+    return re.compile('|'.join(re.escape(termo.lower()) for termo in sorted(termos, key=len, reverse=True)))
+
+
+def _palavras_inteiras(palavras):
+    """Expressão que exige todas as palavras, em qualquer ordem, sem fazerem parte de outras palavras."""
+    # [\s\S] em vez de re.DOTALL: o pandas 3 recusa, em str.match, padrões compilados com flags
+    return re.compile(''.join(rf'(?=[\s\S]*?(?<!\w){re.escape(palavra)}(?!\w))' for palavra in palavras))
+
+
+class FiltroTitulos:
+    """
+    Filtro de títulos de anúncios para um jogo, compilado uma vez por consulta.
+
+    Args:
+        nome_jogo (str): Nome do jogo procurado.
+        consoles (iterable, optional): Consoles que indicam um anúncio de jogo.
+        lista_negra (iterable, optional): Termos que descartam o anúncio.
+    """
+
+    def __init__(self, nome_jogo, consoles=CONSOLES, lista_negra=LISTA_NEGRA):
+        self.nome_jogo = nome_jogo
+        self.padrao_consoles = _alternativas(tuple(consoles))
+        self.padrao_lista_negra = _alternativas(tuple(lista_negra))
+        self.padrao_palavras = _palavras_inteiras(nome_jogo.lower().split())
+
+    def corresponde(self, titulo):
+        """Indica se um título passa no filtro."""
+        titulo = titulo.lower()
+        if not (titulo.startswith('jogo')
+                or (self.padrao_consoles is not None and self.padrao_consoles.search(titulo))):
+            return False
+        if self.padrao_lista_negra is not None and self.padrao_lista_negra.search(titulo):
+            return False
+        return self.padrao_palavras.match(titulo) is not None
+
+    def filtrar(self, resultados):
+        """
+        Filtra os itens de 'results' da resposta da API.
+
+        Returns:
+            list: Dicionários com 'nome', 'preco' e 'permalink' dos itens com permalink que passam no filtro.
+        """
+        return [
+            {'nome': item['title'], 'preco': item['price'], 'permalink': item['permalink']}
+            for item in resultados
+            if item.get('permalink') and self.corresponde(item['title'])
+        ]
+
+    def mascara(self, titulos):
+        """
+        Versão vetorizada de `corresponde` para muitos títulos de uma vez.
+
+        Args:
+            titulos (pd.Series): Títulos dos anúncios.
+
+        Returns:
+            pd.Series: Máscara booleana; valores ausentes não passam no filtro.
+        """
+        titulos = titulos.str.lower()
+        mascara = titulos.str.startswith('jogo', na=False)
+        if self.padrao_consoles is not None:
+            mascara |= titulos.str.contains(self.padrao_consoles, na=False)
+        if self.padrao_lista_negra is not None:
+            mascara &= ~titulos.str.contains(self.padrao_lista_negra, na=True)
+        mascara &= titulos.str.match(self.padrao_palavras, na=False)
+        return mascara
+
+    def filtrar_dataframe(self, anuncios):
+        """
+        Filtra um DataFrame de anúncios (colunas 'title', 'price' e 'permalink'), por exemplo os do cache.
+
+        Returns:
+            pd.DataFrame: Colunas 'nome', 'preco' e 'permalink' dos anúncios que passam no filtro.
+        """
+        validos = anuncios[anuncios['permalink'].notna() & (anuncios['permalink'] != '')]
+        validos = validos[self.mascara(validos['title'])]
+        return validos.rename(columns={'title': 'nome', 'price': 'preco'})[['nome', 'preco', 'permalink']]
@@ -0,0 +1,109 @@
+import os
+
+# Arquivos de intercâmbio entre etapas do projeto (por exemplo, Q2 → Q3).
+#
+# O formato padrão é o Arrow IPC (arquivo .arrow), que pode ser lido por
+# mapeamento de memória, sem copiar nem decodificar os dados. O Parquet (.parquet)
+# ocupa menos espaço em disco, mas precisa ser decodificado na leitura.
+
+CAMINHO_INTERCAMBIO = 'Q3/dados_consolidados.arrow'
+# Relatório Excel dos mesmos dados: gravado pelo Q2 e lido pelo Q3 quando é mais
+# recente que o arquivo de intercâmbio
+CAMINHO_EXCEL_CONSOLIDADO = 'Q3/dados_consolidados.xlsx'
+EXTENSOES_INTERCAMBIO = ('.arrow', '.feather', '.parquet')
+
+
+def eh_intercambio(caminho):
+    """Indica se o caminho tem a extensão de um arquivo de intercâmbio."""
+    return os.path.splitext(caminho)[1].lower() in EXTENSOES_INTERCAMBIO
+
+
+def gravar_intercambio(df, caminho=CAMINHO_INTERCAMBIO):
+    """
+    Grava um DataFrame como arquivo de intercâmbio (.arrow/.feather ou .parquet).
+
+    O arquivo é escrito com outro nome e renomeado ao final, de modo que um leitor
+    nunca veja um arquivo incompleto.
+
+    Args:
+        df (pd.DataFrame): Dados a gravar.
+        caminho (str, optional): Arquivo de saída.
+
+    Returns:
+        int: Tamanho do arquivo em bytes.
+    """
+    import pyarrow as pa
+
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao not in EXTENSOES_INTERCAMBIO:
+        raise ValueError(f"Formato de intercâmbio não suportado: {extensao or caminho}")
+
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = caminho + '.tmp'
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    try:
+        if extensao == '.parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(tabela, temporario)
+        else:
+            with pa.OSFile(temporario, 'wb') as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+                escritor.write_table(tabela)
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return os.path.getsize(caminho)
+
+
+def ler_intercambio(caminho=CAMINHO_INTERCAMBIO, colunas=None):
+    """
+    Lê um arquivo de intercâmbio gravado por `gravar_intercambio`.
+
+    Arquivos Arrow IPC são mapeados em memória: só as colunas pedidas são lidas do disco.
+
+    Args:
+        caminho (str, optional): Arquivo de intercâmbio.
+        colunas (list, optional): Colunas a ler; todas se None.
+
+    Returns:
+        pd.DataFrame: Dados do arquivo.
+    """
+    import pyarrow as pa
+
+    if os.path.splitext(caminho)[1].lower() == '.parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(caminho, columns=colunas, memory_map=True).to_pandas()
+
+    with pa.memory_map(caminho, 'r') as origem:
+        tabela = pa.ipc.open_file(origem).read_all()
+        if colunas is not None:
+            tabela = tabela.select(colunas)
+        return tabela.to_pandas()
+
+
+def ler_intercambio_em_blocos(caminho=CAMINHO_INTERCAMBIO, tamanho_bloco=50_000, colunas=None):
+    """
+    Lê um arquivo de intercâmbio em blocos de DataFrames, com memória limitada.
+
+    Yields:
+        pd.DataFrame: Blocos consecutivos de até `tamanho_bloco` linhas.
+    """
+    import pyarrow as pa
+
+    if os.path.splitext(caminho)[1].lower() == '.parquet':
+        import pyarrow.parquet as pq
+        arquivo = pq.ParquetFile(caminho, memory_map=True)
+        for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=colunas):
+            yield lote.to_pandas()
+        return
+
+    with pa.memory_map(caminho, 'r') as origem:
+        leitor = pa.ipc.open_file(origem)
+        for i in range(leitor.num_record_batches):
+            lote = leitor.get_batch(i)
+            if colunas is not None:
+                lote = lote.select(colunas)
+            for inicio in range(0, lote.num_rows, tamanho_bloco):
+                yield lote.slice(inicio, tamanho_bloco).to_pandas()
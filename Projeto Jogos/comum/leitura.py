@@ -0,0 +1,181 @@
+import json
+
+import pandas as pd
+
+# Leitores em blocos: entregam DataFrames de até `tamanho_bloco` linhas, de
+# modo que a memória usada dependa do tamanho do bloco e não do arquivo.
+
+
+def ler_csv_em_blocos(caminho, tamanho_bloco=50_000, encoding='utf-8', encoding_alternativo='latin1'):
+    """
+    Lê um CSV em blocos com `pd.read_csv(chunksize=...)`.
+
+    Se o arquivo não puder ser decodificado com `encoding`, ele é relido desde o
+    início com `encoding_alternativo`, e os registros já entregues são descartados.
+    Os registros são contados pelo leitor do pandas, e não por linhas do arquivo,
+    então campos entre aspas com quebras de linha não deslocam a retomada.
+
+    Yields:
+        pd.DataFrame: Blocos consecutivos do arquivo.
+    """
+    registros_entregues = 0
+    try:
+        with pd.read_csv(caminho, encoding=encoding, chunksize=tamanho_bloco) as leitor:
+            for bloco in leitor:
+                yield bloco
+                registros_entregues += len(bloco)
+    except UnicodeDecodeError:
+        with pd.read_csv(caminho, encoding=encoding_alternativo, chunksize=tamanho_bloco) as leitor:
+            for bloco in leitor:
+                if registros_entregues >= len(bloco):
+                    registros_entregues -= len(bloco)
+                    continue
+                yield bloco.iloc[registros_entregues:]
+                registros_entregues = 0
+
+
+# Caracteres com que um número JSON pode terminar no meio de um buffer ("3." de "3.25", "1e" de "1e5")
+_CARACTERES_NUMERO = frozenset('0123456789.eE+-')
+
+
+def iterar_array_json(arquivo, tamanho_buffer=1 << 16):
+    """
+    Percorre os objetos de um array JSON de nível superior sem carregar o arquivo inteiro.
+
+    Args:
+        arquivo: Arquivo de texto aberto.
+        tamanho_buffer (int, optional): Quantidade de caracteres lidos por vez.
+
+    Yields:
+        Cada elemento do array, já decodificado.
+
+    Raises:
+        ValueError: Se o conteúdo não for um array JSON válido (por exemplo, com
+            vírgulas faltando ou sobrando, ou com texto depois do array).
+    """
+    decodificador = json.JSONDecoder()
+    buffer = ''
+    posicao = 0
+    fim_arquivo = False
+
+    def proximo_caractere():
+        """Pula os espaços, lendo mais do arquivo se preciso; None no fim do arquivo."""
+        nonlocal buffer, posicao, fim_arquivo
+        while True:
+            while posicao < len(buffer) and buffer[posicao].isspace():
+                posicao += 1
+            if posicao < len(buffer):
+                return buffer[posicao]
+            if fim_arquivo:
+                return None
+            buffer, posicao = arquivo.read(tamanho_buffer), 0
+            fim_arquivo = not buffer
+
+    if proximo_caractere() != '[':
+        raise ValueError("O arquivo JSON não contém um array no nível superior.")
+    posicao += 1
+
+    caractere = proximo_caractere()
+    if caractere == ']':
+        posicao += 1
+    while caractere != ']':
+        if caractere is None:
+            raise ValueError("Array JSON incompleto.")
+        if caractere == ',':
+            raise ValueError("Vírgula inesperada no array JSON.")
+
+        while True:
+            try:
+                elemento, fim = decodificador.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+                mais = arquivo.read(tamanho_buffer)
+                fim_arquivo = not mais
+                buffer, posicao = buffer[posicao:] + mais, 0
+                continue
+            # Um número pode ter sido cortado no fim do buffer
+            cortado = all(c in _CARACTERES_NUMERO for c in buffer[fim:])
+            if cortado and not fim_arquivo and not isinstance(elemento, (dict, list, str)):
+                mais = arquivo.read(tamanho_buffer)
+                fim_arquivo = not mais
+                buffer, posicao = buffer[posicao:] + mais, 0
+                continue
+            break
+
+        yield elemento
+        posicao = fim
+        if posicao > tamanho_buffer:
+            buffer, posicao = buffer[posicao:], 0
+
+        caractere = proximo_caractere()
+        if caractere == ',':
+            posicao += 1
+            caractere = proximo_caractere()
+            if caractere == ']':
+                raise ValueError("Vírgula antes do fim do array JSON.")
+        elif caractere == ']':
+            posicao += 1
+        elif caractere is None:
+            raise ValueError("Array JSON incompleto.")
+        else:
+            raise ValueError(f"Esperada vírgula ou ']' no array JSON, encontrado {caractere!r}.")
+
+    if proximo_caractere() is not None:
+        raise ValueError("Conteúdo inesperado depois do array JSON.")
+
+
+def ler_json_em_blocos(caminho, tamanho_bloco=50_000, encoding='utf-8'):
+    """
+    Lê um arquivo JSON com um array de registros em blocos de DataFrames.
+
+    Yields:
+        pd.DataFrame: Blocos consecutivos de registros.
+    """
+    with open(caminho, 'r', encoding=encoding) as arquivo:
+        registros = []
+        inicio = 0
+        for registro in iterar_array_json(arquivo):
+            registros.append(registro)
+            if len(registros) >= tamanho_bloco:
+                yield pd.DataFrame(registros, index=range(inicio, inicio + len(registros)))
+                inicio += len(registros)
+                registros = []
+        if registros:
+            yield pd.DataFrame(registros, index=range(inicio, inicio + len(registros)))
+
+
+def ler_excel_em_blocos(caminho, tamanho_bloco=50_000, planilha=None):
+    """
+    Lê uma planilha XLSX em blocos, usando o modo somente leitura do openpyxl.
+
+    A primeira linha é usada como cabeçalho.
+
+    Yields:
+        pd.DataFrame: Blocos consecutivos de linhas.
+    """
+    from openpyxl import load_workbook
+
+    pasta = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        aba = pasta[planilha] if planilha else pasta.worksheets[0]
+        linhas = aba.iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            return
+        cabecalho = list(cabecalho)
+
+        bloco = []
+        inicio = 0
+        for linha in linhas:
+            if all(valor is None for valor in linha):
+                continue
+            bloco.append(linha)
+            if len(bloco) >= tamanho_bloco:
+                yield pd.DataFrame(bloco, columns=cabecalho, index=range(inicio, inicio + len(bloco)))
+                inicio += len(bloco)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=cabecalho, index=range(inicio, inicio + len(bloco)))
+    finally:
+        pasta.close()
@@ -0,0 +1,166 @@
+import itertools
+import os
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine, event
+
+# Gravação em massa em SQLite.
+#
+# Cada banco tem um único engine, reutilizado entre as chamadas, cujas conexões
+# recebem pragmas voltados para cargas grandes (WAL, synchronous=NORMAL, cache
+# maior e tabelas temporárias em memória). As linhas são inseridas com
+# executemany, em lotes, dentro de uma única transação, e os índices só são
+# criados depois da carga.
+#
+# O pysqlite só abre a transação antes de INSERT/UPDATE/DELETE e confirma a que
+# estiver aberta antes de DROP ou CREATE, então uma reconstrução que falhasse no
+# meio deixaria o banco sem as tabelas antigas. Seguindo a receita do SQLAlchemy
+# para o pysqlite, o driver fica em modo autocommit e o próprio engine emite o
+# BEGIN ao iniciar cada transação, que passa a incluir os comandos DDL.
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA temp_store=MEMORY",
+)
+
+TAMANHO_LOTE = 50_000
+
+_ENGINES = {}
+
+
+def _configurar_conexao(conexao_dbapi, _registro):
+    conexao_dbapi.isolation_level = None
+    cursor = conexao_dbapi.cursor()
+    for pragma in PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _iniciar_transacao(conexao):
+    conexao.exec_driver_sql("BEGIN")
+
+
+def obter_engine(caminho_db):
+    """
+    Engine SQLAlchemy do banco, criado na primeira chamada e reutilizado nas seguintes.
+
+    Args:
+        caminho_db (str): Caminho do arquivo SQLite.
+
+    Returns:
+        sqlalchemy.engine.Engine: Engine com os pragmas de `PRAGMAS` aplicados a cada conexão e
+            transações que incluem os comandos DDL.
+    """
+    chave = os.path.abspath(caminho_db)
+    engine = _ENGINES.get(chave)
+    if engine is None:
+        engine = create_engine(f'sqlite:///{caminho_db}')
+        event.listen(engine, 'connect', _configurar_conexao)
+        event.listen(engine, 'begin', _iniciar_transacao)
+        _ENGINES[chave] = engine
+    return engine
+
+
+def inserir_em_lotes(conexao, comando, linhas, tamanho_lote=TAMANHO_LOTE):
+    """
+    Insere as linhas com executemany, em lotes de `tamanho_lote`.
+
+    Args:
+        conexao (sqlalchemy.engine.Connection): Conexão com a transação em andamento.
+        comando (str): INSERT com parâmetros '?'.
+        linhas (iterable): Tuplas de valores; pode ser um gerador.
+        tamanho_lote (int, optional): Linhas enviadas por chamada.
+
+    Returns:
+        int: Quantidade de linhas inseridas.
+    """
+    linhas = iter(linhas)
+    total = 0
+    while True:
+        lote = list(itertools.islice(linhas, tamanho_lote))
+        if not lote:
+            return total
+        conexao.exec_driver_sql(comando, lote)
+        total += len(lote)
+
+
+def _tipo_sqlite(serie):
+    if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_integer_dtype(serie):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(serie):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _linhas_dataframe(df, tamanho_lote):
+    colunas_data = [
+        coluna for coluna in df.columns if pd.api.types.is_datetime64_any_dtype(df[coluna])
+    ]
+    for inicio in range(0, len(df), tamanho_lote):
+        bloco = df.iloc[inicio:inicio + tamanho_lote]
+        if colunas_data:
+            bloco = bloco.assign(**{
+                coluna: bloco[coluna].dt.strftime('%Y-%m-%d %H:%M:%S') for coluna in colunas_data
+            })
+        # astype(object) converte os escalares do numpy em tipos do Python; ausentes viram NULL
+        bloco = bloco.astype(object).where(bloco.notna(), None)
+        yield from bloco.itertuples(index=False, name=None)
+
+
+def _citar(nome):
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+def gravar_tabela(df, caminho_db, tabela, indices=(), substituir=True, tamanho_lote=TAMANHO_LOTE):
+    """
+    Grava um DataFrame em uma tabela SQLite, em uma única transação.
+
+    Substitui `DataFrame.to_sql`: a tabela é criada com os tipos das colunas, as
+    linhas são inseridas em lotes com executemany e os índices são criados ao final.
+
+    Args:
+        df (pd.DataFrame): Dados a gravar.
+        caminho_db (str): Caminho do arquivo SQLite.
+        tabela (str): Nome da tabela.
+        indices (iterable, optional): Colunas indexadas; cada item é uma coluna ou uma tupla de colunas.
+        substituir (bool, optional): Se True, remove a tabela existente; se False, acrescenta as linhas.
+        tamanho_lote (int, optional): Linhas enviadas por chamada de executemany.
+
+    Returns:
+        dict: Tabela, linhas, segundos e linhas por segundo.
+    """
+    inicio = time.perf_counter()
+    colunas = ', '.join(_citar(coluna) for coluna in df.columns)
+    definicoes = ', '.join(f'{_citar(coluna)} {_tipo_sqlite(df[coluna])}' for coluna in df.columns)
+    parametros = ', '.join('?' * len(df.columns))
+
+    with obter_engine(caminho_db).begin() as conexao:
+        if substituir:
+            conexao.exec_driver_sql(f'DROP TABLE IF EXISTS {_citar(tabela)}')
+        conexao.exec_driver_sql(f'CREATE TABLE IF NOT EXISTS {_citar(tabela)} ({definicoes})')
+        linhas = inserir_em_lotes(
+            conexao, f'INSERT INTO {_citar(tabela)} ({colunas}) VALUES ({parametros})',
+            _linhas_dataframe(df, tamanho_lote), tamanho_lote,
+        )
+        for indice in indices:
+            colunas_indice = (indice,) if isinstance(indice, str) else tuple(indice)
+            nome_indice = '_'.join(('idx', tabela) + colunas_indice)
+            conexao.exec_driver_sql(
+                f'CREATE INDEX IF NOT EXISTS {_citar(nome_indice)} ON {_citar(tabela)} '
+                f'({", ".join(_citar(coluna) for coluna in colunas_indice)})'
+            )
+
+    return relatorio_gravacao(tabela, linhas, time.perf_counter() - inicio)
+
+
+def relatorio_gravacao(tabela, linhas, segundos):
+    """Relatório de uma gravação, no mesmo formato de `gravar_tabela`."""
+    return {
+        'tabela': tabela,
+        'linhas': linhas,
+        'segundos': segundos,
+        'linhas_por_segundo': linhas / segundos if segundos > 0 else float('inf'),
+    }
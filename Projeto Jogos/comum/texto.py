@@ -0,0 +1,36 @@
+import re
+import unicodedata
+
+# Normalização de textos usada para comparar títulos de jogos e nomes
+
+_RE_APOSTROFOS = re.compile(r"['’`´]")
+_RE_PONTUACAO = re.compile(r"[^\w\s]|_")
+_RE_ESPACOS = re.compile(r"\s+")
+
+
+def remover_acentos(texto):
+    """Remove os acentos de um texto, mantendo as letras base."""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def normalizar_texto(texto):
+    """
+    Gera a forma canônica de um texto para comparações.
+
+    Converte para minúsculas (casefold), remove acentos e pontuação e
+    colapsa os espaços, de modo que "Marvel's Spider-Man" e
+    "marvels  spider man" resultem na mesma chave.
+
+    Args:
+        texto (str): Texto original. Valores que não são str viram "".
+
+    Returns:
+        str: Texto normalizado.
+    """
+    if not isinstance(texto, str):
+        return ''
+    texto = remover_acentos(texto.casefold())
+    texto = _RE_APOSTROFOS.sub('', texto)
+    texto = _RE_PONTUACAO.sub(' ', texto)
+    return _RE_ESPACOS.sub(' ', texto).strip()
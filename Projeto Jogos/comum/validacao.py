@@ -0,0 +1,120 @@
+import re
+from datetime import datetime
+
+import pandas as pd
+
+# Validações de dados de usuários compartilhadas entre Q2 e a integração
+
+FORMATOS_DATA = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y")
+DATA_INVALIDA = 'Data inválida'
+
+PADRAO_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+EMAIL_INVALIDO = 'email inválido'
+
+
+def eh_email_valido(email):
+    """
+    Função para validar um endereço de email.
+
+    Args:
+        email (str): Endereço de email a ser validado.
+
+    Returns:
+        bool: True se o email for válido, False caso contrário.
+    """
+    return isinstance(email, str) and PADRAO_EMAIL.fullmatch(email) is not None
+
+
+def emails_validos(emails):
+    """
+    Versão vetorizada de `eh_email_valido` para uma coluna inteira.
+
+    Args:
+        emails (pd.Series): Endereços de email.
+
+    Returns:
+        pd.Series: Máscara booleana, False para valores ausentes ou que não são texto.
+    """
+    emails = pd.Series(emails).astype(object)
+    return emails.str.fullmatch(PADRAO_EMAIL).eq(True)
+
+
+def validar_data(data):
+    """
+    Função para validar e converter uma string de data em formato padrão.
+
+    Args:
+        data (str): String contendo a data a ser validada e convertida.
+
+    Returns:
+        str: Data no formato 'YYYY-MM-DD' se válida, 'Data inválida' caso contrário.
+    """
+    for fmt in FORMATOS_DATA:
+        try:
+            return datetime.strptime(data, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return DATA_INVALIDA
+
+
+def interpretar_datas(datas, formatos=FORMATOS_DATA):
+    """
+    Converte uma coluna de datas em texto para datetime, de forma vetorizada.
+
+    Cada formato é aplicado uma única vez sobre a coluna inteira, e apenas as
+    linhas ainda não resolvidas seguem para o formato seguinte.
+
+    Args:
+        datas (pd.Series): Datas em texto.
+        formatos (tuple, optional): Formatos aceitos, em ordem de prioridade.
+
+    Returns:
+        pd.Series: Datas convertidas (datetime64), com NaT nas inválidas.
+    """
+    datas = pd.Series(datas)
+    if pd.api.types.is_datetime64_any_dtype(datas):
+        return datas
+
+    texto = datas.astype(str).reset_index(drop=True)
+    # A resolução fica a que o pandas escolher (ns no pandas 2, us no 3); forçar
+    # datetime64[ns] faria datas fora de 1677-2262 levantarem OutOfBoundsDatetime
+    resultado = None
+    for formato in formatos:
+        if resultado is None:
+            resultado = pd.to_datetime(texto, format=formato, errors='coerce')
+            continue
+        pendentes = resultado.isna()
+        if not pendentes.any():
+            break
+        convertidas = pd.to_datetime(texto[pendentes], format=formato, errors='coerce')
+        resultado = resultado.where(~pendentes, convertidas)
+    if resultado is None:
+        resultado = pd.Series(pd.NaT, index=texto.index, dtype='datetime64[ns]')
+
+    resultado.index = datas.index
+    return resultado
+
+
+def normalizar_datas(datas, formatos=FORMATOS_DATA, valor_invalido=DATA_INVALIDA):
+    """
+    Versão vetorizada de `validar_data` para uma coluna inteira.
+
+    Args:
+        datas (pd.Series): Datas em texto.
+        formatos (tuple, optional): Formatos aceitos, em ordem de prioridade.
+        valor_invalido (str, optional): Texto usado para as datas inválidas.
+
+    Returns:
+        pd.Series: Datas no formato 'YYYY-MM-DD' ou `valor_invalido`.
+    """
+    datas = pd.Series(datas)
+    convertidas = interpretar_datas(datas, formatos)
+    normalizadas = convertidas.dt.strftime("%Y-%m-%d").astype(object)
+
+    # Datas que o datetime64 não representa (antes de 1677 ou depois de 2262 no
+    # pandas 2) e anos com menos de quatro dígitos, que o strftime de validar_data
+    # não completa com zeros, seguem a validação valor a valor
+    restantes = convertidas.isna() | (convertidas.dt.year < 1000)
+    if restantes.any() and not pd.api.types.is_datetime64_any_dtype(datas):
+        normalizadas[restantes] = datas[restantes].astype(str).map(validar_data, na_action='ignore')
+    return normalizadas.where(normalizadas != DATA_INVALIDA, valor_invalido).fillna(valor_invalido)
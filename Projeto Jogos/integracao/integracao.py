@@ -1,13 +1,21 @@
+import atexit
+import itertools
 import json
+import os
+import sys
 import pandas as pd
-import requests
 from sqlalchemy import create_engine, Column, Integer, String, Date, Text, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import logging
 import datetime
 import time
-import re
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comum.cache_mercado_livre import CATEGORIA_JOGOS, CacheMercadoLivre, buscar_anuncios
+from comum.exportacao import exportar_tabela
+from comum.filtro_titulos import FiltroTitulos
+from comum.validacao import eh_email_valido, interpretar_datas
 
 # Configuração do logger
 logging.basicConfig(filename='integracao/Log_erros.log', level=logging.INFO, format='%(asctime)s - %(message)s')
@@ -43,7 +51,7 @@ def validar_nome(nome):
 
 def validar_email(email):
     """Valida o email do usuário."""
-    if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
+    if not eh_email_valido(email):
         raise ValidationError("E-mail inválido.")
     return email
 
@@ -89,7 +97,12 @@ class ErroPesquisa(Exception):
 def converter_datas(df, colunas_data):
     """Converte colunas de datas para o formato datetime."""
     for coluna in colunas_data:
-        df[coluna] = pd.to_datetime(df[coluna], errors='coerce')  # Converte datas e deixa inválidas como NaT (Not a Time)
+        datas = interpretar_datas(df[coluna])  # Aceita os mesmos formatos do Q2
+        restantes = datas.isna()
+        if restantes.any():
+            # Timestamps com hora e outros formatos reconhecidos pelo pd.to_datetime continuam aceitos; o resto vira NaT
+            datas = datas.where(~restantes, pd.to_datetime(df.loc[restantes, coluna], errors='coerce'))
+        df[coluna] = datas
     return df
 
 # Define a função para atualizar o mapeamento
@@ -292,27 +305,46 @@ def visualizar_cadastros():
     except Exception as e:
         print(f"Erro ao visualizar cadastros: {e}")
 
+def blocos_usuarios(tamanho_bloco=5000):
+    """Percorre os usuários cadastrados em blocos de DataFrames, sem carregar todos de uma vez."""
+    consulta = session.query(
+        Usuario.id.label("ID"),
+        Usuario.nome_completo.label("Nome"),
+        Usuario.email.label("Email"),
+        Usuario.data_nascimento.label("Data de Nascimento"),
+        Usuario.cidade.label("Cidade"),
+        Usuario.estado.label("Estado"),
+        Usuario.consoles.label("Consoles"),
+        Usuario.jogos_preferidos.label("Jogos Preferidos")
+    ).order_by(Usuario.id).yield_per(tamanho_bloco)
+    colunas = [coluna['name'] for coluna in consulta.column_descriptions]
+    linhas = iter(consulta)
+    while True:
+        bloco = [tuple(linha) for linha in itertools.islice(linhas, tamanho_bloco)]
+        if not bloco:
+            return
+        yield pd.DataFrame(bloco, columns=colunas)
+
 def consolidar_dados_para_xlsx():
     """Consolida os dados dos usuários em um arquivo XLSX."""
     try:
-        usuarios = session.query(Usuario).all()
-        dados = [{
-            "ID": usuario.id,
-            "Nome": usuario.nome_completo,
-            "Email": usuario.email,
-            "Data de Nascimento": usuario.data_nascimento,
-            "Cidade": usuario.cidade,
-            "Estado": usuario.estado,
-            "Consoles": usuario.consoles,
-            "Jogos Preferidos": usuario.jogos_preferidos
-        } for usuario in usuarios]
-
-        df = pd.DataFrame(dados)
-        df.to_excel('usuarios_consolidados.xlsx', index=False)
-        print("Dados consolidados exportados para usuarios_consolidados.xlsx")
+        total = session.query(Usuario).count()
+        resultado = exportar_tabela(blocos_usuarios(), 'usuarios_consolidados.xlsx', total_linhas=total)
+        print(f"Dados consolidados exportados para {resultado['arquivo']} "
+              f"({resultado['linhas']} linhas, {resultado['linhas_por_segundo']:.0f} linhas/s)")
     except Exception as e:
         print(f"Erro ao consolidar dados: {e}")
 
+_cache_mercado_livre = None
+
+def obter_cache_mercado_livre():
+    """Cache das buscas no Mercado Livre, o mesmo usado pelo Q4, aberto na primeira chamada e fechado na saída."""
+    global _cache_mercado_livre
+    if _cache_mercado_livre is None:
+        _cache_mercado_livre = CacheMercadoLivre()
+        atexit.register(_cache_mercado_livre.fechar)
+    return _cache_mercado_livre
+
 def mostrar_precos_jogos_preferidos():
     """Mostra os preços dos jogos preferidos de um usuário usando a API do Mercado Livre."""
     try:
@@ -323,15 +355,18 @@ def mostrar_precos_jogos_preferidos():
             return
 
         jogos = usuario.jogos_preferidos.split('|')
+        cache = obter_cache_mercado_livre()
         for jogo in jogos:
-            response = requests.get(f'https://api.mercadolibre.com/sites/MLB/search?q={jogo}')
-            results = response.json()['results']
+            revalidacoes = cache.revalidacoes
+            dados, em_cache = buscar_anuncios(jogo, cache=cache)
+            results = dados['results']
             if results:
                 menor_preco = min(item['price'] for item in results)
                 print(f"Menor preço para {jogo}: R${menor_preco}")
             else:
                 print(f"Jogo {jogo} não encontrado no Mercado Livre.")
-            time.sleep(1)  # Respeitar o limite de taxa da API
+            if not em_cache or cache.revalidacoes > revalidacoes:
+                time.sleep(1)  # Respeitar o limite de taxa da API
     except ValueError as ve:
         print(f"Erro de valor: {ve}")
     except Exception as e:
@@ -343,26 +378,11 @@ def pesquisar_jogos():
         nome_jogo = input("Nome do jogo: ")
         menor_preco = float('inf')
         link_menor_preco = ""
-        consoles = ["Playstation 4", "Playstation 5", "PS4", "PS5", "Xbox 360", "Xbox Series S", "Xbox Series X", "Nintendo Switch"]
-        lista_negra = ["Amiibo"]
-        palavras_nome_jogo = nome_jogo.lower().split()
-        url = f"https://api.mercadolibre.com/sites/MLB/search?category=MLB186456&q={nome_jogo}"
-        resposta = requests.get(url)
-        resposta.raise_for_status()  # Levanta um HTTPError para respostas ruins
-        dados = resposta.json()
+        dados, _ = buscar_anuncios(nome_jogo, CATEGORIA_JOGOS, obter_cache_mercado_livre())  # Levanta um HTTPError para respostas ruins
         resultados = dados.get('results', [])
 
         # Filtrar resultados
-        resultados_validos = [
-            {'nome': item['title'], 'preco': item['price'], 'permalink': item['permalink']}
-            for item in resultados if 'permalink' in item and item['permalink']
-            and (
-                item['title'].lower().startswith('jogo')
-                or any(console.lower() in item['title'].lower() for console in consoles)
-            )
-            and not any(termo.lower() in item['title'].lower() for termo in lista_negra)
-            and all(palavra in item['title'].lower() for palavra in palavras_nome_jogo)  # Verifica se todas as palavras do jogo estão presentes no título
-        ]
+        resultados_validos = FiltroTitulos(nome_jogo).filtrar(resultados)
         # Itera pelos resultados para encontrar o menor preço e seu link
         for item in resultados_validos:
             preco = item['preco']
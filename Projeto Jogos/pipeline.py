@@ -0,0 +1,76 @@
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.extend([os.path.join(RAIZ, 'Q2'), os.path.join(RAIZ, 'Q3')])
+
+import at2  # noqa: E402
+import at3  # noqa: E402
+
+# Executa Q2 e Q3 no mesmo processo: o DataFrame consolidado pelo Q2 é passado
+# direto para a análise do Q3, sem gravar e reler a planilha Excel. O arquivo de
+# intercâmbio e o Excel só são gravados quando pedidos.
+
+def executar_pipeline(caminho_banco_dados='Q4/analise_jogos.db', paralelo=False, cache=None, deduplicar=False,
+                      incremental=False, coocorrencia=None, intercambio=None, excel=None):
+    """
+    Consolida os dados de usuários (Q2) e analisa os jogos preferidos (Q3) em memória.
+
+    Args:
+        caminho_banco_dados (str, optional): Banco SQLite gravado pelo Q3.
+        paralelo (bool, optional): Lê e limpa cada fonte em um processo separado.
+        cache (CacheLimpeza, optional): Cache de DataFrames limpos do Q2.
+        deduplicar (bool, optional): Reúne usuários quase duplicados antes de consolidar.
+        incremental (bool, optional): Grava no banco apenas os usuários que mudaram.
+        coocorrencia (int, optional): Grava também os K jogos mais mencionados junto com cada jogo.
+        intercambio (str, optional): Se informado, grava também o arquivo de intercâmbio (.arrow/.parquet).
+        excel (str, optional): Se informado, grava também o relatório Excel.
+
+    Returns:
+        tuple: (DataFrame consolidado, resultado de `at3.analisar_jogos`), ou (None, None) em caso de erro.
+    """
+    inicio = time.perf_counter()
+    try:
+        df = at2.obter_dados_consolidados(paralelo=paralelo, cache=cache, deduplicar=deduplicar)
+        if intercambio:
+            at2.exportar_intercambio(df, intercambio)
+        if excel:
+            at2.exportar_para_excel(df, excel)
+    except (at2.ErroLeituraArquivo, at2.ErroValidacaoDados, at2.ErroExportacaoDados) as e:
+        print(e)
+        return None, None
+    print(f"{len(df)} usuários consolidados em {time.perf_counter() - inicio:.2f}s")
+
+    resultado = at3.processar_dados(df, caminho_banco_dados, incremental, coocorrencia)
+    print(f"Pipeline concluído em {time.perf_counter() - inicio:.2f}s")
+    return df, resultado
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consolida os dados de usuários e analisa os jogos preferidos.")
+    parser.add_argument('--paralelo', action='store_true',
+                        help="Lê e limpa cada arquivo do Q2 em um processo separado.")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="Não usa o cache de DataFrames limpos do Q2.")
+    parser.add_argument('--deduplicar', action='store_true',
+                        help="Reúne usuários com nomes quase iguais ou o mesmo email antes de consolidar.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Atualiza o banco apenas com os usuários adicionados, removidos ou alterados.")
+    parser.add_argument('--coocorrencia', type=int, default=None, metavar='K',
+                        help="Grava também os K jogos mais mencionados junto com cada jogo.")
+    parser.add_argument('--intercambio', nargs='?', const=at2.CAMINHO_INTERCAMBIO, default=None, metavar='ARQUIVO',
+                        help="Grava também o arquivo de intercâmbio lido pelo Q3.")
+    parser.add_argument('--excel', nargs='?', const=at2.CAMINHO_EXCEL_CONSOLIDADO, default=None, metavar='ARQUIVO',
+                        help="Grava também o relatório Excel lido pelo Q3.")
+    args = parser.parse_args()
+
+    executar_pipeline(
+        paralelo=args.paralelo,
+        cache=None if args.sem_cache else at2.CacheLimpeza(),
+        deduplicar=args.deduplicar,
+        incremental=args.incremental,
+        coocorrencia=args.coocorrencia,
+        intercambio=args.intercambio,
+        excel=args.excel,
+    )
@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Os módulos de cada mini-projeto importam uns aos outros pelo nome (at3 importa
+# incidencia, atq1 importa cache_http...), então as pastas entram no sys.path
+# como quando os scripts são executados a partir da pasta "Projeto Jogos".
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ] + [os.path.join(RAIZ, pasta) for pasta in ('Q1', 'Q2', 'Q3', 'Q4')]
+
+PASTA_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados')
+
+
+class ServidorLocal:
+    """
+    Servidor HTTP em uma porta livre de 127.0.0.1 para os testes.
+
+    Cada rota em `rotas` é uma função que recebe os cabeçalhos da requisição e
+    devolve (status, cabeçalhos, corpo); os caminhos sem rota própria vão para
+    `rota_padrao`, se definida, que recebe também o caminho com a query string.
+    As requisições atendidas ficam em
+    `requisicoes`, como (caminho, cabeçalhos recebidos, status), e
+    `simultaneas_max` guarda o maior número de requisições atendidas ao mesmo tempo.
+    """
+
+    def __init__(self):
+        self.rotas = {}
+        self.rota_padrao = None
+        self.requisicoes = []
+        self.simultaneas = 0
+        self.simultaneas_max = 0
+        self._trava = threading.Lock()
+        servidor = self
+
+        class Tratador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with servidor._trava:
+                    servidor.simultaneas += 1
+                    servidor.simultaneas_max = max(servidor.simultaneas_max, servidor.simultaneas)
+                try:
+                    rota = servidor.rotas.get(self.path)
+                    if rota is not None:
+                        status, cabecalhos, corpo = rota(self.headers)
+                    elif servidor.rota_padrao is not None:
+                        status, cabecalhos, corpo = servidor.rota_padrao(self.path, self.headers)
+                    else:
+                        status, cabecalhos, corpo = 404, {}, b'nao encontrado'
+                    with servidor._trava:
+                        servidor.requisicoes.append((self.path, dict(self.headers), status))
+                    self.send_response(status)
+                    for nome, valor in cabecalhos.items():
+                        self.send_header(nome, valor)
+                    self.send_header('Content-Length', str(len(corpo)))
+                    self.end_headers()
+                    self.wfile.write(corpo)
+                finally:
+                    with servidor._trava:
+                        servidor.simultaneas -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self._http = ThreadingHTTPServer(('127.0.0.1', 0), Tratador)
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, caminho):
+        return f"http://127.0.0.1:{self._http.server_address[1]}{caminho}"
+
+    def status_de(self, caminho):
+        """Status das respostas já enviadas para o caminho, em ordem."""
+        with self._trava:
+            return [status for rota, _, status in self.requisicoes if rota == caminho]
+
+    def encerrar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+
+def pagina_html(titulo, linhas=12, atraso=0.0):
+    """Rota que devolve uma página com uma wikitable de `linhas` jogos, depois de esperar `atraso` segundos."""
+    corpo = (
+        f'<html><body><h1>{titulo}</h1><table class="wikitable"><tr><th>Título</th><th>Ano</th></tr>'
+        + ''.join(f'<tr><td>{titulo} {i}</td><td>{2000 + i}</td></tr>' for i in range(linhas))
+        + '</table></body></html>'
+    ).encode('utf-8')
+
+    def rota(cabecalhos):
+        if atraso:
+            time.sleep(atraso)
+        return 200, {'Content-Type': 'text/html; charset=utf-8'}, corpo
+
+    return rota
+
+
+@pytest.fixture
+def servidor_http():
+    servidor = ServidorLocal()
+    yield servidor
+    servidor.encerrar()
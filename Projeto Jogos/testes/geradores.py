@@ -0,0 +1,125 @@
+import datetime
+import itertools
+import random
+
+import pandas as pd
+
+from at2 import limpar_e_consolidar_dados
+from comum.filtro_titulos import CONSOLES, LISTA_NEGRA
+from comum.texto import remover_acentos
+
+# Dados sintéticos dos testes. Os benchmarks têm geradores próprios, com mais
+# opções de tamanho, e os testes não dependem deles.
+
+
+def gerar_fontes(usuarios, fontes=3, semente=42):
+    """Gera `fontes` DataFrames limpos com usuários repetidos e emails/datas inválidos misturados."""
+    aleatorio = random.Random(semente)
+    jogos = [f"Jogo {i}" for i in range(200)]
+    dfs = []
+    for fonte in range(fontes):
+        linhas = []
+        for i in aleatorio.sample(range(usuarios), k=int(usuarios * 0.7)):
+            linhas.append({
+                'id': i,
+                'nome_completo': f"Usuário {i}",
+                'data_nascimento': aleatorio.choice(['1990-01-15', '15-01-1990', '15/01/1990', '1990-02-30']),
+                'email': aleatorio.choice([f"usuario{i}@example.com", f"usuario{i}@example",
+                                           f"fonte{fonte}.{i}@example.org"]),
+                'cidade': aleatorio.choice(['São Paulo', 'Recife', None]),
+                'estado': aleatorio.choice(['SP', 'RJ', 'MG', 'BA', 'PR', None]),
+                'consoles': 'PS5|Switch',
+                'jogos_preferidos': '|'.join(aleatorio.sample(jogos, k=5)),
+            })
+        dfs.append(limpar_e_consolidar_dados(pd.DataFrame(linhas)))
+    return dfs
+
+
+NOMES = ['João', 'Maria', 'Pedro', 'Ana', 'Lucas', 'Júlia', 'Gabriel', 'Letícia', 'Mateus', 'Beatriz',
+         'Rafael', 'Larissa', 'Felipe', 'Camila', 'Gustavo', 'Fernanda', 'André', 'Patrícia']
+SOBRENOMES = ['Silva', 'Souza', 'Oliveira', 'Costa', 'Pereira', 'Lima', 'Gonçalves', 'Araújo',
+              'Ribeiro', 'Almeida', 'Conceição', 'Fernandes', 'Rocha', 'Magalhães', 'Assunção']
+
+
+def variar_nome(nome, aleatorio):
+    """Aplica uma perturbação típica de cadastro ao nome."""
+    variacao = aleatorio.choice(['acentos', 'espacos', 'caixa', 'digitacao'])
+    if variacao == 'acentos':
+        return remover_acentos(nome)
+    if variacao == 'espacos':
+        return nome.replace(' ', '  ', 1) + ' '
+    if variacao == 'caixa':
+        return nome.upper()
+    posicao = aleatorio.randrange(1, len(nome) - 1)
+    return nome[:posicao] + nome[posicao + 1:]
+
+
+def gerar_usuarios_com_duplicatas(quantidade, proporcao_duplicatas=0.2, semente=42):
+    """
+    Gera usuários limpos em que parte aparece duas vezes, com o nome alterado ou outro email.
+
+    Returns:
+        tuple: (DataFrame limpo, usuário real de cada linha).
+    """
+    aleatorio = random.Random(semente)
+    linhas = []
+    entidades = []
+    for i in range(quantidade):
+        nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)} {i}"
+        email = f"usuario{i}@example.com"
+        nascimento = (datetime.date(1960, 1, 1) + datetime.timedelta(days=aleatorio.randrange(18_000))).isoformat()
+        linhas.append({'nome_completo': nome, 'email': email, 'data_nascimento': nascimento})
+        entidades.append(i)
+        if aleatorio.random() < proporcao_duplicatas:
+            if aleatorio.random() < 0.5:
+                linhas.append({'nome_completo': variar_nome(nome, aleatorio), 'email': f"outro{i}@example.org",
+                               'data_nascimento': nascimento})
+            else:
+                linhas.append({'nome_completo': f"{aleatorio.choice(NOMES)} {i}", 'email': email,
+                               'data_nascimento': nascimento})
+            entidades.append(i)
+
+    ordem = list(range(len(linhas)))
+    aleatorio.shuffle(ordem)
+    df = pd.DataFrame([linhas[i] for i in ordem])
+    for coluna in ['cidade', 'estado', 'consoles', 'jogos_preferidos']:
+        df[coluna] = None
+    return limpar_e_consolidar_dados(df), [entidades[i] for i in ordem]
+
+
+def gerar_jogos_preferidos(usuarios, jogos, maximo_por_usuario=6, semente=42):
+    """Jogos preferidos de cada usuário, separados por '|', com popularidade em lei de Zipf."""
+    aleatorio = random.Random(semente)
+    titulos = [f"Jogo {i}" for i in range(jogos)]
+    pesos_acumulados = list(itertools.accumulate(1 / (i + 1) for i in range(jogos)))
+    return [
+        '|'.join(aleatorio.choices(titulos, cum_weights=pesos_acumulados, k=aleatorio.randint(1, maximo_por_usuario)))
+        for _ in range(usuarios)
+    ]
+
+
+JOGOS_ANUNCIOS = ["The Witcher 3", "God of War", "Fifa", "Mario Kart 8", "Red Dead Redemption 2", "Spider-Man"]
+EXTRAS_ANUNCIOS = ["Mídia Física", "Original", "Lacrado", "Usado", "Edição Completa", "Goty", "Novo", "Envio Imediato"]
+
+
+def gerar_anuncios(quantidade, semente=42):
+    """Itens de 'results' da busca do Mercado Livre, com consoles, termos da lista negra e palavras coladas."""
+    aleatorio = random.Random(semente)
+    anuncios = []
+    for i in range(quantidade):
+        partes = [aleatorio.choice(JOGOS_ANUNCIOS)]
+        if aleatorio.random() < 0.3:
+            partes.insert(0, "Jogo")
+        if aleatorio.random() < 0.7:
+            partes.append(aleatorio.choice(CONSOLES))
+        if aleatorio.random() < 0.05:
+            partes.append(aleatorio.choice(LISTA_NEGRA))
+        if aleatorio.random() < 0.1:
+            partes[-1] += str(aleatorio.randint(19, 24))  # palavra colada, como "PS5" + "23"
+        partes.extend(aleatorio.sample(EXTRAS_ANUNCIOS, aleatorio.randint(0, 3)))
+        anuncios.append({
+            'title': ' '.join(partes),
+            'price': round(aleatorio.uniform(50, 400), 2),
+            'permalink': f"https://produto.mercadolivre.com.br/MLB-{i}" if aleatorio.random() > 0.02 else None,
+        })
+    return anuncios
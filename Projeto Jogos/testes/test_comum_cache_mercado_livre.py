@@ -0,0 +1,152 @@
+import importlib
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('requests')
+
+from comum.cache_mercado_livre import CATEGORIA_JOGOS, CacheMercadoLivre  # noqa: E402
+
+INTERVALO = 0.2
+
+
+def resposta(titulo):
+    return {'results': [{'title': titulo, 'price': 100.0, 'permalink': f'http://exemplo/{titulo}'}]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    # ttl=0: toda entrada salva já nasce obsoleta, mas dentro da janela
+    cache = CacheMercadoLivre(str(tmp_path / 'cache.db'), ttl=0, intervalo_revalidacao=INTERVALO,
+                              revalidacoes_pendentes=3)
+    yield cache
+    cache.fechar()
+
+
+class Consultas:
+    """Registra o instante e a simultaneidade das consultas feitas pelas revalidações."""
+
+    def __init__(self, falhar=()):
+        self.trava = threading.Lock()
+        self.instantes = []
+        self.ativas = 0
+        self.simultaneas_max = 0
+        self.falhar = set(falhar)
+
+    def __call__(self, consulta):
+        def obter():
+            with self.trava:
+                self.ativas += 1
+                self.simultaneas_max = max(self.simultaneas_max, self.ativas)
+                self.instantes.append(time.monotonic())
+            time.sleep(0.02)
+            with self.trava:
+                self.ativas -= 1
+            if consulta in self.falhar:
+                raise RuntimeError('API fora do ar')
+            return resposta(f'{consulta} novo')
+        return obter
+
+
+def test_revalidacoes_em_um_trabalhador_com_intervalo_e_limite(cache):
+    consultas = Consultas()
+    for i in range(5):
+        cache.salvar(f'jogo{i}', CATEGORIA_JOGOS, resposta(f'jogo{i} antigo'))
+
+    for i in range(5):
+        dados, em_cache = cache.buscar(f'jogo{i}', CATEGORIA_JOGOS, consultas(f'jogo{i}'))
+        assert em_cache and dados == resposta(f'jogo{i} antigo')
+    # A mesma consulta não é agendada de novo enquanto estiver pendente
+    cache.buscar('jogo0', CATEGORIA_JOGOS, consultas('jogo0'))
+
+    assert cache.aguardar_revalidacoes(timeout=10)
+    assert cache.revalidacoes == 3
+    assert len(consultas.instantes) == 3
+    assert consultas.simultaneas_max == 1
+    intervalos = [b - a for a, b in zip(consultas.instantes, consultas.instantes[1:])]
+    assert min(intervalos) >= INTERVALO * 0.95
+    assert [cache.obter(f'jogo{i}', CATEGORIA_JOGOS)[0] for i in range(4)] == [
+        resposta('jogo0 novo'), resposta('jogo1 novo'), resposta('jogo2 novo'), resposta('jogo3 antigo'),
+    ]
+
+
+def test_erro_na_revalidacao_mantem_a_resposta_antiga(cache):
+    cache.salvar('jogo', CATEGORIA_JOGOS, resposta('jogo antigo'))
+
+    cache.buscar('jogo', CATEGORIA_JOGOS, Consultas(falhar={'jogo'})('jogo'))
+
+    assert cache.aguardar_revalidacoes(timeout=10)
+    assert cache.obter('jogo', CATEGORIA_JOGOS)[0] == resposta('jogo antigo')
+
+
+def test_fechar_descarta_revalidacoes_depois_do_prazo(tmp_path):
+    cache = CacheMercadoLivre(str(tmp_path / 'cache.db'), ttl=0, intervalo_revalidacao=0)
+    liberar = threading.Event()
+    chamadas = []
+
+    def travada(consulta):
+        def obter():
+            chamadas.append(consulta)
+            liberar.wait(10)
+            return resposta(f'{consulta} novo')
+        return obter
+
+    for i in range(3):
+        cache.salvar(f'jogo{i}', CATEGORIA_JOGOS, resposta(f'jogo{i} antigo'))
+        cache.buscar(f'jogo{i}', CATEGORIA_JOGOS, travada(f'jogo{i}'))
+
+    inicio = time.monotonic()
+    cache.fechar(timeout=0.3)
+    assert time.monotonic() - inicio < 2
+    liberar.set()
+    time.sleep(0.1)
+    assert chamadas == ['jogo0']  # as que ainda estavam na fila foram descartadas
+
+
+def test_integracao_fecha_o_cache_na_saida(tmp_path, monkeypatch):
+    pytest.importorskip('sqlalchemy')
+    (tmp_path / 'integracao').mkdir()
+    monkeypatch.chdir(tmp_path)
+    integracao = importlib.import_module('integracao.integracao')
+    registradas = []
+    monkeypatch.setattr(integracao.atexit, 'register', registradas.append)
+    monkeypatch.setattr(integracao, '_cache_mercado_livre', None)
+    monkeypatch.setattr(integracao, 'CacheMercadoLivre',
+                        lambda: CacheMercadoLivre(str(tmp_path / 'cache.db')))
+
+    cache = integracao.obter_cache_mercado_livre()
+
+    assert integracao.obter_cache_mercado_livre() is cache
+    assert registradas == [cache.fechar]
+    cache.fechar()
+
+
+def test_consulta_async_revalida_obsoletas_pelo_limitador(cache, servidor_http, monkeypatch):
+    at4 = pytest.importorskip('at4')
+    pytest.importorskip('aiohttp')
+    consultadas = []
+
+    def api(caminho, cabecalhos):
+        consulta = parse_qs(urlparse(caminho).query)['q'][0]
+        consultadas.append(consulta)
+        if consulta == 'quebrado':
+            return 404, {'Content-Type': 'application/json'}, b'{}'
+        corpo = resposta(f'Jogo {consulta} PS5')
+        return 200, {'Content-Type': 'application/json'}, json.dumps(corpo).encode('utf-8')
+
+    servidor_http.rota_padrao = api
+    monkeypatch.setattr(at4, 'URL_BUSCA', servidor_http.url('/sites/MLB/search'))
+    cache.salvar('zelda', CATEGORIA_JOGOS, resposta('Jogo zelda antigo PS5'))
+    cache.salvar('quebrado', CATEGORIA_JOGOS, resposta('Jogo quebrado antigo PS5'))
+
+    resultados = dict(at4.consultar_jogos_async(['zelda', 'quebrado', 'mario'], taxa=20.0, rajada=2,
+                                                concorrencia=2, cache=cache))
+
+    assert sorted(consultadas) == ['mario', 'quebrado', 'zelda']
+    assert cache.revalidacoes == 0  # nada passou pelo trabalhador em segundo plano
+    assert [item['nome'] for item in resultados['zelda']] == ['Jogo zelda PS5']
+    assert [item['nome'] for item in resultados['quebrado']] == ['Jogo quebrado antigo PS5']
+    assert cache.obter('zelda', CATEGORIA_JOGOS)[0] == resposta('Jogo zelda PS5')
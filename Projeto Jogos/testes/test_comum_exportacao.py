@@ -0,0 +1,146 @@
+import datetime
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+
+import comum.exportacao as exportacao  # noqa: E402
+from comum.exportacao import _valor_celula, exportar_tabela  # noqa: E402
+
+
+def usuarios(inicio, quantidade):
+    return pd.DataFrame({
+        'nome': [f'Usuário {i}' for i in range(inicio, inicio + quantidade)],
+        'idade': list(range(inicio, inicio + quantidade)),
+        'nota': [i / 2 if i % 3 else np.nan for i in range(inicio, inicio + quantidade)],
+    })
+
+
+def em_blocos(total, tamanho):
+    for inicio in range(0, total, tamanho):
+        yield usuarios(inicio, min(tamanho, total - inicio))
+
+
+def test_xlsx_com_datas_e_ausentes(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    caminho = str(tmp_path / 'usuarios.xlsx')
+    df = pd.DataFrame({
+        'nome': ['Ana', 'Bia'],
+        'nota': [1.5, np.nan],
+        'cadastro': pd.to_datetime(['2024-01-02 03:04:05', None]),
+    })
+
+    resultado = exportar_tabela(df, caminho, tamanho_bloco=1)
+
+    assert resultado['arquivo'] == caminho and resultado['formato'] == 'xlsx' and resultado['linhas'] == 2
+    aba = openpyxl.load_workbook(caminho).active
+    assert [[celula.value for celula in linha] for linha in aba.iter_rows()] == [
+        ['nome', 'nota', 'cadastro'],
+        ['Ana', 1.5, datetime.datetime(2024, 1, 2, 3, 4, 5)],
+        ['Bia', None, None],
+    ]
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    (np.datetime64('2020-05-06T07:08:09'), datetime.datetime(2020, 5, 6, 7, 8, 9)),
+    (np.datetime64('2020-05-06T07:08:09.123456000', 'ns'), datetime.datetime(2020, 5, 6, 7, 8, 9, 123456)),
+    (np.datetime64('NaT'), None),
+    (np.timedelta64(90, 's'), datetime.timedelta(seconds=90)),
+    (np.int64(3), 3),
+    (np.float64('nan'), None),
+    (pd.NA, None),
+])
+def test_valor_celula(valor, esperado):
+    resultado = _valor_celula(valor)
+
+    assert resultado == esperado and type(resultado) is type(esperado)
+
+
+def test_csv_em_blocos(tmp_path):
+    caminho = str(tmp_path / 'usuarios.csv')
+
+    resultado = exportar_tabela(em_blocos(25, 10), caminho)
+
+    assert resultado['linhas'] == 25
+    pd.testing.assert_frame_equal(pd.read_csv(caminho), usuarios(0, 25))
+
+
+def test_dataframe_vazio_grava_o_cabecalho(tmp_path):
+    caminho = tmp_path / 'vazio.csv'
+
+    resultado = exportar_tabela(usuarios(0, 0), str(caminho))
+
+    assert resultado['linhas'] == 0
+    assert caminho.read_text(encoding='utf-8').splitlines() == ['nome,idade,nota']
+
+
+def test_parquet_em_blocos(tmp_path):
+    pytest.importorskip('pyarrow')
+    caminho = str(tmp_path / 'usuarios.parquet')
+
+    resultado = exportar_tabela(em_blocos(25, 10), caminho)
+
+    assert resultado['linhas'] == 25
+    pd.testing.assert_frame_equal(pd.read_parquet(caminho), usuarios(0, 25))
+
+
+def test_parquet_com_coluna_so_de_ausentes_no_primeiro_bloco(tmp_path):
+    pytest.importorskip('pyarrow')
+    caminho = str(tmp_path / 'usuarios.parquet')
+    blocos = [
+        pd.DataFrame({'nome': ['Ana', 'Bia'], 'email': [None, None]}),
+        pd.DataFrame({'nome': ['Caio'], 'email': ['caio@example.com']}),
+    ]
+
+    exportar_tabela(iter(blocos), caminho)
+
+    lido = pd.read_parquet(caminho)
+    assert lido['nome'].tolist() == ['Ana', 'Bia', 'Caio']
+    assert lido['email'].tolist()[2] == 'caio@example.com' and lido['email'].isna().tolist() == [True, True, False]
+
+
+def test_parquet_com_coluna_sempre_ausente_vira_texto(tmp_path, monkeypatch):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    monkeypatch.setattr(exportacao, 'LINHAS_INFERENCIA_PARQUET', 3)
+    caminho = str(tmp_path / 'usuarios.parquet')
+    blocos = [pd.DataFrame({'nome': [f'U{i}', f'V{i}'], 'email': [None, None]}) for i in range(3)]
+
+    resultado = exportar_tabela(iter(blocos + [pd.DataFrame({'nome': ['W'], 'email': ['w@example.com']})]), caminho)
+
+    assert resultado['linhas'] == 7
+    assert pq.read_schema(caminho).field('email').type == pa.string()
+    assert pd.read_parquet(caminho)['email'].tolist()[-1] == 'w@example.com'
+
+
+@pytest.mark.parametrize('alternativo', ['.csv', '.parquet'])
+@pytest.mark.parametrize('total_conhecido', [True, False])
+def test_acima_do_limite_grava_no_formato_alternativo(tmp_path, alternativo, total_conhecido):
+    if alternativo == '.parquet':
+        pytest.importorskip('pyarrow')
+    caminho = tmp_path / 'usuarios.xlsx'
+    dados = usuarios(0, 12) if total_conhecido else em_blocos(12, 5)
+
+    resultado = exportar_tabela(dados, str(caminho), limite_linhas_xlsx=10, formato_alternativo=alternativo)
+
+    esperado = tmp_path / f'usuarios{alternativo}'
+    assert resultado['arquivo'] == str(esperado) and resultado['formato'] == alternativo.lstrip('.')
+    assert not caminho.exists() and resultado['linhas'] == 12
+    lido = pd.read_csv(esperado) if alternativo == '.csv' else pd.read_parquet(esperado)
+    pd.testing.assert_frame_equal(lido, usuarios(0, 12))
+
+
+def test_no_limite_continua_em_xlsx(tmp_path):
+    pytest.importorskip('openpyxl')
+    caminho = tmp_path / 'usuarios.xlsx'
+
+    resultado = exportar_tabela(em_blocos(10, 4), str(caminho), limite_linhas_xlsx=10)
+
+    assert resultado['formato'] == 'xlsx' and caminho.exists()
+    pd.testing.assert_frame_equal(pd.read_excel(caminho), usuarios(0, 10))
+
+
+def test_formato_nao_suportado(tmp_path):
+    with pytest.raises(ValueError, match='.json'):
+        exportar_tabela(usuarios(0, 1), str(tmp_path / 'usuarios.json'))
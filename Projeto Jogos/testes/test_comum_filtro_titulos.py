@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from comum.filtro_titulos import CONSOLES, LISTA_NEGRA, FiltroTitulos  # noqa: E402
+from geradores import JOGOS_ANUNCIOS, gerar_anuncios  # noqa: E402
+
+
+def filtrar_original(resultados, nome_jogo):
+    """Compreensão de lista usada antes no Q4 e na integração."""
+    palavras_nome_jogo = nome_jogo.lower().split()
+    return [
+        {'nome': item['title'], 'preco': item['price'], 'permalink': item['permalink']}
+        for item in resultados if 'permalink' in item and item['permalink']
+        and (
+            item['title'].lower().startswith('jogo')
+            or any(console.lower() in item['title'].lower() for console in CONSOLES)
+        )
+        and not any(termo.lower() in item['title'].lower() for termo in LISTA_NEGRA)
+        and all(palavra in item['title'].lower() for palavra in palavras_nome_jogo)
+    ]
+
+
+def so_parte_de_palavra(titulo, nome_jogo):
+    """Indica se alguma palavra do jogo só aparece no título dentro de outra palavra."""
+    titulo = titulo.lower()
+    return any(
+        re.search(rf'(?<!\w){re.escape(palavra)}(?!\w)', titulo) is None
+        for palavra in nome_jogo.lower().split()
+    )
+
+
+@pytest.fixture(scope='module')
+def anuncios():
+    return gerar_anuncios(2_000, semente=7)
+
+
+@pytest.mark.parametrize('nome_jogo', JOGOS_ANUNCIOS)
+def test_filtro_so_difere_do_original_nas_palavras_inteiras(anuncios, nome_jogo):
+    antigo = filtrar_original(anuncios, nome_jogo)
+    novo = FiltroTitulos(nome_jogo).filtrar(anuncios)
+
+    links_novos = {item['permalink'] for item in novo}
+    assert links_novos <= {item['permalink'] for item in antigo}
+    descartados = [item['nome'] for item in antigo if item['permalink'] not in links_novos]
+    assert all(so_parte_de_palavra(titulo, nome_jogo) for titulo in descartados)
+
+
+@pytest.mark.parametrize('nome_jogo', JOGOS_ANUNCIOS)
+def test_mascara_vetorizada_igual_ao_filtro_por_item(anuncios, nome_jogo):
+    filtro = FiltroTitulos(nome_jogo)
+
+    vetorizado = filtro.filtrar_dataframe(pd.DataFrame(anuncios))
+
+    assert vetorizado.to_dict('records') == filtro.filtrar(anuncios)
+
+
+def test_titulos_com_quebra_de_linha_e_ausentes():
+    filtro = FiltroTitulos('God of War')
+    titulos = pd.Series(['Jogo God\nof War PS4', 'God of Warzone PS5', None, 'Jogo de War of God'])
+
+    assert [filtro.corresponde(titulo) for titulo in titulos[[0, 1, 3]]] == [True, False, True]
+    assert filtro.mascara(titulos).tolist() == [True, False, False, True]
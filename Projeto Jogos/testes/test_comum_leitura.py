@@ -0,0 +1,72 @@
+import io
+import json
+import random
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from comum.leitura import iterar_array_json, ler_csv_em_blocos, ler_json_em_blocos  # noqa: E402
+
+
+def ler_array(texto, tamanho_buffer):
+    return list(iterar_array_json(io.StringIO(texto), tamanho_buffer))
+
+
+@pytest.mark.parametrize('texto', ['[1 2]', '[,1]', '[1,,2]', '[1,]', '[1', '[1] 2', '', '[1x]'])
+def test_array_json_invalido(texto):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(texto)
+    for tamanho_buffer in (1, 1 << 16):
+        with pytest.raises(ValueError):
+            ler_array(texto, tamanho_buffer)
+
+
+def test_json_sem_array_no_nivel_superior():
+    with pytest.raises(ValueError):
+        ler_array('{"a": 1}', 1 << 16)
+
+
+def test_array_json_igual_ao_json_loads_com_qualquer_buffer():
+    aleatorio = random.Random(5)
+    for _ in range(200):
+        dados = [
+            aleatorio.choice([
+                aleatorio.random() * 10 ** aleatorio.randint(-8, 8), aleatorio.randint(-10 ** 9, 10 ** 9),
+                'São Paulo, SP', None, True, False, {'jogos': ['A', 'B'], 'nota': 2.5e-3}, [],
+            ])
+            for _ in range(aleatorio.randint(0, 20))
+        ]
+        texto = json.dumps(dados, indent=aleatorio.choice([None, 2]), ensure_ascii=False)
+        for tamanho_buffer in (1, 2, 3, 7, 1 << 16):
+            assert ler_array(texto, tamanho_buffer) == dados
+
+
+def test_json_em_blocos(tmp_path):
+    registros = [{'nome_completo': f'Usuário {i}', 'idade': i} for i in range(25)]
+    caminho = tmp_path / 'usuarios.json'
+    caminho.write_text(json.dumps(registros, ensure_ascii=False), encoding='utf-8')
+
+    blocos = list(ler_json_em_blocos(str(caminho), tamanho_bloco=10))
+
+    assert [len(bloco) for bloco in blocos] == [10, 10, 5]
+    pd.testing.assert_frame_equal(pd.concat(blocos), pd.DataFrame(registros))
+
+
+def test_csv_latin1_com_campos_de_varias_linhas(tmp_path):
+    # Campos entre aspas com quebras de linha e um byte latin1 depois do primeiro
+    # buffer do leitor do pandas: a decodificação em UTF-8 falha no meio da leitura
+    linhas = ['nome_completo,observacao']
+    for i in range(20_000):
+        linhas.append(f'Usuário {i},"linha 1\nlinha 2 do usuário {i}"')
+    linhas.append('José,"último"')
+    caminho = tmp_path / 'usuarios.csv'
+    conteudo = '\n'.join(linhas).replace('Usuário', 'Usuario').replace('usuário', 'usuario')
+    caminho.write_bytes(conteudo.encode('latin1'))
+
+    blocos = list(ler_csv_em_blocos(str(caminho), tamanho_bloco=3000))
+
+    esperado = pd.read_csv(caminho, encoding='latin1')
+    resultado = pd.concat(blocos)
+    pd.testing.assert_frame_equal(resultado, esperado)
+    assert resultado['nome_completo'].iloc[-1] == 'José'
@@ -0,0 +1,36 @@
+import sqlite3
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('sqlalchemy')
+
+from comum.sqlite_bulk import gravar_tabela  # noqa: E402
+
+
+def linhas_com_falha(df):
+    yield from df.itertuples(index=False, name=None)
+    raise sqlite3.OperationalError('falha simulada')
+
+
+def test_gravar_tabela_substitui_e_cria_indices(tmp_path):
+    caminho = str(tmp_path / 'dados.db')
+    gravar_tabela(pd.DataFrame({'nome': ['a;b', 'c'], 'preco': [1.5, 2.0]}), caminho, 'precos')
+    relatorio = gravar_tabela(pd.DataFrame({'nome': ['d'], 'preco': [3.0]}), caminho, 'precos', indices=['nome'])
+
+    assert relatorio['linhas'] == 1
+    with sqlite3.connect(caminho) as conn:
+        assert conn.execute("SELECT nome, preco FROM precos").fetchall() == [('d', 3.0)]
+        assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall() == [('idx_precos_nome',)]
+
+
+def test_falha_na_gravacao_mantem_a_tabela_anterior(tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'dados.db')
+    gravar_tabela(pd.DataFrame({'nome': ['antigo'], 'preco': [1.0]}), caminho, 'precos')
+
+    monkeypatch.setattr('comum.sqlite_bulk._linhas_dataframe', lambda df, tamanho_lote: linhas_com_falha(df))
+    with pytest.raises(sqlite3.OperationalError):
+        gravar_tabela(pd.DataFrame({'nome': ['novo'], 'outra': [2]}), caminho, 'precos')
+
+    with sqlite3.connect(caminho) as conn:
+        assert conn.execute("SELECT * FROM precos").fetchall() == [('antigo', 1.0)]
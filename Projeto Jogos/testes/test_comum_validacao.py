@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from comum.validacao import DATA_INVALIDA, interpretar_datas, normalizar_datas, validar_data  # noqa: E402
+
+DATAS = [
+    '2020-01-05', '05-01-2020', '05/01/2020', '1/2/2020', '2020-1-5', '29/02/2000',
+    '2020-02-30', '31/04/2021', '2020-13-01', ' 2020-01-05', '2020-01-05 ', '20200105',
+    '2020-01-05T00:00', '05.01.2020', '', 'lixo',
+    # Fora do intervalo do datetime64[ns] (1677-09-21 a 2262-04-11)
+    '1677-09-21', '2262-04-12', '1500-01-01', '31/12/9999', '0999-12-31', '0001-01-01', '01/01/0001',
+]
+
+
+def gerar_datas(quantidade, semente=7):
+    aleatorio = random.Random(semente)
+    formatos = ('{a:04d}-{m:02d}-{d:02d}', '{d:02d}-{m:02d}-{a:04d}', '{d}/{m}/{a}', '{a}-{m}-{d}')
+    return [
+        aleatorio.choice(formatos).format(a=aleatorio.randint(1, 9999), m=aleatorio.randint(0, 13),
+                                          d=aleatorio.randint(0, 32))
+        for _ in range(quantidade)
+    ]
+
+
+@pytest.mark.parametrize('data', DATAS)
+def test_normalizar_datas_igual_a_validar_data(data):
+    assert normalizar_datas(pd.Series([data])).tolist() == [validar_data(data)]
+
+
+def test_normalizar_datas_igual_a_validar_data_em_datas_aleatorias():
+    datas = gerar_datas(5000) + DATAS
+    esperado = [validar_data(data) for data in datas]
+
+    assert normalizar_datas(pd.Series(datas)).tolist() == esperado
+
+
+def test_valores_ausentes_e_indice_preservado():
+    datas = pd.Series(['2020-01-05', None, float('nan'), '1500-01-01'], index=[10, 20, 30, 40])
+
+    normalizadas = normalizar_datas(datas, valor_invalido='?')
+
+    assert normalizadas.index.tolist() == [10, 20, 30, 40]
+    assert normalizadas.tolist() == ['2020-01-05', '?', '?', '1500-01-01']
+    assert DATA_INVALIDA not in normalizadas.tolist()
+
+
+def test_interpretar_datas_nao_levanta_fora_do_intervalo():
+    convertidas = interpretar_datas(pd.Series(['1500-01-01', '05/01/2020']))
+
+    assert pd.api.types.is_datetime64_any_dtype(convertidas)
+    assert convertidas.iloc[1] == pd.Timestamp('2020-01-05')
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('bs4')
+
+from atq1 import RequisicaoError, extrair_tabelas  # noqa: E402
+from cache_http import CacheHTTP  # noqa: E402
+from conftest import pagina_html  # noqa: E402
+
+ETAG = '"v1"'
+LAST_MODIFIED = 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+
+def rota_condicional(cabecalhos_resposta):
+    """Página que responde 304 quando a requisição traz o ETag ou a data de modificação atuais."""
+    pagina = pagina_html('condicional')
+
+    def rota(cabecalhos):
+        if ('ETag' in cabecalhos_resposta and cabecalhos.get('If-None-Match') == ETAG) or \
+                ('Last-Modified' in cabecalhos_resposta and cabecalhos.get('If-Modified-Since') == LAST_MODIFIED):
+            return 304, {}, b''
+        status, cabecalhos_pagina, corpo = pagina(cabecalhos)
+        return status, {**cabecalhos_pagina, **cabecalhos_resposta}, corpo
+
+    return rota
+
+
+@pytest.mark.parametrize('cabecalhos_resposta', [
+    {'ETag': ETAG},
+    {'Last-Modified': LAST_MODIFIED},
+    {'ETag': ETAG, 'Last-Modified': LAST_MODIFIED},
+])
+def test_revalidacao_304_servida_pelo_cache(servidor_http, tmp_path, cabecalhos_resposta):
+    servidor_http.rotas['/pagina'] = rota_condicional(cabecalhos_resposta)
+    url = servidor_http.url('/pagina')
+
+    with CacheHTTP(caminho=str(tmp_path / 'cache.db'), max_idade=0) as cache:
+        primeira = extrair_tabelas(url, cache=cache)
+        segunda = extrair_tabelas(url, cache=cache)
+
+    assert servidor_http.status_de('/pagina') == [200, 304]
+    _, cabecalhos_enviados, _ = servidor_http.requisicoes[1]
+    if 'ETag' in cabecalhos_resposta:
+        assert cabecalhos_enviados['If-None-Match'] == ETAG
+    if 'Last-Modified' in cabecalhos_resposta:
+        assert cabecalhos_enviados['If-Modified-Since'] == LAST_MODIFIED
+    assert len(segunda) == 1
+    assert segunda[0].equals(primeira[0])
+
+
+def test_entrada_fresca_nao_gera_requisicao(servidor_http, tmp_path):
+    servidor_http.rotas['/pagina'] = rota_condicional({'ETag': ETAG})
+    url = servidor_http.url('/pagina')
+
+    with CacheHTTP(caminho=str(tmp_path / 'cache.db'), max_idade=3600) as cache:
+        extrair_tabelas(url, cache=cache)
+        extrair_tabelas(url, cache=cache)
+        assert len(extrair_tabelas(url, cache=cache, offline=True)) == 1
+        with pytest.raises(RequisicaoError):
+            extrair_tabelas(servidor_http.url('/outra'), cache=cache, offline=True)
+
+    assert servidor_http.status_de('/pagina') == [200]
+    assert servidor_http.status_de('/outra') == []
+
+
+def test_limite_de_tamanho_remove_a_entrada_usada_ha_mais_tempo(tmp_path):
+    corpo = b'x' * 1000
+    with CacheHTTP(caminho=str(tmp_path / 'cache.db'), tamanho_maximo=2500) as cache:
+        cache.salvar('a', corpo)
+        time.sleep(0.01)
+        cache.salvar('b', corpo)
+        time.sleep(0.01)
+        assert cache.obter('a') is not None  # "a" passa a ser a mais recente
+        time.sleep(0.01)
+        cache.salvar('c', corpo)
+
+        assert cache.obter('b') is None
+        assert cache.obter('a') is not None
+        assert cache.obter('c') is not None
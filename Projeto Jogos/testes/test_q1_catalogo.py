@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+import catalogo  # noqa: E402
+from catalogo import buscar_no_catalogo, construir_catalogo  # noqa: E402
+
+
+def tabelas(*titulos):
+    return [pd.DataFrame({'Título': list(titulos), 'Ano': ['2020'] * len(titulos)})]
+
+
+def test_catalogo_unifica_titulos_entre_consoles(tmp_path):
+    caminho = str(tmp_path / 'catalogo.db')
+    total = construir_catalogo({
+        'PlayStation_5': tabelas('The Witcher 3', 'Astro Bot'),
+        'Xbox_Series_X_e_Series_S': tabelas('The  Witcher 3 '),
+    }, caminho)
+
+    assert total == 2
+    assert buscar_no_catalogo('the witcher 3', caminho) == (
+        'The Witcher 3', ['PlayStation 5', 'Xbox Series X e Series S'])
+
+
+class ConexaoComFalha(sqlite3.Connection):
+    def executemany(self, sql, parametros):
+        if 'jogos_plataformas' in sql:
+            raise sqlite3.OperationalError('falha simulada')
+        return super().executemany(sql, parametros)
+
+
+def test_falha_na_reconstrucao_mantem_o_catalogo_anterior(tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'catalogo.db')
+    construir_catalogo({'PlayStation_5': tabelas('Astro Bot')}, caminho)
+
+    conectar = sqlite3.connect
+    monkeypatch.setattr(catalogo.sqlite3, 'connect', lambda caminho: conectar(caminho, factory=ConexaoComFalha))
+    with pytest.raises(sqlite3.OperationalError):
+        construir_catalogo({'PlayStation_5': tabelas('Outro Jogo')}, caminho)
+    monkeypatch.undo()
+
+    assert buscar_no_catalogo('astro bot', caminho) == ('Astro Bot', ['PlayStation 5'])
+    assert buscar_no_catalogo('outro jogo', caminho) is None
+    with sqlite3.connect(caminho) as conn:
+        assert conn.execute("SELECT titulo, plataformas FROM catalogo").fetchall() == [('Astro Bot', 'PlayStation 5')]
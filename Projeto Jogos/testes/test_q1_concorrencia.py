@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('bs4')
+
+from atq1 import RequisicaoError, extrair_tabelas_concorrente  # noqa: E402
+from conftest import pagina_html  # noqa: E402
+
+
+def test_paginas_baixadas_em_paralelo_e_entregues_ao_ficarem_prontas(servidor_http):
+    atrasos = {'/lenta': 0.6, '/media': 0.3, '/rapida': 0.0}
+    for caminho, atraso in atrasos.items():
+        servidor_http.rotas[caminho] = pagina_html(caminho.strip('/'), atraso=atraso)
+    urls = [servidor_http.url(caminho) for caminho in atrasos]
+
+    inicio = time.perf_counter()
+    resultados = list(extrair_tabelas_concorrente(urls, max_workers=3))
+    duracao = time.perf_counter() - inicio
+
+    # Ordem de conclusão, não de submissão
+    assert [url for url, _, _ in resultados] == [servidor_http.url(c) for c in ('/rapida', '/media', '/lenta')]
+    assert all(erro is None and len(tabelas) == 1 for _, tabelas, erro in resultados)
+    assert servidor_http.simultaneas_max >= 2
+    assert duracao < sum(atrasos.values())
+
+
+def test_limite_de_workers_respeitado(servidor_http):
+    urls = []
+    for i in range(6):
+        servidor_http.rotas[f'/p{i}'] = pagina_html(f'p{i}', atraso=0.1)
+        urls.append(servidor_http.url(f'/p{i}'))
+
+    resultados = list(extrair_tabelas_concorrente(urls, max_workers=2))
+
+    assert sorted(url for url, _, _ in resultados) == sorted(urls)
+    assert servidor_http.simultaneas_max == 2
+
+
+def test_erro_de_uma_pagina_nao_interrompe_as_demais(servidor_http):
+    servidor_http.rotas['/ok'] = pagina_html('ok')
+    urls = [servidor_http.url('/inexistente'), servidor_http.url('/ok')]
+
+    resultados = {url: (tabelas, erro) for url, tabelas, erro in extrair_tabelas_concorrente(urls, max_workers=2)}
+
+    tabelas, erro = resultados[servidor_http.url('/inexistente')]
+    assert tabelas == [] and isinstance(erro, RequisicaoError)
+    assert erro.url == servidor_http.url('/inexistente')
+    tabelas, erro = resultados[servidor_http.url('/ok')]
+    assert erro is None and len(tabelas[0]) == 12
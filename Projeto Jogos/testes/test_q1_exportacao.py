@@ -0,0 +1,53 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('bs4')
+pytest.importorskip('openpyxl')
+pytest.importorskip('pyarrow')
+
+from atq1 import ESCRITORES, ExportacaoError, exportar_dados  # noqa: E402
+
+LEITORES = {
+    'csv': pd.read_csv,
+    'json': pd.read_json,
+    'xlsx': pd.read_excel,
+    'parquet': pd.read_parquet,
+    'feather': pd.read_feather,
+}
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    # exportar_dados grava em Q1/, relativo à pasta atual
+    (tmp_path / 'Q1').mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'Q1'
+
+
+def test_todos_os_formatos_voltam_aos_mesmos_dados(pasta, capsys):
+    df = pd.DataFrame({
+        'Título': ['Zelda', 'Fifa 23', 'Ação & Aventura'],
+        'Publicadora': pd.Categorical(['Nintendo', 'EA', 'Nintendo']),
+        'Ano': [2017, 2022, 2020],
+        'Nota': [9.5, 7.25, 8.0],
+    }, index=[3, 5, 9])
+
+    relatorio = exportar_dados(df, 'jogos', formatos=tuple(ESCRITORES))
+
+    assert set(relatorio) == set(ESCRITORES) == set(LEITORES)
+    saida = capsys.readouterr().out
+    esperado = df.reset_index(drop=True)
+    for formato, (segundos, tamanho) in relatorio.items():
+        arquivo = pasta / f'jogos{ESCRITORES[formato][0]}'
+        assert segundos >= 0 and tamanho == arquivo.stat().st_size > 0
+        assert f'Q1/jogos{ESCRITORES[formato][0]}' in saida
+        assert f'  {formato}: ' in saida
+        lido = LEITORES[formato](arquivo)
+        pd.testing.assert_frame_equal(lido, esperado, check_dtype=False, check_categorical=False,
+                                      obj=formato)
+
+
+def test_formato_desconhecido(pasta):
+    with pytest.raises(ExportacaoError, match='xml'):
+        exportar_dados(pd.DataFrame({'a': [1]}), 'jogos', formatos=('csv', 'xml'))
+    assert not list(pasta.iterdir())
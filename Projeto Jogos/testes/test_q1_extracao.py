@@ -0,0 +1,72 @@
+import importlib
+import os
+import pickle
+import sqlite3
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('bs4')
+pytest.importorskip('lxml')
+
+from atq1 import extrair_tabelas_legado  # noqa: E402
+from cache_http import CacheHTTP  # noqa: E402
+from conftest import PASTA_DADOS  # noqa: E402
+from extracao import VERSAO_EXTRACAO, extrair_tabelas_html  # noqa: E402
+
+# Página salva no formato das listas da Wikipédia: cabeçalho de duas linhas com
+# rowspan/colspan, <br> nas células, chaves de ordenação ocultas, notas de
+# rodapé, <thead>/<tfoot>, rowspan que entra no rodapé, separador de milhar e
+# uma wikitable pequena demais para ser aproveitada.
+with open(os.path.join(PASTA_DADOS, 'lista_jogos.html'), 'rb') as arquivo:
+    PAGINA = arquivo.read()
+
+
+def test_extracao_igual_ao_caminho_antigo():
+    legado = extrair_tabelas_legado(PAGINA)
+    novo = extrair_tabelas_html(PAGINA)
+
+    assert len(novo) == len(legado) == 2
+    for antigo, atual in zip(legado, novo):
+        pd.testing.assert_frame_equal(atual, antigo)
+
+
+def test_versao_do_pandas_nao_conferida_falha_na_importacao(monkeypatch):
+    import extracao
+
+    monkeypatch.setattr(pd, '__version__', '99.0.0')
+    with pytest.raises(ImportError, match='99.0.0'):
+        importlib.reload(extracao)
+    monkeypatch.undo()
+    importlib.reload(extracao)
+
+
+def test_texto_das_celulas():
+    jogos = extrair_tabelas_html(PAGINA)[0]
+
+    assert isinstance(jogos.columns, pd.MultiIndex)
+    primeira = jogos.iloc[0]
+    assert primeira.iloc[0] == 'Jogo 0: Edição & Mais'
+    assert primeira.iloc[1] == 'Corrida Corrida'  # <br> vira espaço
+    assert list(primeira.iloc[4:7]) == ['12 de novembro de 2020'] * 3  # sem a chave oculta
+
+
+def test_cache_ignora_tabelas_de_outra_versao_da_extracao(tmp_path):
+    caminho = str(tmp_path / 'cache.db')
+    tabelas = extrair_tabelas_html(PAGINA)
+
+    with CacheHTTP(caminho=caminho, versao_tabelas=VERSAO_EXTRACAO) as cache:
+        cache.salvar('pagina', PAGINA)
+        cache.salvar_tabelas('pagina', tabelas)
+        assert len(cache.obter('pagina')['tabelas']) == 2
+
+    with CacheHTTP(caminho=caminho, versao_tabelas='outra') as cache:
+        entrada = cache.obter('pagina')
+        assert entrada['tabelas'] is None
+        assert entrada['corpo'] == PAGINA
+
+    # Entradas gravadas antes da versão existir guardam só a lista de tabelas
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("UPDATE respostas SET tabelas = ?", (pickle.dumps(tabelas),))
+    with CacheHTTP(caminho=caminho, versao_tabelas=VERSAO_EXTRACAO) as cache:
+        assert cache.obter('pagina')['tabelas'] is None
@@ -0,0 +1,24 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from incremental import atualizar_incremental  # noqa: E402
+
+
+def test_falha_no_changelog_nao_perde_alteracoes(tmp_path):
+    caminho_db = str(tmp_path / 'snapshot.db')
+    df = pd.DataFrame({'Título': ['Jogo A', 'Jogo B'], 'Ano': ['2020', '2021']})
+
+    # Pasta inexistente: a gravação do changelog falha antes de o snapshot mudar
+    with pytest.raises(OSError):
+        atualizar_incremental(df, 'PS5', caminho_db, pasta=str(tmp_path / 'inexistente'))
+
+    resumo = atualizar_incremental(df, 'PS5', caminho_db, pasta=str(tmp_path))
+    assert resumo == {'inseridos': 2, 'atualizados': 0, 'removidos': 0}
+
+    df.loc[1, 'Ano'] = '2022'
+    resumo = atualizar_incremental(df.drop(index=0), 'PS5', caminho_db, pasta=str(tmp_path))
+    assert resumo == {'inseridos': 0, 'atualizados': 1, 'removidos': 1}
+
+    changelog = pd.read_csv(tmp_path / 'PS5_changelog.csv')
+    assert list(changelog['operacao']) == ['inserido', 'inserido', 'atualizado', 'removido']
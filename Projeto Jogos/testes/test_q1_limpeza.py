@@ -0,0 +1,44 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('bs4')
+
+from atq1 import compactar_dados, limpar_dados  # noqa: E402
+
+
+def test_limpar_dados_remove_espacos_das_colunas_de_texto():
+    df = pd.DataFrame({
+        'titulo': [' x ', 'Zelda  ', None, None],
+        'genero': ['\tAção', ' RPG', None, None],
+        'ano': [2020, 2021, 2022, None],
+    })
+
+    limpo, = limpar_dados([df])
+
+    assert limpo['titulo'].tolist() == ['x', 'Zelda', '']
+    assert limpo['genero'].tolist() == ['Ação', 'RPG', '']
+    assert limpo['ano'].tolist() == [2020, 2021, 2022]
+
+
+def test_limpar_dados_com_colunas_repetidas():
+    df = pd.DataFrame([[' a ', ' b '], [' c ', ' d ']], columns=['Lançamento', 'Lançamento'])
+
+    limpo, = limpar_dados([df])
+
+    assert limpo.values.tolist() == [['a', 'b'], ['c', 'd']]
+
+
+def test_compactar_dados_reduz_a_memoria():
+    df = pd.DataFrame({
+        'titulo': [f'Jogo número {i}' for i in range(2_000)],
+        'publicadora': [f'Publicadora {i % 5}' for i in range(2_000)],
+        'nota': [i % 10 for i in range(2_000)],
+    })
+
+    compactado, bytes_antes, bytes_depois = compactar_dados(df)
+
+    assert bytes_depois < bytes_antes
+    assert bytes_depois == int(compactado.memory_usage(deep=True).sum())
+    assert isinstance(compactado['publicadora'].dtype, pd.CategoricalDtype)
+    assert compactado['nota'].dtype == df['nota'].dtype
+    assert compactado.astype(str).equals(df.astype(str))
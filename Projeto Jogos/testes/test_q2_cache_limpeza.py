@@ -0,0 +1,54 @@
+import glob
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+
+from cache_limpeza import CacheLimpeza  # noqa: E402
+
+
+@pytest.fixture
+def origem(tmp_path):
+    caminho = tmp_path / 'usuarios.csv'
+    caminho.write_text('nome_completo\nAna\n', encoding='utf-8')
+    return str(caminho)
+
+
+def test_falha_seguida_de_salvar_le_o_conteudo_uma_vez(tmp_path, origem, monkeypatch):
+    cache = CacheLimpeza(pasta=str(tmp_path / 'cache'))
+    leituras = []
+    hash_original = CacheLimpeza._hash_conteudo
+    monkeypatch.setattr(CacheLimpeza, '_hash_conteudo', staticmethod(lambda c: leituras.append(c) or hash_original(c)))
+
+    assert cache.obter(origem, 1) is None
+    assert cache.salvar(origem, 1, pd.DataFrame({'nome_completo': ['Ana']}))
+    assert cache.obter(origem, 1) is not None
+    assert len(leituras) == 1
+
+
+def test_arquivo_alterado_invalida_a_entrada(tmp_path, origem):
+    cache = CacheLimpeza(pasta=str(tmp_path / 'cache'))
+    cache.salvar(origem, 1, pd.DataFrame({'nome_completo': ['Ana']}))
+
+    with open(origem, 'a', encoding='utf-8') as arquivo:
+        arquivo.write('Bia\n')
+
+    assert cache.obter(origem, 1) is None
+    assert cache.obter(origem, 2) is None
+
+
+def test_limite_ignora_entradas_removidas_por_outro_processo(tmp_path, origem, monkeypatch):
+    pasta = tmp_path / 'cache'
+    cache = CacheLimpeza(pasta=str(pasta), tamanho_maximo=0)
+    cache.salvar(origem, 1, pd.DataFrame({'nome_completo': ['Ana']}))
+
+    fantasma = str(pasta / 'removida-por-outro-processo.parquet')
+    glob_original = glob.glob
+    monkeypatch.setattr('cache_limpeza.glob.glob', lambda padrao: glob_original(padrao) + [fantasma])
+
+    cache._aplicar_limite()
+    cache.limpar()
+
+    assert os.listdir(pasta) == []
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+import at2  # noqa: E402
+from at2 import (  # noqa: E402
+    COLUNAS_CONSOLIDADAS, DATA_INVALIDA, EMAIL_INVALIDO, ErroLeituraArquivo, consolidar_dados, consolidar_em_blocos,
+    limpar_e_consolidar_dados
+)
+from geradores import gerar_fontes  # noqa: E402
+
+
+def consolidar_dados_referencia(dfs):
+    """Implementação anterior, com groupby().apply() e uma chamada Python por usuário."""
+    df_combinado = pd.concat(dfs, ignore_index=True)
+
+    def consolidar_linhas(grupo_dados):
+        email_valido = next(
+            (email for email, valido in zip(grupo_dados['email'], grupo_dados['email_valido']) if valido),
+            EMAIL_INVALIDO
+        )
+        data_valida = next((data for data in grupo_dados['data_nascimento'] if data != DATA_INVALIDA), DATA_INVALIDA)
+        return pd.Series({
+            'nome_completo': grupo_dados['nome_completo'].iloc[0],
+            'data_nascimento': data_valida,
+            'email': email_valido,
+            'cidade': grupo_dados['cidade'].iloc[0],
+            'estado': grupo_dados['estado'].iloc[0],
+            'consoles': grupo_dados['consoles'].iloc[0],
+            'jogos_preferidos': grupo_dados['jogos_preferidos'].iloc[0]
+        })
+
+    # A coluna de agrupamento é selecionada explicitamente: o pandas 3 não a entrega mais ao apply
+    colunas = COLUNAS_CONSOLIDADAS + ['email_valido']
+    return df_combinado.groupby('nome_completo')[colunas].apply(consolidar_linhas).reset_index(drop=True)
+
+
+def test_consolidacao_vetorizada_igual_a_groupby_apply():
+    dfs = gerar_fontes(2000, semente=3)
+
+    referencia = consolidar_dados_referencia(dfs)
+    vetorizado = consolidar_dados(dfs)
+
+    pd.testing.assert_frame_equal(
+        referencia[COLUNAS_CONSOLIDADAS].reset_index(drop=True),
+        vetorizado.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def gerar_brutos(linhas, semente=11):
+    aleatorio = random.Random(semente)
+    return pd.DataFrame({
+        'nome_completo': [aleatorio.choice([f'Usuário {aleatorio.randrange(linhas // 3)}', None])
+                          if aleatorio.random() < 0.02 else f'Usuário {aleatorio.randrange(linhas // 3)}'
+                          for _ in range(linhas)],
+        'data_nascimento': [aleatorio.choice(['1990-01-15', '15/01/1990', '1990-02-30', None]) for _ in range(linhas)],
+        'email': [aleatorio.choice(['a@example.com', 'b@example.org', 'invalido@', None]) for _ in range(linhas)],
+        'cidade': [aleatorio.choice(['Recife', 'Natal', None]) for _ in range(linhas)],
+        'estado': [aleatorio.choice(['PE', 'RN', None]) for _ in range(linhas)],
+        'consoles': [aleatorio.choice(['PS5', 'Switch|PS4', None]) for _ in range(linhas)],
+        'jogos_preferidos': [aleatorio.choice(['Jogo A', 'Jogo B|Jogo C', None]) for _ in range(linhas)],
+    })
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 7, 250, 5000])
+def test_consolidacao_em_blocos_igual_a_consolidacao_unica(tamanho_bloco):
+    brutos = gerar_brutos(3000)
+    blocos = (brutos.iloc[inicio:inicio + tamanho_bloco].copy() for inicio in range(0, len(brutos), tamanho_bloco))
+
+    em_blocos = consolidar_em_blocos(blocos)
+    de_uma_vez = consolidar_dados([limpar_e_consolidar_dados(brutos.copy())])
+
+    pd.testing.assert_frame_equal(em_blocos.reset_index(drop=True), de_uma_vez.reset_index(drop=True))
+
+
+def test_json_malformado_vira_erro_de_leitura(tmp_path, monkeypatch):
+    caminho = tmp_path / 'usuarios.json'
+    caminho.write_text('[{"nome_completo": "Ana"} {"nome_completo": "Bia"}]', encoding='utf-8')
+    monkeypatch.setattr(at2, 'FONTES', [('JSON', str(caminho), at2.ler_json_em_blocos, False)])
+
+    with pytest.raises(ErroLeituraArquivo):
+        list(at2.ler_arquivos_em_blocos(10))
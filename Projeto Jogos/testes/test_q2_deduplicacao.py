@@ -0,0 +1,81 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from at2 import consolidar_dados, deduplicar_e_consolidar  # noqa: E402
+from deduplicacao import agrupar_duplicatas  # noqa: E402
+from geradores import gerar_usuarios_com_duplicatas  # noqa: E402
+
+
+def limpos(linhas):
+    df = pd.DataFrame(linhas, columns=['nome_completo', 'data_nascimento', 'email'])
+    df['email_valido'] = df['email'].notna()
+    for coluna in ['cidade', 'estado', 'consoles', 'jogos_preferidos']:
+        df[coluna] = 'x'
+    return df
+
+
+def test_nomes_parecidos_sem_confirmacao_nao_sao_unidos():
+    df = limpos([
+        ('Maria Souza', '1990-01-01', 'maria@example.com'),
+        ('Mario Souza', '1985-06-30', 'mario@example.com'),
+        ('Mario Souza', None, 'outro@example.com'),
+    ])
+
+    grupos, _ = agrupar_duplicatas(df)
+
+    assert grupos.tolist() == [0, 1, 1]
+
+
+def test_nome_parecido_com_a_mesma_data_e_unido():
+    df = limpos([
+        ('Maria Souza', '1990-01-01', 'maria@example.com'),
+        ('Maria Sousa', '1990-01-01', 'maria.sousa@example.org'),
+    ])
+
+    grupos, _ = agrupar_duplicatas(df)
+
+    assert grupos.tolist() == [0, 0]
+
+
+def test_semelhancas_nao_se_encadeiam():
+    # A ~ B (mesmo email) e B ~ C (nome parecido, mesma data), mas A e C não se parecem
+    df = limpos([
+        ('Ana Lima', '1990-01-01', 'comum@example.com'),
+        ('Beatriz Rocha', '1990-01-01', 'comum@example.com'),
+        ('Beatriz Rocho', '1990-01-01', 'beatriz@example.org'),
+    ])
+
+    grupos, _ = agrupar_duplicatas(df)
+
+    assert grupos[0] == grupos[1]
+    assert grupos[2] != grupos[0]
+
+
+def test_usuarios_sinteticos_sem_agrupamentos_falsos():
+    df, entidades = gerar_usuarios_com_duplicatas(3000, semente=7)
+
+    grupos, _ = agrupar_duplicatas(df)
+
+    linhas_por_entidade = {}
+    for posicao, entidade in enumerate(entidades):
+        linhas_por_entidade.setdefault(entidade, []).append(posicao)
+    pares_reais = [linhas for linhas in linhas_por_entidade.values() if len(linhas) == 2]
+    encontrados = sum(grupos.iloc[a] == grupos.iloc[b] for a, b in pares_reais)
+    entidade_por_grupo = {}
+    for grupo, entidade in zip(grupos, entidades):
+        assert entidade_por_grupo.setdefault(grupo, entidade) == entidade, f"grupo {grupo} com dois usuários"
+    assert encontrados >= 0.85 * len(pares_reais)
+
+
+def test_linhas_sem_nome_descartadas_como_na_consolidacao_padrao():
+    df = limpos([
+        ('Ana Lima', '1990-01-01', 'ana@example.com'),
+        (None, '1991-02-02', 'sem.nome@example.com'),
+        ('Bruno Costa', None, None),
+    ])
+
+    deduplicado = deduplicar_e_consolidar([df.copy()])
+    padrao = consolidar_dados([df.copy()])
+
+    pd.testing.assert_frame_equal(deduplicado.reset_index(drop=True), padrao.reset_index(drop=True))
@@ -0,0 +1,35 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('openpyxl')
+
+import at2  # noqa: E402
+from at2 import _desserializar, _serializar, carregar_em_paralelo, carregar_fontes, consolidar_dados  # noqa: E402
+from conftest import RAIZ  # noqa: E402
+
+
+@pytest.fixture
+def na_raiz(monkeypatch):
+    # Os caminhos das fontes (Q2/dadosAT.csv...) são relativos à pasta "Projeto Jogos"
+    monkeypatch.chdir(RAIZ)
+
+
+def test_carga_paralela_igual_a_sequencial(na_raiz):
+    sequenciais = carregar_fontes()
+    paralelos = carregar_em_paralelo(max_workers=2)
+
+    assert len(paralelos) == len(sequenciais) == 3
+    for sequencial, paralelo in zip(sequenciais, paralelos):
+        pd.testing.assert_frame_equal(paralelo, sequencial, check_dtype=False)
+    pd.testing.assert_frame_equal(consolidar_dados(paralelos), consolidar_dados(sequenciais), check_dtype=False)
+
+
+@pytest.mark.parametrize('df, esperado', [
+    (pd.DataFrame({'nome': ['Ana', None], 'idade': [30, 41], 'nota': [1.5, float('nan')]}), 'arrow'),
+    (pd.DataFrame({'misturado': [1, 'dois']}), 'pickle'),  # o Arrow não aceita
+])
+def test_serializacao_ida_e_volta(df, esperado):
+    formato, buffer = _serializar(df)
+
+    assert formato == (esperado if at2.pa is not None else 'pickle')
+    pd.testing.assert_frame_equal(_desserializar(formato, buffer), df)
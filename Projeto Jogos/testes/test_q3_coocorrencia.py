@@ -0,0 +1,62 @@
+import itertools
+import random
+import sqlite3
+import warnings
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('sqlalchemy')
+
+from coocorrencia import codificar_jogos, gravar_coocorrencia, matriz_coocorrencia, matriz_usuario_jogo  # noqa: E402
+from incidencia import gravar_incidencia  # noqa: E402
+
+
+def gerar_jogos_preferidos(usuarios, jogos, semente=5):
+    aleatorio = random.Random(semente)
+    return [
+        '|'.join(aleatorio.choice([f'Jogo {j}', f'jogo  {j} ']) for j in aleatorio.sample(range(jogos), aleatorio.randint(1, 5)))
+        for _ in range(usuarios)
+    ]
+
+
+def test_coocorrencia_inteira_e_igual_a_contagem_direta():
+    jogos_preferidos = gerar_jogos_preferidos(500, 30)
+    usuarios, codigos, chaves, quantidade_usuarios = codificar_jogos(jogos_preferidos)
+    matriz = matriz_usuario_jogo(usuarios, codigos, quantidade_usuarios, len(chaves))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        coocorrencia = matriz_coocorrencia(matriz)
+
+    assert np.issubdtype(coocorrencia.dtype, np.integer)
+    assert coocorrencia.diagonal().sum() == 0
+
+    esperado = Counter()
+    for jogos in jogos_preferidos:
+        titulos = sorted({' '.join(jogo.split()).casefold() for jogo in jogos.split('|')})
+        esperado.update(itertools.permutations(titulos, 2))
+    obtido = coocorrencia.tocoo()
+    assert {(chaves[i], chaves[j]): int(c) for i, j, c in zip(obtido.row, obtido.col, obtido.data)} == esperado
+
+
+def test_falha_na_gravacao_mantem_os_pares_anteriores(tmp_path):
+    caminho = str(tmp_path / 'analise.db')
+    gravar_incidencia(pd.DataFrame({
+        'nome_completo': ['Ana', 'Bia'], 'estado': ['SP', 'RJ'], 'jogos_preferidos': ['Zelda|Fifa', 'Zelda|Fifa'],
+    }), caminho)
+    gravar_coocorrencia([('zelda', 'fifa', 2), ('fifa', 'zelda', 2)], caminho)
+
+    def pares_com_falha():
+        yield 'fifa', 'zelda', 5
+        raise RuntimeError('falha simulada')
+
+    with pytest.raises(RuntimeError):
+        gravar_coocorrencia(pares_com_falha(), caminho)
+
+    with sqlite3.connect(caminho) as conn:
+        assert conn.execute("SELECT jogo, relacionado, contagem FROM jogos_relacionados").fetchall() == [
+            ('Fifa', 'Zelda', 2), ('Zelda', 'Fifa', 2)]
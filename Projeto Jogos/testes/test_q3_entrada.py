@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip('pandas')
+
+import at2  # noqa: E402
+import at3  # noqa: E402
+from comum.intercambio import CAMINHO_EXCEL_CONSOLIDADO, CAMINHO_INTERCAMBIO  # noqa: E402
+from conftest import RAIZ  # noqa: E402
+
+
+@pytest.fixture
+def caminhos(tmp_path, monkeypatch):
+    intercambio, excel = tmp_path / 'dados.arrow', tmp_path / 'dados.xlsx'
+    monkeypatch.setattr(at3, 'CAMINHO_INTERCAMBIO', str(intercambio))
+    monkeypatch.setattr(at3, 'CAMINHO_EXCEL_CONSOLIDADO', str(excel))
+    return intercambio, excel
+
+
+def gravar(caminho, instante):
+    caminho.write_bytes(b'')
+    os.utime(caminho, (instante, instante))
+
+
+def test_excel_mais_recente_que_o_intercambio_e_escolhido(caminhos):
+    intercambio, excel = caminhos
+    gravar(intercambio, 1_000)
+    gravar(excel, 2_000)
+
+    assert at3.escolher_entrada() == str(excel)
+
+
+def test_intercambio_mais_recente_ou_empatado_e_escolhido(caminhos):
+    intercambio, excel = caminhos
+    gravar(excel, 1_000)
+    gravar(intercambio, 1_000)
+    assert at3.escolher_entrada() == str(intercambio)
+
+    gravar(intercambio, 2_000)
+    assert at3.escolher_entrada() == str(intercambio)
+
+
+def test_sem_arquivos_ou_com_entrada_explicita(caminhos):
+    _, excel = caminhos
+    assert at3.escolher_entrada() == str(excel)
+    assert at3.escolher_entrada('outro.parquet') == 'outro.parquet'
+
+
+def test_excel_gravado_pelo_q2_sem_intercambio_e_escolhido_pelo_q3(tmp_path, monkeypatch, capsys):
+    pytest.importorskip('openpyxl')
+    # Cópia das fontes do Q2 e um arquivo de intercâmbio antigo, com os caminhos relativos do projeto
+    shutil.copytree(os.path.join(RAIZ, 'Q2'), tmp_path / 'Q2', ignore=shutil.ignore_patterns('*.py', '__pycache__'))
+    (tmp_path / 'Q3').mkdir()
+    gravar(tmp_path / CAMINHO_INTERCAMBIO, 1_000)
+    monkeypatch.chdir(tmp_path)
+
+    at2.main(intercambio=None)
+
+    assert 'exportados com sucesso' in capsys.readouterr().out
+    assert at3.escolher_entrada() == CAMINHO_EXCEL_CONSOLIDADO
+    assert not at3.ler_excel(CAMINHO_EXCEL_CONSOLIDADO).empty
@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('sqlalchemy')
+
+import at3  # noqa: E402
+import incidencia  # noqa: E402
+from incidencia import gravar_incidencia, usuarios_que_gostam  # noqa: E402
+
+
+def usuarios(*linhas):
+    return pd.DataFrame(linhas, columns=['nome_completo', 'estado', 'jogos_preferidos'])
+
+
+def test_falha_na_reconstrucao_mantem_o_banco_anterior(tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'analise.db')
+    gravar_incidencia(usuarios(('Ana', 'SP', 'Zelda|Fifa'), ('Bia', 'RJ', 'Zelda')), caminho)
+
+    inserir = incidencia.inserir_em_lotes
+
+    def inserir_com_falha(conexao, comando, linhas, *args):
+        if 'usuario_jogo' in comando:
+            raise sqlite3.OperationalError('falha simulada')
+        return inserir(conexao, comando, linhas, *args)
+
+    monkeypatch.setattr(incidencia, 'inserir_em_lotes', inserir_com_falha)
+    with pytest.raises(sqlite3.OperationalError):
+        gravar_incidencia(usuarios(('Caio', 'MG', 'Outro Jogo')), caminho)
+    monkeypatch.undo()
+
+    assert usuarios_que_gostam('zelda', caminho) == [('Ana', 'SP'), ('Bia', 'RJ')]
+    with sqlite3.connect(caminho) as conn:
+        assert conn.execute("SELECT jogo, contagem FROM jogos_comuns").fetchall() == [('Zelda', 2)]
+        assert conn.execute("SELECT COUNT(*) FROM usuarios WHERE nome_completo = 'Caio'").fetchone() == (0,)
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_resultado_vem_do_banco_gravado(tmp_path, incremental):
+    caminho = str(tmp_path / 'analise.db')
+    df = usuarios(('Ana', 'SP', 'Zelda|Fifa'), ('Bia', 'RJ', 'Zelda '), ('Caio', None, 'Mario Kart'))
+    if incremental:
+        gravar_incidencia(usuarios(('Ana', 'SP', 'Fifa')), caminho)
+
+    resultado = at3.processar_dados(df, caminho, incremental=incremental)
+
+    assert resultado == at3.analisar_jogos(df)
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from at3 import contar_jogos
+from geradores import gerar_jogos_preferidos
+from incidencia import normalizar_jogo
+from sketches import ContadorFrequentes, analisar_aproximado
+
+EPSILON = 0.01
+DELTA = 0.01
+ERRO_DISTINTOS = 0.02
+
+
+class MisraGriesDireto:
+    """Implementação direta, que decrementa todos os contadores a cada item novo com a tabela cheia."""
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.contagens = {}
+
+    def adicionar(self, chave):
+        if chave in self.contagens:
+            self.contagens[chave] += 1
+        elif len(self.contagens) < self.capacidade:
+            self.contagens[chave] = 1
+        else:
+            self.contagens = {item: contagem - 1 for item, contagem in self.contagens.items() if contagem > 1}
+
+
+def gerar_fluxo(tamanho, semente):
+    aleatorio = random.Random(semente)
+    return [f'jogo {min(int(aleatorio.paretovariate(1.2)), 400)}' for _ in range(tamanho)]
+
+
+@pytest.mark.parametrize('semente', range(5))
+def test_misra_gries_com_desconto_igual_ao_direto(semente):
+    fluxo = gerar_fluxo(20_000, semente)
+    direto, contador = MisraGriesDireto(50), ContadorFrequentes(50)
+
+    for chave in fluxo:
+        direto.adicionar(chave)
+        contador.adicionar(chave)
+
+    assert contador.contagens == direto.contagens
+    assert contador.total == len(fluxo)
+
+
+@pytest.mark.parametrize('semente', range(5))
+def test_adicionar_quantidade_equivale_a_chamadas_repetidas(semente):
+    aleatorio = random.Random(semente)
+    pares = [(chave, aleatorio.randint(1, 6)) for chave in gerar_fluxo(5_000, semente)]
+    unitario, agrupado = ContadorFrequentes(30), ContadorFrequentes(30)
+
+    for chave, quantidade in pares:
+        for _ in range(quantidade):
+            unitario.adicionar(chave)
+        agrupado.adicionar(chave, quantidade)
+
+    assert agrupado.contagens == unitario.contagens
+    assert agrupado.total == unitario.total
+
+
+@pytest.fixture(scope='module')
+def analise():
+    jogos_preferidos = gerar_jogos_preferidos(20_000, 2_000, semente=7)
+    exato = {normalizar_jogo(jogo)[1]: contagem for jogo, contagem in contar_jogos(jogos_preferidos).items()}
+    return exato, analisar_aproximado(jogos_preferidos, EPSILON, DELTA, ERRO_DISTINTOS, top=10)
+
+
+def test_frequencias_aproximadas_dentro_do_limite(analise):
+    exato, resultado = analise
+    frequencias = resultado['frequencias']
+
+    erros = [frequencias.estimar(chave) - contagem for chave, contagem in exato.items()]
+
+    assert min(erros) >= 0  # o count-min nunca subestima
+    assert sum(erro > frequencias.erro_maximo for erro in erros) <= DELTA * len(erros)
+
+
+def test_jogos_distintos_dentro_de_tres_erros_padrao(analise):
+    exato, resultado = analise
+
+    erro_relativo = abs(resultado['jogos_distintos'] - len(exato)) / len(exato)
+
+    assert erro_relativo <= 3 * resultado['distintos'].erro_padrao
+
+
+def test_jogos_frequentes_entre_os_candidatos(analise):
+    exato, resultado = analise
+    limiar = resultado['mencoes'] / (resultado['frequentes'].capacidade + 1)
+
+    candidatos = set(resultado['frequentes'].candidatos())
+
+    assert resultado['mencoes'] == sum(exato.values())
+    assert {chave for chave, contagem in exato.items() if contagem > limiar} <= candidatos
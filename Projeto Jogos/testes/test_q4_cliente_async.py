@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('pandas')
+pytest.importorskip('requests')
+
+import at4  # noqa: E402
+
+TAXA = 10.0
+RAJADA = 3
+RETRY_AFTER = 1
+
+
+class ApiFalsa:
+    """
+    Imita a busca do Mercado Livre: 429 (com Retry-After) e 503 na primeira consulta de
+    'limitado' e 'instavel', e 404 sempre para 'quebrado'.
+    """
+
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.requisicoes = []  # (instante, consulta, status)
+        self.vistas = set()
+
+    def __call__(self, caminho, cabecalhos):
+        consulta = parse_qs(urlparse(caminho).query).get('q', [''])[0]
+        with self.trava:
+            primeira = consulta not in self.vistas
+            self.vistas.add(consulta)
+
+        extras = {}
+        if consulta == 'quebrado':
+            status = 404
+        elif consulta == 'limitado' and primeira:
+            status, extras = 429, {'Retry-After': str(RETRY_AFTER)}
+        elif consulta == 'instavel' and primeira:
+            status = 503
+        else:
+            status = 200
+        with self.trava:
+            self.requisicoes.append((time.monotonic(), consulta, status))
+
+        corpo = {'results': [{'title': f'Jogo {consulta} PS5', 'price': 100.0, 'permalink': f'http://exemplo/{consulta}'}]}
+        return status, {'Content-Type': 'application/json', **extras}, json.dumps(
+            corpo if status == 200 else {'error': status}).encode('utf-8')
+
+    def instantes(self, consulta=None):
+        with self.trava:
+            return sorted(instante for instante, vista, _ in self.requisicoes if consulta in (None, vista))
+
+
+@pytest.fixture
+def api(servidor_http, monkeypatch):
+    falsa = ApiFalsa()
+    servidor_http.rota_padrao = falsa
+    monkeypatch.setattr(at4, 'URL_BUSCA', servidor_http.url('/sites/MLB/search'))
+    return falsa
+
+
+def maior_excesso(instantes, taxa, rajada):
+    """Maior número de requisições, em algum intervalo, acima de rajada + taxa × duração."""
+    excesso = 0
+    for i, primeiro in enumerate(instantes):
+        for j in range(i, len(instantes)):
+            excesso = max(excesso, (j - i + 1) - (rajada + taxa * (instantes[j] - primeiro)))
+    return excesso
+
+
+def test_limite_de_taxa_novas_tentativas_e_erros_isolados(api):
+    jogos = [f'ok{i}' for i in range(20)] + ['limitado', 'instavel', 'quebrado']
+
+    resultados = dict(at4.consultar_jogos_async(jogos, taxa=TAXA, rajada=RAJADA, concorrencia=4))
+
+    assert isinstance(resultados.pop('quebrado'), at4.ErroRequisicaoAPI)
+    assert all(len(resultado) == 1 for resultado in resultados.values())
+    # Uma requisição de folga para o arredondamento dos instantes
+    assert maior_excesso(api.instantes(), TAXA, RAJADA) <= 1
+
+    limitado = api.instantes('limitado')
+    assert len(limitado) == 2 and limitado[1] - limitado[0] >= RETRY_AFTER * 0.9
+    assert len(api.instantes('instavel')) == 2